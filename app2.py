@@ -1,1086 +1,2601 @@
-import streamlit as st 
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-import hashlib
-import hmac
-
-# Imports necessários (adicione no início do seu arquivo)
-import plotly.graph_objects as go
-import plotly.express as px
-
-import hashlib
-import streamlit as st
-
-# Dicionário de usuários (usuário: senha MD5 + tipo de acesso)
-USUARIOS = {
-    "DIRETORIA": {
-        "senha_md5": "22e0a8b25d0066406f729ff0bae51954",  # exemplo: 123456
-        "tipo": "admin"
-    },
-    "Engenharia": {
-        "senha_md5": "d3deb726d5e69228aca43797c614dd26",  # exemplo: 1234
-        "tipo": "engenharia"
-    }
-}
-
-def hash_md5(senha):
-    return hashlib.md5(senha.encode()).hexdigest()
-
-def verificar_login():
-    if "autenticado" not in st.session_state:
-        st.session_state.autenticado = False
-    if "usuario" not in st.session_state:
-        st.session_state.usuario = None
-    if "tipo_usuario" not in st.session_state:
-        st.session_state.tipo_usuario = None
-
-    if not st.session_state.autenticado:
-        st.title("🔒 Login")
-
-        usuario = st.text_input("Usuário:")
-        senha = st.text_input("Senha:", type="password")
-
-        if st.button("Entrar"):
-            if usuario in USUARIOS and hash_md5(senha) == USUARIOS[usuario]["senha_md5"]:
-                st.session_state.autenticado = True
-                st.session_state.usuario = usuario
-                st.session_state.tipo_usuario = USUARIOS[usuario]["tipo"]
-                st.rerun()
-            else:
-                st.error("Usuário ou senha incorretos")
-        st.stop()
-
-verificar_login()
-
-@st.cache_data
-def carregar_dados_efetivo():
-    df = pd.read_excel("efetivo_abril.xlsx", sheet_name="EFETIVO", engine="openpyxl")
-    df.columns = df.columns.str.strip()
-    df = df[df['Obra'].notna()]  # Remove linhas com 'Obra' vazia/nan
-
-    # Hora Extra 70% - Semana
-    if 'Hora Extra 70% - Semana' not in df.columns:
-        df['Hora Extra 70% - Semana'] = 0
-    else:
-        df['Hora Extra 70% - Semana'] = pd.to_numeric(df['Hora Extra 70% - Semana'], errors='coerce').fillna(0)
-
-    # Hora Extra 70% - Sábado
-    if 'Hora Extra 70% - Sabado' not in df.columns:
-        df['Hora Extra 70% - Sabado'] = 0
-    else:
-        df['Hora Extra 70% - Sabado'] = pd.to_numeric(df['Hora Extra 70% - Sabado'], errors='coerce').fillna(0)
-
-    # Hora Extra 100%
-    if 'Hora Extra 100%' not in df.columns:
-        df['Hora Extra 100%'] = 0
-    else:
-        df['Hora Extra 100%'] = pd.to_numeric(df['Hora Extra 100%'], errors='coerce').fillna(0)
-
-    # Repouso Remunerado
-    if 'Repouso Remunerado' not in df.columns:
-        df['Repouso Remunerado'] = 0
-    else:
-        df['Repouso Remunerado'] = pd.to_numeric(df['Repouso Remunerado'], errors='coerce').fillna(0)
-
-    # Remuneração Líquida Folha
-    df['Remuneração Líquida Folha'] = pd.to_numeric(df['Remuneração Líquida Folha'], errors='coerce').fillna(0)
-
-    # Adiantamento
-    df['Adiantamento'] = pd.to_numeric(df['Adiantamento'], errors='coerce').fillna(0)
-
-    return df
-
-
-
-@st.cache_data
-def carregar_terceiros():
-    df_terceiros = pd.read_excel("efetivo_abril.xlsx", sheet_name="TERCEIROS", engine="openpyxl")
-    df_terceiros.columns = df_terceiros.columns.str.strip()
-    df_terceiros = df_terceiros[df_terceiros['Obra'].notna()]  # NOVO: Remove linhas com 'Obra' vazia/nan
-    df_terceiros['QUANTIDADE'] = pd.to_numeric(df_terceiros['QUANTIDADE'], errors='coerce').fillna(0).astype(int)
-    return df_terceiros
-
-def definir_colunas_ganhos_descontos():
-    """Define as colunas de ganhos e descontos"""
-    ganhos = ['SALÁRIO',
-    'Periculosidade',
-    'Dias De Atestado',
-    'Gratificação',
-    'Adicional noturno 20%',
-    'Ajuda De Saude',
-    'Auxilio Creche',
-    'Auxilio Educacao',
-    'EQUIP. TRAB/FERRAMENTA',
-    'Auxilio Moradia',
-    'Auxilio Transporte',
-    'Adicional Noturno 20%',
-    'Dev.desc.indevido',
-    'Salário Substituiçã',
-    'Reflexo S/ He Produção',
-    'Reembolso V. Transporte',
-    'Prêmio',
-    'Premio-gestao Desempenho','Passagem Interior','Passagem Interior Adiantamento','Hora Extra 70% - Sabado','Hora Extra 70% - Semana','Salário Maternidade','Adicional H.e S/ Producao 70%','PRODUÇÃO','AJUDA DE CUSTO','Ajuda de Custo Combustivel', 'REFLEXO S PRODUÇÃO','Hora Extra 100%','Repouso Remunerado','Periculosidade','Salário Família',
-    'Insuficiência de Saldo', 'Auxilio Transporte Retroativo', 'Insuficiência de Saldo', 'Hora Extra 100%'
-    ]
-
-    descontos = ['Atrasos', 'Faltas em Dias', 'Assistencia Medica',
-    'Coparticipacao Dependente',
-    'Coparticipacao Titular',
-    'Desconto Empréstimo',
-    'Diferenca Plano De Saude',
-    'Desconto Ótica',
-    'Plano Odontologico',
-    'Plano Odontologico Dependente',
-    'Pensão Alimentícia  Salário Mínimo',
-    'Assitência Médica Dependente','Dsr sobre falta', 'INSS Folha', 'IRRF Folha', 'Pensão Alimentícia','DESCONTO DE ALIMENTAÇÃO',
-    'MENSALIDADE SINDICAL','Vale Transporte','Correção adiantamento', 'Desconto Pagt A Maior']
-    
-    return ganhos, descontos
-
-def criar_grafico_cascata(df_filtrado, ganhos, descontos):
-    """Cria o gráfico de cascata"""
-    # Calcula totais
-    total_ganhos = 0
-    total_descontos = 0
-
-    # Soma ganhos (colunas que existem no DataFrame)
-    for col in ganhos:
-        if col in df_filtrado.columns:
-            total_ganhos += pd.to_numeric(df_filtrado[col], errors='coerce').fillna(0).sum()
-
-    # Soma descontos (colunas que existem no DataFrame)
-    for col in descontos:
-        if col in df_filtrado.columns:
-            total_descontos -= pd.to_numeric(df_filtrado[col], errors='coerce').fillna(0).sum()
-
-    # Remuneração líquida
-    remuneracao_liquida = total_ganhos - total_descontos
-
-    # Dados para o gráfico de cascata
-    categorias = ['Ganhos', 'Descontos', 'Remuneração Líquida']
-    valores = [total_ganhos, total_descontos, remuneracao_liquida]
-    cores = ['green', 'red', 'blue']
-
-    fig_cascata = go.Figure()
-
-    # Adiciona as barras
-    fig_cascata.add_trace(go.Waterfall(
-        name="Fluxo Financeiro",
-        orientation="v",
-        measure=["relative", "relative", "total"],
-        x=categorias,
-        textposition="outside",
-        text=[f"R$ {v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".") for v in [total_ganhos, total_descontos, remuneracao_liquida]],
-        y=[total_ganhos, -total_descontos, 0],
-        connector={"line": {"color": "rgb(63, 63, 63)"}},
-        increasing={"marker": {"color": "green"}},
-        decreasing={"marker": {"color": "red"}},
-        totals={"marker": {"color": "blue"}}
-    ))
-
-    fig_cascata.update_layout(
-        title="Análise Financeira - Ganhos vs Descontos",
-        showlegend=False,
-        yaxis_title="Valor (R$)",
-        xaxis_title="Categoria"
-    )
-
-    return fig_cascata, total_ganhos, total_descontos, remuneracao_liquida
-
-def criar_grafico_detalhado(df_filtrado, colunas, titulo, cor):
-    """Cria gráfico de colunas detalhado para ganhos ou descontos"""
-    dados_detalhados = []
-
-    for col in colunas:
-        if col in df_filtrado.columns:
-            valor = pd.to_numeric(df_filtrado[col], errors='coerce').fillna(0).sum()
-            if valor != 0:  # Só inclui se houver valor
-                dados_detalhados.append({'Categoria': col, 'Valor': valor})
-
-    if not dados_detalhados:
-        return None
-
-    df_detalhado = pd.DataFrame(dados_detalhados)
-    df_detalhado = df_detalhado.sort_values('Valor', ascending=False)
-
-    fig_detalhado = px.bar(
-        df_detalhado,
-        x='Categoria',
-        y='Valor',
-        title=titulo,
-        color_discrete_sequence=[cor],
-        text=df_detalhado['Valor'].apply(lambda x: f"R$ {x:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
-    )
-
-    fig_detalhado.update_traces(textposition='outside')
-    fig_detalhado.update_layout(xaxis_tickangle=-45)
-
-    return fig_detalhado
-
-# ======================================
-# DASHBOARD DE EFETIVO
-# ======================================
-
-def dashboard_efetivo():
-    st.title("📊 Análise de Efetivo - Obras")
-
-    df = carregar_dados_efetivo()
-    df_terceiros = carregar_terceiros()
-
-    # 🔴 Excluir obra "ESCRITÓRIO ENGENHARIA"
-    df = df[df['Obra'] != 'ESCRITÓRIO ENGENHARIA']
-    df_terceiros = df_terceiros[df_terceiros['Obra'] != 'ESCRITÓRIO ENGENHARIA']
-
-    ganhos, descontos = definir_colunas_ganhos_descontos()
-    df['Total Extra'] = df['Hora Extra 70% - Semana'] + df['Hora Extra 70% - Sabado'] + df['Hora Extra 100%']
-
-    with st.sidebar:
-        st.header("🔍 Filtros - Efetivo")
-        lista_obras = sorted(df['Obra'].astype(str).unique())
-        obras_selecionadas = st.multiselect("Obras:", lista_obras, default=lista_obras)
-        tipo_selecionado = st.radio("Tipo:", ['Todos', 'DIRETO', 'INDIRETO', 'TERCEIRO'], horizontal=True)
-        tipo_analise = st.radio("Tipo de Análise da Tabela:",['Produção', 'Hora Extra Semana', 'Hora Extra Sábado', 'Hora Extra 100%'])
-        qtd_linhas = st.radio("Qtd. de Funcionários na Tabela:", ['5', '10', '20', 'Todos'], horizontal=True)
-        tipo_peso = st.radio("Tipo de Peso (Gráficos Novos):", ['Peso sobre Produção', 'Peso sobre Hora Extra'])
-
-        st.divider()
-        st.header("💰 Análise Financeira")
-        analise_financeira = st.radio("Análise Financeira:", ['Geral', 'Ganhos', 'Descontos'])
-
-        nome_col_funcao = 'Função' if 'Função' in df.columns else 'Funçao' if 'Funçao' in df.columns else None
-        if nome_col_funcao:
-            funcoes_disponiveis = sorted(df[nome_col_funcao].astype(str).unique())
-            funcao_selecionada = st.selectbox("Filtrar por Função (Análise Financeira):", ["Todas"] + funcoes_disponiveis)
-
-    df_filtrado = df[df['Obra'].isin(obras_selecionadas)]
-    df_terceiros_filtrado = df_terceiros[df_terceiros['Obra'].isin(obras_selecionadas)]
-
-    if tipo_selecionado != 'Todos':
-        if tipo_selecionado in ['DIRETO', 'INDIRETO']:
-            df_filtrado = df_filtrado[df_filtrado['Tipo'] == tipo_selecionado]
-        elif tipo_selecionado == 'TERCEIRO':
-            df_filtrado = df_filtrado[0:0]
-
-    if nome_col_funcao and 'funcao_selecionada' in locals() and funcao_selecionada != "Todas":
-        df_filtrado_financeiro = df_filtrado[df_filtrado[nome_col_funcao] == funcao_selecionada]
-    else:
-        df_filtrado_financeiro = df_filtrado.copy()
-
-    direto_count = len(df[df['Obra'].isin(obras_selecionadas) & (df['Tipo'] == 'DIRETO')])
-    indireto_count = len(df[df['Obra'].isin(obras_selecionadas) & (df['Tipo'] == 'INDIRETO')])
-    total_terceiros = df_terceiros_filtrado['QUANTIDADE'].sum()
-    total_geral = direto_count + indireto_count + total_terceiros
-
-    col1, col2, col3, col4 = st.columns(4)
-    col1.metric("👷 Direto", direto_count)
-    col2.metric("👷‍♂️ Indireto", indireto_count)
-    col3.metric("🏗️ Terceiro", total_terceiros)
-    col4.metric("👥 Total", total_geral)
-
-    st.divider()
-
-    pizza_base = df[df['Obra'].isin(obras_selecionadas)]
-    pizza_diretos_indiretos = pizza_base['Tipo'].value_counts().reset_index()
-    pizza_diretos_indiretos.columns = ['Tipo', 'count']
-    pizza_terceiros = pd.DataFrame({'Tipo': ['TERCEIRO'], 'count': [df_terceiros_filtrado['QUANTIDADE'].sum()]})
-    pizza = pd.concat([pizza_diretos_indiretos, pizza_terceiros], ignore_index=True)
-
-    col1, col2 = st.columns(2)
-
-    with col1:
-        fig_pizza = px.pie(
-            pizza,
-            names='Tipo',
-            values='count',
-            title='Distribuição por Tipo de Efetivo',
-            hole=0.3,
-            color='Tipo',
-            color_discrete_map={
-                'DIRETO': 'Blue',
-                'INDIRETO': 'Green',
-                'TERCEIRO': 'Orange'
-            }
-        )
-        fig_pizza.update_traces(textposition='inside', textinfo='percent+label')
-        st.plotly_chart(fig_pizza, use_container_width=True)
-
-    with col2:
-        if 'GENÊRO' in df.columns or 'GÊNERO' in df.columns:
-            coluna_genero = 'GENÊRO' if 'GENÊRO' in df.columns else 'GÊNERO'
-            pizza_genero = pizza_base.copy()
-            pizza_genero['Gênero'] = pizza_genero[coluna_genero].str.upper().str.strip()
-            pizza_genero['Gênero'] = pizza_genero['Gênero'].replace({
-                'FEMINO': 'FEMININO',
-                'MASC': 'MASCULINO',
-                'F': 'FEMININO',
-                'M': 'MASCULINO'
-            })
-            pizza_genero = pizza_genero[pizza_genero['Gênero'].isin(['FEMININO', 'MASCULINO'])]
-            if not pizza_genero.empty:
-                pizza_genero = pizza_genero['Gênero'].value_counts().reset_index()
-                pizza_genero.columns = ['Gênero', 'count']
-                fig_pizza_genero = px.pie(
-                    pizza_genero,
-                    names='Gênero',
-                    values='count',
-                    title='Distribuição por Gênero',
-                    hole=0.3,
-                    color='Gênero',
-                    color_discrete_map={
-                        'MASCULINO': 'Blue',
-                        'FEMININO': 'Red'
-                    }
-                )
-                fig_pizza_genero.update_traces(
-                    textposition='inside',
-                    textinfo='percent+label',
-                    textfont_size=14
-                )
-                st.plotly_chart(fig_pizza_genero, use_container_width=True)
-            else:
-                st.warning("Dados de gênero não encontrados (valores devem ser 'Feminino' ou 'Masculino')")
-        else:
-            st.warning("Coluna de gênero não encontrada (procura por 'GENÊRO' ou 'GÊNERO')")
-
-
-
-    # Análise Financeira (usa df_filtrado_financeiro - com filtro de função se aplicável)
-    if not df_filtrado_financeiro.empty and tipo_selecionado != 'TERCEIRO':
-        st.markdown("### 💰 Análise Financeira")
-
-        if analise_financeira == 'Geral':
-            fig_cascata, total_ganhos, total_descontos, remuneracao_liquida = criar_grafico_cascata(df_filtrado_financeiro, ganhos, descontos)
-            st.plotly_chart(fig_cascata, use_container_width=True)
-
-            # Calcula médias por funcionário
-            num_funcionarios = len(df_filtrado_financeiro)
-            media_ganhos = total_ganhos / num_funcionarios if num_funcionarios > 0 else 0
-            media_descontos = total_descontos / num_funcionarios if num_funcionarios > 0 else 0
-            media_liquida = remuneracao_liquida / num_funcionarios if num_funcionarios > 0 else 0
-
-            col_fin1, col_fin2, col_fin3 = st.columns(3)
-            col_fin1.metric("💚 Total Ganhos", 
-                          f"R$ {total_ganhos:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."),
-                          f"Média: R$ {media_ganhos:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
-            col_fin2.metric("💸 Total Descontos", 
-                          f"R$ {total_descontos:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."),
-                          f"Média: R$ {media_descontos:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
-            col_fin3.metric("💰 Remuneração Líquida", 
-                          f"R$ {remuneracao_liquida:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."),
-                          f"Média: R$ {media_liquida:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
-
-        elif analise_financeira == 'Ganhos':
-            fig_ganhos = criar_grafico_detalhado(df_filtrado_financeiro, ganhos, "Detalhamento dos Ganhos", "green")
-            if fig_ganhos:
-                st.plotly_chart(fig_ganhos, use_container_width=True)
-            else:
-                st.warning("Nenhum dado de ganhos encontrado para os filtros selecionados.")
-
-        elif analise_financeira == 'Descontos':
-            fig_descontos = criar_grafico_detalhado(df_filtrado_financeiro, descontos, "Detalhamento dos Descontos", "red")
-            if fig_descontos:
-                st.plotly_chart(fig_descontos, use_container_width=True)
-            else:
-                st.warning("Nenhum dado de descontos encontrado para os filtros selecionados.")
-
-        st.divider()
-
-
-    if tipo_selecionado == 'TERCEIRO':
-        st.divider()
-        st.markdown("### 🏗️ Funcionários Terceirizados por Empresa e Obra")
-        tabela_terceiros = df_terceiros_filtrado.groupby(['Obra', 'EMPRESA'])['QUANTIDADE'].sum().reset_index()
-        st.dataframe(tabela_terceiros, use_container_width=True)
-        return
-    coluna_valor = {
-    'Produção': 'PRODUÇÃO',
-    'Hora Extra Semana': 'Hora Extra 70% - Semana',
-    'Hora Extra Sábado': 'Hora Extra 70% - Sabado',
-    'Hora Extra 100%': 'Hora Extra 100%'
-    }[tipo_analise]
-
-
-    if tipo_selecionado == 'Todos':
-        df_ranking = df_filtrado[df_filtrado['Tipo'].isin(['DIRETO', 'INDIRETO'])]
-    else:
-        df_ranking = df_filtrado
-
-    nome_col_funcao = 'Função' if 'Função' in df_ranking.columns else 'Funçao' if 'Funçao' in df_ranking.columns else None
-
-    if tipo_analise == 'Produção' and 'REFLEXO S PRODUÇÃO' in df_ranking.columns:
-        df_ranking['DSR'] = df_ranking['REFLEXO S PRODUÇÃO']
-        cols_rank = ['Nome do Funcionário', nome_col_funcao, 'Obra', 'Tipo', 'PRODUÇÃO', 'DSR']
-        valor_coluna = 'PRODUÇÃO'
-    else:
-        cols_rank = ['Nome do Funcionário', nome_col_funcao, 'Obra', 'Tipo', coluna_valor]
-        valor_coluna = coluna_valor
-
-    cols_rank = [c for c in cols_rank if c is not None and c in df_ranking.columns]
-    df_ranking_limp = df_ranking[cols_rank].copy()
-    df_ranking_limp = df_ranking_limp[pd.to_numeric(df_ranking_limp[valor_coluna], errors='coerce').notna()]
-    df_ranking_limp = df_ranking_limp[df_ranking_limp[valor_coluna] > 0]
-    ranking = df_ranking_limp.sort_values(by=valor_coluna, ascending=False)
-
-    valor_total = df_ranking_limp[valor_coluna].sum()
-
-# Conta apenas efetivo direto com remuneração > 0
-    df_diretos_validos = df[
-    (df['Obra'].isin(obras_selecionadas)) &
-    (df['Tipo'] == 'DIRETO') &
-    (pd.to_numeric(df['Remuneração Líquida Folha'], errors='coerce') > 0)
-]
-    total_funcionarios = df_diretos_validos['Nome do Funcionário'].nunique()
-    total_com_valor = df_ranking_limp['Nome do Funcionário'].nunique()
-    porcentagem = (total_com_valor / total_funcionarios) if total_funcionarios > 0 else 0
-
-# Exibição
-    st.markdown(f"### 📋 Top Funcionários por **{tipo_analise}**")
-    st.markdown(
-    f"**Total em {tipo_analise}:** R$ {valor_total:,.2f}  \n"
-    f"**Funcionários com {tipo_analise} (Efetivo Direto com Remuneração):** "
-    f"{total_com_valor} de {total_funcionarios} (**{porcentagem:.0%}**)"
-    .replace(",", "X").replace(".", ",").replace("X", ".")
-)
-
-
-
-    
-    if qtd_linhas != 'Todos':
-        ranking = ranking.head(int(qtd_linhas))
-
-    def formatar_valor(x):
-        return f"R$ {x:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-
-    ranking[valor_coluna] = ranking[valor_coluna].apply(formatar_valor)
-    if 'DSR' in ranking.columns:
-        ranking['DSR'] = ranking['DSR'].apply(formatar_valor)
-
-    st.dataframe(ranking, use_container_width=True)
-    st.divider()
-
-    if nome_col_funcao and nome_col_funcao in df_ranking.columns:
-        graf_funcao = df_ranking[nome_col_funcao].value_counts().reset_index()
-        graf_funcao.columns = [nome_col_funcao, 'Qtd']
-        fig_bar = px.bar(
-            graf_funcao,
-            x=nome_col_funcao,
-            y='Qtd',
-            color='Qtd',
-            color_continuous_scale='Blues',
-            title='Quantidade por Função',
-            labels={'Qtd': 'Quantidade', nome_col_funcao: 'Função'}
-        )
-        st.plotly_chart(fig_bar, use_container_width=True)
-
-    st.divider()
-
-    todas_obras = sorted(df['Obra'].astype(str).unique())
-    peso_lista = []
-    for obra in todas_obras:
-        df_obra = df[df['Obra'] == obra]
-        df_direto = df_obra[df_obra['Tipo'] == 'DIRETO']
-        prod_numerador = df_direto['PRODUÇÃO'].sum() + df_direto['REFLEXO S PRODUÇÃO'].sum()
-        prod_denominador = df_direto['Remuneração Líquida Folha'].sum() + df_direto['Adiantamento'].sum()
-        df_dir_ind = df_obra[df_obra['Tipo'].isin(['DIRETO', 'INDIRETO'])]
-        total_extra = df_dir_ind['Total Extra'].sum()
-        reposo_remunerado = df_dir_ind['Repouso Remunerado'].sum()
-        hor_extra_denominador = df_dir_ind['Remuneração Líquida Folha'].sum() + df_dir_ind['Adiantamento'].sum()
-
-        if tipo_peso == 'Peso sobre Produção':
-            peso = (prod_numerador / prod_denominador) if prod_denominador > 0 else 0
-        else:
-            peso = ((total_extra + reposo_remunerado)/ hor_extra_denominador ) if hor_extra_denominador > 0 else 0
-
-        peso_lista.append({'Obra': obra, 'Peso Financeiro': peso})
-
-    df_peso = pd.DataFrame(peso_lista)
-    df_peso = df_peso.sort_values(by='Peso Financeiro', ascending=False)
-    df_peso['Selecionada'] = df_peso['Obra'].apply(lambda x: x in obras_selecionadas)
-    colors = df_peso['Selecionada'].map({True: 'darkblue', False: 'lightblue'})
-
-    fig_peso = px.bar(
-        df_peso,
-        x='Obra',
-        y='Peso Financeiro',
-        title=f'Peso Financeiro por Obra ({tipo_peso})',
-        labels={'Peso Financeiro': 'Índice', 'Obra': 'Obra'},
-        text=df_peso['Peso Financeiro'].apply(lambda x: f"{x:.2%}"),
-    )
-
-    fig_peso.update_traces(
-        marker_color=colors,
-        textposition='outside',
-        marker_line_color='black',
-        marker_line_width=0.5
-    )
-
-    fig_peso.update_layout(
-        yaxis_tickformat='.0%',
-        showlegend=False,
-        xaxis={'categoryorder': 'array', 'categoryarray': df_peso['Obra']}
-    )
-
-    st.plotly_chart(fig_peso, use_container_width=True)
-
-
-# Dicionário para mapear meses em inglês para abreviações em português
-MES_POR_PT = {
-    'Jan': 'Jan',
-    'Feb': 'Fev',
-    'Mar': 'Mar',
-    'Apr': 'Abr',
-    'May': 'Mai',
-    'Jun': 'Jun',
-    'Jul': 'Jul',
-    'Aug': 'Ago',
-    'Sep': 'Set',
-    'Oct': 'Out',
-    'Nov': 'Nov',
-    'Dec': 'Dez'
-}
-
-# Mapeamento mês português para número do mês
-MES_PT_PARA_NUM = {
-    'Jan': 1, 'Fev': 2, 'Mar': 3, 'Abr': 4, 'Mai': 5, 'Jun': 6,
-    'Jul': 7, 'Ago': 8, 'Set': 9, 'Out': 10, 'Nov': 11, 'Dez': 12
-}
-
-def mes_ano_pt(dt):
-    # Retorna string formatada em português tipo 'Abr/24'
-    mes_eng = dt.strftime('%b')  # abreviação em inglês
-    mes_pt = MES_POR_PT.get(mes_eng, mes_eng)
-    ano = dt.strftime('%y')
-    return f"{mes_pt}/{ano}"
-
-def data_pt_para_datetime(mes_ano_pt_str):
-    # Recebe string tipo "Abr/24" e converte para pd.Timestamp(ano, mes, dia=1)
-    mes_pt, ano_str = mes_ano_pt_str.split('/')
-    mes = MES_PT_PARA_NUM[mes_pt]
-    ano = 2000 + int(ano_str)  # exemplo: '24' vira 2024
-    return pd.Timestamp(year=ano, month=mes, day=1)
-
-
-def dashboard_produtividade():
-    def carregar_dados():
-        df = pd.read_excel("produtividade.xlsx")
-        df['DATA'] = pd.to_datetime(df['DATA'], format='%d/%m/%Y')
-        return df
-
-    def filtrar_dados(df, tipo_obra, servico, datas_selecionadas):
-        if tipo_obra != "Todos":
-            df = df[df['TIPO_OBRA'] == tipo_obra]
-        if servico:
-            df = df[df['SERVIÇO'] == servico]
-        if datas_selecionadas:
-            datas_dt = [data_pt_para_datetime(d) for d in datas_selecionadas]
-            df = df[df['DATA'].dt.to_period('M').isin(pd.to_datetime(datas_dt).to_period('M'))]
-        return df
-
-    def criar_grafico_indices_completos(df, servico):
-        df['MÊS'] = df['DATA'].dt.to_period('M')
-        df_mensal = df.groupby('MÊS').agg({
-            'ÍNDICE S/ (PP+HH EXT.)': 'mean',
-            'ÍNDICE + PP': 'mean',
-            'ÍNDICE + PP + HH EXT': 'mean',
-            'ÍNDICE ORÇADO': 'mean',
-            'ÍNDICE + PP + HH EXT ACUMULADO': 'mean'
-        }).reset_index()
-
-        df_mensal['DATA'] = df_mensal['MÊS'].dt.to_timestamp()
-        df_mensal['DATA_FORMATADA_PT'] = df_mensal['DATA'].apply(mes_ano_pt)
-
-        # Renomear colunas com prefixo do serviço
-        df_mensal_renomeado = df_mensal.rename(columns={
-            'ÍNDICE S/ (PP+HH EXT.)': f'{servico} - ÍNDICE S/ (PP+HH EXT.)',
-            'ÍNDICE + PP': f'{servico} - ÍNDICE + PP',
-            'ÍNDICE + PP + HH EXT': f'{servico} - ÍNDICE + PP + HH EXT',
-            'ÍNDICE ORÇADO': f'{servico} - ÍNDICE ORÇADO',
-            'ÍNDICE + PP + HH EXT ACUMULADO': f'{servico} - ÍNDICE + PP + HH EXT ACUMULADO'
-        })
-
-        colunas_plot = [col for col in df_mensal_renomeado.columns if col.startswith(servico)]
-
-        fig = px.line(
-            df_mensal_renomeado,
-            x='DATA',
-            y=colunas_plot,
-            labels={'value': 'Índice', 'DATA': 'Mês/Ano'},
-            title=f"📈 Evolução dos Índices - {servico}",
-            markers=True
-        )
-
-        fig.update_xaxes(
-            tickformat="%b/%y",
-            tickmode='array',
-            tickvals=df_mensal_renomeado['DATA'],
-            ticktext=df_mensal_renomeado['DATA_FORMATADA_PT']
-        )
-
-        # Posicionar a legenda abaixo do gráfico
-        fig.update_layout(
-            legend=dict(
-                orientation="h",           # horizontal
-                yanchor="top",             # ancorar no topo da legenda
-                y=-0.3,                    # posição vertical (mais baixo = mais longe do gráfico)
-                xanchor="center",          # centralizar
-                x=0.5                      # posição horizontal central
-            )
-        )
-
-        return fig, df_mensal
-
-    df = carregar_dados()
-
-    with st.sidebar:
-        st.header("🔍 Filtros - Produtividade")
-        tipo_obra_opcoes = ["Todos"] + df['TIPO_OBRA'].dropna().unique().tolist()
-        tipo_obra = st.selectbox('Selecione o Tipo de Obra', tipo_obra_opcoes)
-
-        servicos_opcoes = sorted(df['SERVIÇO'].dropna().unique().tolist())
-        servico = st.selectbox('Selecione o Serviço (1 por vez)', servicos_opcoes)
-
-        meses_unicos = df['DATA'].dt.to_period('M').drop_duplicates().sort_values()
-        mes_ano_opcoes = [mes_ano_pt(pd.Timestamp(m.start_time)) for m in meses_unicos]
-        datas_selecionadas = st.multiselect('Selecione o(s) Mês/Ano', mes_ano_opcoes, default=mes_ano_opcoes)
-
-    # Aplicar filtros
-    df_filtrado = filtrar_dados(df, tipo_obra, servico, datas_selecionadas)
-
-    # Criar gráfico de linha com todas as colunas de índice
-    fig_indices, df_mensal = criar_grafico_indices_completos(df_filtrado, servico)
-    st.title("📈 Dashboard de Produtividade")
-    st.plotly_chart(fig_indices, use_container_width=True)
-
-    # Tabela com colunas específicas + desvio (positiva = economia de HH)
-    df_mensal['MÊS/ANO'] = df_mensal['DATA'].apply(mes_ano_pt)
-    df_tabela = df_mensal[['MÊS/ANO', 'ÍNDICE ORÇADO', 'ÍNDICE + PP + HH EXT']].copy()
-    df_tabela['DESVIO'] = df_tabela['ÍNDICE ORÇADO'] - df_tabela['ÍNDICE + PP + HH EXT']
-    df_tabela = df_tabela.round(2)
-
-    st.markdown("### 📊 Tabela de Índices e Desvio (Orçado - Real)")
-    st.dataframe(df_tabela, use_container_width=True)
-
-
-@st.cache_data
-def carregar_dados_efetivo():
-    df = pd.read_excel("efetivo_abril.xlsx", sheet_name="EFETIVO", engine="openpyxl")
-    df.columns = df.columns.str.strip()
-    df = df[df['Obra'].notna()]  # Remove linhas com 'Obra' vazia/nan
-
-    df['Hora Extra 70% - Semana'] = pd.to_numeric(df['Hora Extra 70% - Semana'], errors='coerce').fillna(0)
-    df['Hora Extra 70% - Sabado'] = pd.to_numeric(df['Hora Extra 70% - Sabado'], errors='coerce').fillna(0)
-    if 'Repouso Remunerado' not in df.columns:
-        df['Repouso Remunerado'] = 0
-    else:
-        df['Repouso Remunerado'] = pd.to_numeric(df['Repouso Remunerado'], errors='coerce').fillna(0)
-    df['Remuneração Líquida Folha'] = pd.to_numeric(df['Remuneração Líquida Folha'], errors='coerce').fillna(0)
-    df['Adiantamento'] = pd.to_numeric(df['Adiantamento'], errors='coerce').fillna(0)
-    return df
-
-
-
-@st.cache_data
-def carregar_terceiros():
-    df_terceiros = pd.read_excel("efetivo_abril.xlsx", sheet_name="TERCEIROS", engine="openpyxl")
-    df_terceiros.columns = df_terceiros.columns.str.strip()
-    df_terceiros = df_terceiros[df_terceiros['Obra'].notna()]  # Remove linhas com 'Obra' vazia/nan
-    df_terceiros['QUANTIDADE'] = pd.to_numeric(df_terceiros['QUANTIDADE'], errors='coerce').fillna(0).astype(int)
-    return df_terceiros
-
-def definir_colunas_ganhos_descontos():
-    """Define as colunas de ganhos e descontos (compartilhada)"""
-    ganhos = [
-        'SALÁRIO', 'Periculosidade', 'Dias De Atestado', 'Gratificação', 
-        'Adicional noturno 20%', 'Ajuda De Saude', 'Auxilio Creche', 
-        'Auxilio Educacao', 'EQUIP. TRAB/FERRAMENTA', 'Auxilio Moradia',
-        'Auxilio Transporte', 'Adicional Noturno 20%', 'Dev.desc.indevido',
-        'Salário Substituiçã', 'Reflexo S/ He Produção', 'Reembolso V. Transporte',
-        'Prêmio', 'Premio-gestao Desempenho', 'Passagem Interior',
-        'Passagem Interior Adiantamento', 'Hora Extra 70% - Sabado',
-        'Hora Extra 70% - Semana', 'Salário Maternidade', 'Adicional H.e S/ Producao 70%',
-        'PRODUÇÃO', 'AJUDA DE CUSTO', 'Ajuda de Custo Combustivel', 'REFLEXO S PRODUÇÃO',
-        'Hora Extra 100%', 'Repouso Remunerado', 'Periculosidade', 'Salário Família',
-        'Insuficiência de Saldo', 'Auxilio Transporte Retroativo', 'Insuficiência de Saldo'
-    ]
-
-    descontos = [
-        'Atrasos', 'Faltas em Dias', 'Assistencia Medica', 'Coparticipacao Dependente',
-        'Coparticipacao Titular', 'Desconto Empréstimo', 'Diferenca Plano De Saude',
-        'Desconto Ótica', 'Plano Odontologico', 'Plano Odontologico Dependente',
-        'Pensão Alimentícia  Salário Mínimo', 'Assitência Médica Dependente',
-        'Dsr sobre falta', 'Pensão Alimentícia', 
-        'DESCONTO DE ALIMENTAÇÃO', 'MENSALIDADE SINDICAL', 'Vale Transporte',
-        'Correção adiantamento', 'INSS Folha', 'IRRF Folha'
-    ]
-    return ganhos, descontos
-
-# ======================================
-# DASHBOARD ESCRITÓRIO (NOVO)
-# ======================================
-# Adicione esta função ao seu código existente
-
-def dashboard_escritorio():
-    st.title("🏢 Análise de Efetivo - Escritório")
-
-    # Carrega dados
-    df = carregar_dados_efetivo()
-
-    # Filtra apenas escritório engenharia
-    df = df[df['Obra'] == 'ESCRITÓRIO ENGENHARIA']
-
-    # Verifica se existe coluna Departamento
-    if 'Departamento' not in df.columns:
-        st.error("Coluna 'Departamento' não encontrada!")
-        return
-
-    lista_departamentos = sorted(df['Departamento'].astype(str).unique())
-    lista_funcionarios = sorted(df['Nome do Funcionário'].unique())
-
-    ganhos, descontos = definir_colunas_ganhos_descontos()
-    df['Total Extra'] = df['Hora Extra 70% - Semana'] + df['Hora Extra 70% - Sabado'] + df['Hora Extra 100%']
-    
-    with st.sidebar:
-        st.header("🔍 Filtros - Escritório")
-        departamentos_selecionados = st.multiselect(
-            "Departamentos:", 
-            lista_departamentos, 
-            default=lista_departamentos,
-            key="escritorio_deptos"
-        )
-        tipo_selecionado = st.radio(
-            "Tipo:", 
-            ['Todos', 'DIRETO', 'INDIRETO'],
-            horizontal=True,
-            key="escritorio_tipo"
-        )
-        tipo_analise = st.radio(
-            "Tipo de Análise da Tabela:", 
-            ['Produção', 'Hora Extra Semana', 'Hora Extra Sábado'],
-            key="escritorio_analise"
-        )
-        qtd_linhas = st.radio(
-            "Qtd. de Funcionários na Tabela:", 
-            ['5', '10', '20', 'Todos'], 
-            horizontal=True,
-            key="escritorio_qtd"
-        )
-        tipo_peso = st.radio(
-            "Tipo de Peso:", 
-            ['Peso sobre Produção', 'Peso sobre Hora Extra'],
-            key="escritorio_peso"
-        )
-
-        st.divider()
-        st.header("💰 Análise Financeira")
-        analise_financeira = st.radio(
-            "Análise:", 
-            ['Geral', 'Ganhos', 'Descontos'],
-            key="escritorio_financeira"
-        )
-
-    # Filtra dados por departamento e tipo
-    df_filtrado = df[df['Departamento'].isin(departamentos_selecionados)]
-
-    if tipo_selecionado != 'Todos':
-        df_filtrado = df_filtrado[df_filtrado['Tipo'] == tipo_selecionado]
-
-    # Novo filtro por funcionário (apenas para análise financeira)
-    if analise_financeira in ['Geral', 'Ganhos', 'Descontos']:
-        funcionario_selecionado = st.selectbox(
-            "🔎 Filtrar por funcionário (opcional):",
-            ["Todos"] + lista_funcionarios,
-            key="filtro_funcionario"
-        )
-
-        if funcionario_selecionado != "Todos":
-            df_filtrado = df_filtrado[df_filtrado['Nome do Funcionário'] == funcionario_selecionado]
-
-    # Métricas (sem terceiros)
-    direto_count = len(df_filtrado[df_filtrado['Tipo'] == 'DIRETO'])
-    indireto_count = len(df_filtrado[df_filtrado['Tipo'] == 'INDIRETO'])
-    total_geral = direto_count + indireto_count
-
-    col1, col2, col3 = st.columns(3)
-    col1.metric("👷 Direto", direto_count)
-    col2.metric("👷‍♂️ Indireto", indireto_count)
-    col3.metric("👥 Total", total_geral)
-
-    st.divider()
-
-    # Gráficos de Pizza - Apenas diretos e indiretos (MODIFICADO para incluir gênero)
-    st.markdown("### 📊 Distribuição por Tipo e Gênero")
-
-    # Cria colunas lado a lado
-    col1, col2 = st.columns(2)
-
-    with col1:
-        # Gráfico de Pizza - Tipo (existente)
-        pizza_base = df[df['Departamento'].isin(departamentos_selecionados)]
-        pizza_diretos_indiretos = pizza_base['Tipo'].value_counts().reset_index()
-        pizza_diretos_indiretos.columns = ['Tipo', 'count']
-
-        fig_pizza_tipo = px.pie(
-            pizza_diretos_indiretos,
-            names='Tipo', 
-            values='count', 
-            title='Distribuição por Tipo de Efetivo',
-            hole=0.3,
-            color='Tipo',
-            color_discrete_map={'DIRETO':'Blue', 'INDIRETO':'Green'}
-        )
-        fig_pizza_tipo.update_traces(
-            textposition='inside', 
-            textinfo='percent+label',
-            textfont_size=14
-        )
-        st.plotly_chart(fig_pizza_tipo, use_container_width=True)
-
-    with col2:
-        # Novo Gráfico de Pizza - Gênero
-        if 'GENÊRO' in df.columns or 'GÊNERO' in df.columns:
-            coluna_genero = 'GENÊRO' if 'GENÊRO' in df.columns else 'GÊNERO'
-            pizza_genero = pizza_base.copy()
-            pizza_genero['Gênero'] = pizza_genero[coluna_genero].str.upper().str.strip()
-            pizza_genero['Gênero'] = pizza_genero['Gênero'].replace({
-                'FEMINO': 'FEMININO',
-                'MASC': 'MASCULINO',
-                'F': 'FEMININO',
-                'M': 'MASCULINO'
-            })
-            pizza_genero = pizza_genero[pizza_genero['Gênero'].isin(['FEMININO', 'MASCULINO'])]
-            if not pizza_genero.empty:
-                pizza_genero = pizza_genero['Gênero'].value_counts().reset_index()
-                pizza_genero.columns = ['Gênero', 'count']
-                fig_pizza_genero = px.pie(
-                    pizza_genero,
-                    names='Gênero', 
-                    values='count', 
-                    title='Distribuição por Gênero',
-                    hole=0.3,
-                    color='Gênero',
-                    color_discrete_map={'MASCULINO':'Blue', 'FEMININO':'Red'}
-                )
-                fig_pizza_genero.update_traces(
-                    textposition='inside', 
-                    textinfo='percent+label',
-                    textfont_size=14
-                )
-                st.plotly_chart(fig_pizza_genero, use_container_width=True)
-            else:
-                st.warning("Dados de gênero não encontrados (valores devem ser 'Feminino' ou 'Masculino')")
-        else:
-            st.warning("Coluna de gênero não encontrada (procura por 'GENÊRO' ou 'GÊNERO')")
-
-    if not df_filtrado.empty:
-        st.markdown("### 💰 Análise Financeira")
-
-        if analise_financeira == 'Geral':
-            fig_cascata, total_ganhos, total_descontos, remuneracao_liquida = criar_grafico_cascata(df_filtrado, ganhos, descontos)
-            st.plotly_chart(fig_cascata, use_container_width=True)
-            col_fin1, col_fin2, col_fin3 = st.columns(3)
-            col_fin1.metric("💚 Total Ganhos", f"R$ {total_ganhos:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
-            col_fin2.metric("💸 Total Descontos", f"R$ {total_descontos:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
-            col_fin3.metric("💰 Remuneração Líquida", f"R$ {remuneracao_liquida:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
-
-        elif analise_financeira == 'Ganhos':
-            fig_ganhos = criar_grafico_detalhado(df_filtrado, ganhos, "Detalhamento dos Ganhos - Escritório", "green")
-            if fig_ganhos:
-                st.plotly_chart(fig_ganhos, use_container_width=True)
-            else:
-                st.warning("Nenhum dado de ganhos encontrado para os filtros selecionados.")
-
-        elif analise_financeira == 'Descontos':
-            fig_descontos = criar_grafico_detalhado(df_filtrado, descontos, "Detalhamento dos Descontos - Escritório", "red")
-            if fig_descontos:
-                st.plotly_chart(fig_descontos, use_container_width=True)
-            else:
-                st.warning("Nenhum dado de descontos encontrado para os filtros selecionados.")
-
-        st.divider()
-
-    coluna_valor = {
-        'Produção': 'PRODUÇÃO',
-        'Hora Extra Semana': 'Hora Extra 70% - Semana',
-        'Hora Extra Sábado': 'Hora Extra 70% - Sabado'
-    }[tipo_analise]
-
-    if tipo_selecionado == 'Todos':
-        df_ranking = df_filtrado[df_filtrado['Tipo'].isin(['DIRETO', 'INDIRETO'])]
-    else:
-        df_ranking = df_filtrado
-
-    nome_col_funcao = 'Função' if 'Função' in df_ranking.columns else 'Funçao' if 'Funçao' in df_ranking.columns else None
-
-    if tipo_analise == 'Produção' and 'REFLEXO S PRODUÇÃO' in df_ranking.columns:
-        df_ranking['DSR'] = df_ranking['REFLEXO S PRODUÇÃO']
-        cols_rank = ['Nome do Funcionário', nome_col_funcao, 'Departamento', 'Tipo', 'PRODUÇÃO', 'DSR']
-        valor_coluna = 'PRODUÇÃO'
-    else:
-        cols_rank = ['Nome do Funcionário', nome_col_funcao, 'Departamento', 'Tipo', coluna_valor]
-        valor_coluna = coluna_valor
-
-    cols_rank = [c for c in cols_rank if c is not None and c in df_ranking.columns]
-    df_ranking_limp = df_ranking[cols_rank].copy()
-    df_ranking_limp = df_ranking_limp[pd.to_numeric(df_ranking_limp[valor_coluna], errors='coerce').notna()]
-    df_ranking_limp = df_ranking_limp[df_ranking_limp[valor_coluna] > 0]
-    ranking = df_ranking_limp.sort_values(by=valor_coluna, ascending=False)
-
-    valor_total = df_ranking_limp[valor_coluna].sum()
-    st.markdown(f"### 📋 Top Funcionários por **{tipo_analise}**")
-    st.markdown(f"**Total em {tipo_analise}:** R$ {valor_total:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
-
-    if qtd_linhas != 'Todos':
-        ranking = ranking.head(int(qtd_linhas))
-
-    def formatar_valor(x):
-        return f"R$ {x:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-
-    ranking[valor_coluna] = ranking[valor_coluna].apply(formatar_valor)
-    if 'DSR' in ranking.columns:
-        ranking['DSR'] = ranking['DSR'].apply(formatar_valor)
-
-    st.dataframe(ranking, use_container_width=True)
-    st.divider()
-
-    if nome_col_funcao and nome_col_funcao in df_ranking.columns:
-        graf_funcao = df_ranking[nome_col_funcao].value_counts().reset_index()
-        graf_funcao.columns = [nome_col_funcao, 'Qtd']
-        fig_bar = px.bar(
-            graf_funcao,
-            x=nome_col_funcao,
-            y='Qtd',
-            color='Qtd',
-            color_continuous_scale='Blues',
-            title='Quantidade por Função',
-            labels={'Qtd': 'Quantidade', nome_col_funcao: 'Função'}
-        )
-        st.plotly_chart(fig_bar, use_container_width=True)
-
-    st.divider()
-
-    todos_departamentos = sorted(df['Departamento'].astype(str).unique())
-    peso_lista = []
-    for depto in todos_departamentos:
-        df_depto = df[df['Departamento'] == depto]
-        df_direto = df_depto[df_depto['Tipo'] == 'DIRETO']
-        prod_numerador = df_direto['PRODUÇÃO'].sum() + df_direto['REFLEXO S PRODUÇÃO'].sum()
-        prod_denominador = df_direto['Remuneração Líquida Folha'].sum() + df_direto['Adiantamento'].sum()
-        df_dir_ind = df_depto[df_depto['Tipo'].isin(['DIRETO', 'INDIRETO'])]
-        total_extra = df['Total Extra']
-        reposo_remunerado = df_dir_ind['Repouso Remunerado'].sum()
-        hor_extra_denominador = df_dir_ind['Remuneração Líquida Folha'].sum() + df_dir_ind['Adiantamento'].sum()
-
-        if tipo_peso == 'Peso sobre Produção':
-            peso = (prod_numerador / prod_denominador) if prod_denominador > 0 else 0
-        else:
-            peso = (total_extra) if hor_extra_denominador > 0 else 0
-
-        peso_lista.append({'Departamento': depto, 'Peso Financeiro': peso})
-
-    df_peso = pd.DataFrame(peso_lista)
-    df_peso = df_peso.sort_values(by='Peso Financeiro', ascending=False)
-    df_peso['Selecionada'] = df_peso['Departamento'].apply(lambda x: x in departamentos_selecionados)
-    colors = df_peso['Selecionada'].map({True: 'darkblue', False: 'lightblue'})
-
-    fig_peso = px.bar(
-        df_peso,
-        x='Departamento',
-        y='Peso Financeiro',
-        title=f'Peso Financeiro por Departamento ({tipo_peso})',
-        labels={'Peso Financeiro': 'Índice', 'Departamento': 'Departamento'},
-        text=df_peso['Peso Financeiro'].apply(lambda x: f"{x:.2%}"),
-    )
-
-    fig_peso.update_traces(
-        marker_color=colors,
-        textposition='outside',
-        marker_line_color='black',
-        marker_line_width=0.5
-    )
-
-    fig_peso.update_layout(
-        yaxis_tickformat='.0%',
-        showlegend=False,
-        xaxis={'categoryorder': 'array', 'categoryarray': df_peso['Departamento']}
-    )
-
-    st.plotly_chart(fig_peso, use_container_width=True)
-
-
-
-def main():
-    st.set_page_config(page_title="Dashboards Inteligentes", layout="wide")
-
-    # 🔐 Verifica login antes de continuar
-    verificar_login()
-
-    # 🧠 Inicializa a aba padrão após login
-    if 'aba_atual' not in st.session_state:
-        st.session_state.aba_atual = "📊"
-
-    # 1. Cabeçalho
-    col1, col2 = st.columns([1, 4])
-    with col1:
-        st.image("logotipo.png", width=400)
-    with col2:
-        st.markdown("<h1 style='margin-top: 30px;'>SISTEMA INTELIGENTE DE GESTÃO</h1>", unsafe_allow_html=True)
-
-    # 2. Sidebar com navegação baseada no tipo de usuário
-    with st.sidebar:
-        st.title("🎛️ Painel de Controle")
-        st.markdown(f"👤 **Usuário:** {st.session_state.usuario}")
-
-        tipo = st.session_state.tipo_usuario
-        if tipo == "admin":
-            opcoes_abas = {
-                "📊": "efetivo",
-                "📈": "produtividade",
-                "🏢": "escritorio"
-            }
-        elif tipo == "engenharia":
-            opcoes_abas = {
-                "📊": "efetivo",
-                "📈": "produtividade"
-            }
-        else:
-            opcoes_abas = {}
-
-        cols = st.columns(len(opcoes_abas))
-        for idx, (nome_aba, aba_key) in enumerate(opcoes_abas.items()):
-            with cols[idx]:
-                if st.button(nome_aba, key=f"btn_{aba_key}"):
-                    st.session_state.aba_atual = nome_aba
-
-    # 3. Renderização do dashboard conforme aba ativa
-    try:
-        if st.session_state.aba_atual == "📊":
-            dashboard_efetivo()
-        elif st.session_state.aba_atual == "🏢":
-            dashboard_escritorio()
-        elif st.session_state.aba_atual == "📈":
-            dashboard_produtividade()
-    except Exception as e:
-        st.error(f"Erro ao carregar o dashboard: {str(e)}")
-        st.session_state.aba_atual = "📊"
-
-
-if __name__ == "__main__":
-    main()
-
-st.markdown("""---""")
-
-st.markdown(
-    """
-    <div style='text-align: center; font-size: 14px; color: gray; padding-top: 20px;'>
-        <i>“Inspirados pelo que te faz bem”</i>
-        <br>
-        Desenvolvido por <b>Matheus Vinicio</b> — Engenharia
-        <br>
-        © 2025 <a href='https://wifa.com.br/rioave/dashboard' target='_blank' style='color: gray; text-decoration: none;'><b>RIO AVE</b></a>
-    </div>
-    """,
-    unsafe_allow_html=True
-)
-
-
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
+import hashlib
+import glob
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice
+from types import MappingProxyType
+from typing import NamedTuple
+from openpyxl import load_workbook
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import feather
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from formatacao import formatar_moeda, formatar_moeda_serie, formatar_percentual_serie
+import medicao
+import planilhas_google
+
+# plotly.express (o import mais pesado do app) é importado dentro das funções
+# que montam gráficos: só na primeira figura que não estiver no cache.
+
+# Dicionário de usuários (usuário: senha MD5 + tipo de acesso)
+USUARIOS = {
+    "DIRETORIA": {
+        "senha_md5": "22e0a8b25d0066406f729ff0bae51954",  # exemplo: 123456
+        "tipo": "admin"
+    },
+    "Engenharia": {
+        "senha_md5": "d3deb726d5e69228aca43797c614dd26",  # exemplo: 1234
+        "tipo": "engenharia"
+    }
+}
+
+def hash_md5(senha):
+    return hashlib.md5(senha.encode()).hexdigest()
+
+def verificar_login():
+    if "autenticado" not in st.session_state:
+        st.session_state.autenticado = False
+    if "usuario" not in st.session_state:
+        st.session_state.usuario = None
+    if "tipo_usuario" not in st.session_state:
+        st.session_state.tipo_usuario = None
+
+    if not st.session_state.autenticado:
+        st.title("🔒 Login")
+
+        usuario = st.text_input("Usuário:")
+        senha = st.text_input("Senha:", type="password")
+
+        if st.button("Entrar"):
+            if usuario in USUARIOS and hash_md5(senha) == USUARIOS[usuario]["senha_md5"]:
+                st.session_state.autenticado = True
+                st.session_state.usuario = usuario
+                st.session_state.tipo_usuario = USUARIOS[usuario]["tipo"]
+                st.rerun()
+            else:
+                st.error("Usuário ou senha incorretos")
+        st.stop()
+
+ARQUIVO_PRODUTIVIDADE = "produtividade.xlsx"
+
+# Google Sheets no lugar dos .xlsx locais (vazio = lê os arquivos da PASTA_DADOS).
+# PLANILHAS_EFETIVO: chaves separadas por vírgula, cada uma como "AAAA-MM=chave" ou
+# só "chave" (a competência vem do título, como no nome dos arquivos).
+PLANILHAS_EFETIVO = [p.strip() for p in os.environ.get("PLANILHAS_EFETIVO", "").split(",") if p.strip()]
+PLANILHA_PRODUTIVIDADE = os.environ.get("PLANILHA_PRODUTIVIDADE", "")
+CREDENCIAIS_GOOGLE = os.environ.get("CREDENCIAIS_GOOGLE", "credenciais_google.json")
+# Pasta com .xlsx que fazem o papel das planilhas (sem rede), p.ex. para testes
+PASTA_SHEETS_LOCAL = os.environ.get("PASTA_SHEETS_LOCAL", "")
+
+# Snapshots colunares (Feather) das planilhas já normalizadas
+PASTA_SNAPSHOTS = ".snapshots"
+VERSAO_SNAPSHOT = 1  # incrementar sempre que a normalização mudar
+
+# Histórico mensal: uma partição Parquet por competência (AAAA-MM) e por aba
+PASTA_DADOS = "."
+PASTA_HISTORICO = "historico"
+ABAS_HISTORICO = ["EFETIVO", "TERCEIROS"]
+# Produtividade dos meses antigos, consolidada pelo ingestao.py dentro da PASTA_HISTORICO
+ARQUIVO_PRODUTIVIDADE_HISTORICO = "produtividade.parquet"
+# Linha repetida entre planilhas de produtividade: vale a da mais recente
+CHAVE_PRODUTIVIDADE = ['TIPO_OBRA', 'SERVIÇO', 'DATA']
+
+# Chave de cada linha dentro da competência, usada para comparar duas exportações do mesmo mês
+CHAVES_HISTORICO = {
+    "EFETIVO": ['Nome do Funcionário', 'Obra'],
+    "TERCEIROS": ['Obra', 'EMPRESA']
+}
+COLUNAS_EXTRA = ['Hora Extra 70% - Semana', 'Hora Extra 70% - Sabado', 'Hora Extra 100%', 'Repouso Remunerado']
+COLUNAS_FOLHA = ['Remuneração Líquida Folha', 'Adiantamento']
+COLUNAS_PRODUCAO = ['PRODUÇÃO', 'REFLEXO S PRODUÇÃO']
+
+MAPA_GENERO = {
+    'FEMINO': 'FEMININO',
+    'MASC': 'MASCULINO',
+    'F': 'FEMININO',
+    'M': 'MASCULINO'
+}
+
+
+class Coluna(NamedTuple):
+    """Regra de uma coluna na carga do histórico; o nome canônico é a chave no esquema"""
+    apelidos: tuple = ()  # outros nomes da mesma coluna nas planilhas
+    tipo: str = None      # dtype final; 'float64' converte texto inválido em NaN
+    padrao: object = None  # valor dos vazios (e da coluna inteira, se ela não vier)
+    valores: dict = None  # troca de valores, aplicada ao texto em maiúsculas e sem espaços nas pontas
+
+
+# Colunas do EFETIVO que os painéis usam além das de ganhos e descontos. Os
+# painéis só enxergam os nomes canônicos, já com tipo e valores normalizados
+ESQUEMA_EFETIVO = {
+    'Nome do Funcionário': Coluna(),
+    'Obra': Coluna(tipo='category'),
+    'Tipo': Coluna(tipo='category'),
+    'Função': Coluna(apelidos=('Funçao',), tipo='category'),
+    'Departamento': Coluna(tipo='category'),
+    'Gênero': Coluna(apelidos=('GENÊRO', 'GÊNERO'), tipo='category', valores=MAPA_GENERO),
+    'Competência': Coluna(tipo='category'),
+    **{col: Coluna(tipo='float64') for col in COLUNAS_PRODUCAO},
+    **{col: Coluna(tipo='float64', padrao=0) for col in COLUNAS_FOLHA + COLUNAS_EXTRA}
+}
+ESQUEMA_TERCEIROS = {
+    'Obra': Coluna(tipo='category'),
+    'EMPRESA': Coluna(tipo='category'),
+    'QUANTIDADE': Coluna(tipo='int64', padrao=0),
+    'Competência': Coluna(tipo='category')
+}
+
+# Linhas da aba EFETIVO convertidas de cada vez na leitura em blocos
+LINHAS_POR_BLOCO = 5000
+
+# Arquivos antigos cujo nome não traz o ano
+COMPETENCIAS_ARQUIVOS = {
+    "efetivo_abril.xlsx": "2025-04"
+}
+
+MESES_POR_NOME = {
+    'janeiro': 1, 'fevereiro': 2, 'marco': 3, 'abril': 4, 'maio': 5, 'junho': 6,
+    'julho': 7, 'agosto': 8, 'setembro': 9, 'outubro': 10, 'novembro': 11, 'dezembro': 12
+}
+
+
+def _nomes_colunas(cabecalho):
+    """Gera os nomes das colunas como o pd.read_excel (vazias viram 'Unnamed: n', repetidas ganham sufixo)"""
+    nomes = []
+    vistos = {}
+    for i, valor in enumerate(cabecalho):
+        nome = f"Unnamed: {i}" if valor is None else str(valor)
+        if nome in vistos:
+            vistos[nome] += 1
+            nome = f"{nome}.{vistos[nome]}"
+        else:
+            vistos[nome] = 0
+        nomes.append(nome)
+    return nomes
+
+
+def _frame_de_registros(colunas, registros):
+    df = pd.DataFrame(registros, columns=colunas)
+    # Colunas totalmente vazias viram float, como no pd.read_excel
+    vazias = [c for c in df.columns if df[c].dtype == object and df[c].isna().all()]
+    df[vazias] = df[vazias].astype(float)
+    return df
+
+
+def _frame_de_linhas(linhas):
+    """Monta o DataFrame de uma aba (cabeçalho na primeira linha) como o pd.read_excel faria"""
+    linhas = iter(linhas)
+    colunas = _nomes_colunas(next(linhas, ()))
+    return _frame_de_registros(colunas, [linha[:len(colunas)] for linha in linhas if any(v is not None for v in linha)])
+
+
+@medicao.medido
+def ler_abas_excel(caminho, abas):
+    """Lê várias abas da planilha abrindo o arquivo uma única vez (openpyxl somente leitura)"""
+    wb = load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        return {
+            aba: _frame_de_linhas((wb.worksheets[aba] if isinstance(aba, int) else wb[aba]).iter_rows(values_only=True))
+            for aba in abas
+        }
+    finally:
+        wb.close()
+
+
+# Datas e datas/horas como a API as devolve (dateTimeRenderOption FORMATTED_STRING)
+PADRAO_DATA_SHEETS = re.compile(r"\d{2}/\d{2}/\d{4}(?: \d{2}:\d{2}:\d{2})?")
+
+
+def _valor_sheets(valor):
+    """Célula da API como o openpyxl a devolveria: vazia vira None e data volta a ser datetime"""
+    if valor == "":
+        return None
+    if isinstance(valor, str) and PADRAO_DATA_SHEETS.fullmatch(valor):
+        return datetime.strptime(valor, '%d/%m/%Y %H:%M:%S' if len(valor) > 10 else '%d/%m/%Y')
+    return valor
+
+
+@medicao.medido
+def ler_abas_sheets(planilha, abas):
+    """Lê as abas do Google Sheets numa única requisição, no mesmo formato do ler_abas_excel"""
+    dados = {}
+    for aba, valores in planilhas_google.ler_abas(planilha, abas).items():
+        # a API omite as células vazias do fim de cada linha e devolve "" nas do meio
+        largura = max((len(linha) for linha in valores), default=0)
+        linhas = [[_valor_sheets(v) for v in linha] + [None] * (largura - len(linha)) for linha in valores]
+        dados[aba] = _frame_de_linhas(linhas)
+    return dados
+
+
+def normalizar_efetivo(df):
+    """Limpa a aba EFETIVO: nomes de colunas, linhas sem obra e colunas numéricas"""
+    df.columns = df.columns.str.strip()
+    df = df[df['Obra'].notna()].copy()  # Remove linhas com 'Obra' vazia/nan
+
+    # Colunas opcionais: criadas zeradas quando não vierem na planilha
+    for col in ['Hora Extra 70% - Semana', 'Hora Extra 70% - Sabado', 'Hora Extra 100%', 'Repouso Remunerado']:
+        if col not in df.columns:
+            df[col] = 0
+        else:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+
+    df['Remuneração Líquida Folha'] = pd.to_numeric(df['Remuneração Líquida Folha'], errors='coerce').fillna(0)
+    df['Adiantamento'] = pd.to_numeric(df['Adiantamento'], errors='coerce').fillna(0)
+    return df
+
+
+def normalizar_terceiros(df_terceiros):
+    """Limpa a aba TERCEIROS"""
+    df_terceiros.columns = df_terceiros.columns.str.strip()
+    df_terceiros = df_terceiros[df_terceiros['Obra'].notna()].copy()  # Remove linhas com 'Obra' vazia/nan
+    df_terceiros['QUANTIDADE'] = pd.to_numeric(df_terceiros['QUANTIDADE'], errors='coerce').fillna(0).astype(int)
+    return df_terceiros
+
+
+def normalizar_abas_efetivo(abas):
+    return {
+        "EFETIVO": normalizar_efetivo(abas["EFETIVO"]),
+        "TERCEIROS": normalizar_terceiros(abas["TERCEIROS"])
+    }
+
+
+def _juntar_partes(partes):
+    """Junta os pedaços de uma coluna (um por bloco) no tipo que a coluna inteira teria.
+
+    Um bloco sem nenhum valor na coluna vem como float NaN (as colunas vazias do
+    _frame_de_registros); se os outros blocos têm texto ou data, ele passa para
+    o tipo deles antes de juntar, senão a coluna toda viraria object.
+    """
+    partes = [p for p in partes if len(p)] or partes[:1]
+    vazias = [p.dtype == 'float64' and p.isna().all() for p in partes]
+    if any(vazias) and not all(vazias):
+        tipo = next(p.dtype for p, vazia in zip(partes, vazias) if not vazia)
+        if tipo.kind in 'iub':
+            # inteiros com vazios viram float e booleanos com vazios, object (como no DataFrame de uma vez)
+            tipo = np.dtype('float64') if tipo.kind in 'iu' else np.dtype(object)
+        partes = [
+            pd.Series([None] * len(p), index=p.index, dtype=tipo) if vazia else p
+            for p, vazia in zip(partes, vazias)
+        ]
+    coluna = pd.concat(partes)
+    if coluna.dtype == object and len({p.dtype for p in partes}) > 1:
+        # blocos de tipos diferentes (texto num, número noutro): na coluna mista, vazio é None
+        coluna = coluna.where(coluna.notna(), None)
+    return coluna
+
+
+@medicao.medido
+def normalizar_efetivo_em_blocos(linhas, colunas=None, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """O mesmo que normalizar_efetivo(_frame_de_linhas(linhas)), sem montar a aba inteira em memória.
+
+    As linhas (cabeçalho na primeira) são convertidas de linhas_por_bloco em
+    linhas_por_bloco: cada bloco vira um DataFrame tipado, passa pelo
+    normalizar_efetivo (linhas sem obra saem, números são convertidos) e tem
+    suas colunas guardadas em separado; no fim cada coluna é juntada uma vez.
+    Assim o pico fica perto do tamanho do frame final, e não do de todas as
+    células da planilha como objetos Python. colunas restringe as colunas lidas
+    (precisa incluir 'Obra' e as de COLUNAS_FOLHA); None lê todas.
+    """
+    linhas = iter(linhas)
+    nomes = _nomes_colunas(next(linhas, ()))
+    largura = len(nomes)
+    projetar = None
+    if colunas is not None:
+        pedidas = set(colunas)
+        posicoes = [i for i, nome in enumerate(nomes) if nome.strip() in pedidas]
+        nomes = [nomes[i] for i in posicoes]
+        projetar = lambda linha: tuple(linha[i] for i in posicoes)
+
+    partes = None  # partes[j]: os pedaços da coluna j, um por bloco
+    inicio = 0
+    while True:
+        bloco = list(islice(linhas, linhas_por_bloco))
+        if not bloco and partes is not None:
+            break
+        registros = [linha[:largura] for linha in bloco if any(v is not None for v in linha)]
+        if projetar is not None:
+            registros = [projetar(linha) for linha in registros]
+        df = _frame_de_registros(nomes, registros)
+        # o índice continua o do frame inteiro: posição entre as linhas não vazias
+        df.index = pd.RangeIndex(inicio, inicio + len(df))
+        inicio += len(df)
+        df = normalizar_efetivo(df)
+        if partes is None:
+            colunas_finais, partes = df.columns, [[] for _ in df.columns]
+        for j, (_, serie) in enumerate(df.items()):
+            partes[j].append(serie.copy())
+        del bloco, registros, df
+
+    juntas = {}
+    for j in range(len(partes)):
+        juntas[j] = _juntar_partes(partes[j])
+        partes[j] = None  # libera os pedaços da coluna assim que ela é juntada
+    df = pd.DataFrame(juntas)
+    df.columns = colunas_finais
+    return df
+
+
+def construir_efetivo(caminho):
+    """Lê EFETIVO (em blocos) e TERCEIROS numa única passada pelo arquivo"""
+    wb = load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        return {
+            "EFETIVO": normalizar_efetivo_em_blocos(wb["EFETIVO"].iter_rows(values_only=True)),
+            "TERCEIROS": normalizar_terceiros(_frame_de_linhas(wb["TERCEIROS"].iter_rows(values_only=True)))
+        }
+    finally:
+        wb.close()
+
+
+def normalizar_produtividade(df):
+    df['DATA'] = pd.to_datetime(df['DATA'], format='%d/%m/%Y')
+    return {"PRODUTIVIDADE": df}
+
+
+def construir_produtividade(caminho):
+    """Lê a primeira aba da planilha de produtividade"""
+    return normalizar_produtividade(ler_abas_excel(caminho, [0])[0])
+
+
+def cliente_sheets():
+    """Cliente do Google Sheets do processo (ou o substituto local, se PASTA_SHEETS_LOCAL estiver definida)"""
+    return planilhas_google.cliente(CREDENCIAIS_GOOGLE, PASTA_SHEETS_LOCAL or None)
+
+
+def hash_arquivo(caminho):
+    h = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def _preparar_para_snapshot(df):
+    """Deixa o DataFrame serializável em Feather (índice padrão e colunas de tipo único)"""
+    df = df.reset_index(drop=True)
+    for col in df.columns:
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True).startswith("mixed"):
+            df[col] = df[col].map(lambda v: v if pd.isna(v) else str(v))
+    return df
+
+
+def _gravar_atomico(caminho, escrever):
+    """Escreve num arquivo temporário e troca de uma vez, para nunca deixar arquivo pela metade"""
+    temporario = f"{caminho}.tmp"
+    escrever(temporario)
+    os.replace(temporario, caminho)
+
+
+def _gravar_manifesto(caminho_manifesto, manifesto):
+    def escrever(destino):
+        with open(destino, "w", encoding="utf-8") as f:
+            json.dump(manifesto, f, ensure_ascii=False, indent=2)
+    _gravar_atomico(caminho_manifesto, escrever)
+
+
+@medicao.medido
+def carregar_snapshot(caminho, construir):
+    """Devolve as abas normalizadas da planilha, usando o snapshot em disco enquanto ele for válido.
+
+    O snapshot é refeito quando muda o mtime/tamanho do arquivo e o hash do conteúdo
+    não bate mais com o registrado no manifesto.
+    """
+    pasta = os.path.join(PASTA_SNAPSHOTS, os.path.splitext(os.path.basename(caminho))[0])
+    caminho_manifesto = os.path.join(pasta, "manifesto.json")
+    info = os.stat(caminho)
+
+    manifesto = None
+    if os.path.exists(caminho_manifesto):
+        with open(caminho_manifesto, encoding="utf-8") as f:
+            manifesto = json.load(f)
+        if manifesto.get("versao") != VERSAO_SNAPSHOT:
+            manifesto = None
+
+    sha256 = None
+    if manifesto and (manifesto["mtime_ns"], manifesto["tamanho"]) != (info.st_mtime_ns, info.st_size):
+        sha256 = hash_arquivo(caminho)
+        if sha256 != manifesto["sha256"]:
+            manifesto = None
+
+    if manifesto:
+        abas = {
+            aba: feather.read_table(os.path.join(pasta, f"{aba}.feather"), memory_map=True).to_pandas()
+            for aba in manifesto["abas"]
+        }
+        if sha256 is not None:
+            # Só o mtime mudou (arquivo copiado/tocado): atualiza o manifesto e reaproveita
+            manifesto.update(mtime_ns=info.st_mtime_ns, tamanho=info.st_size)
+            _gravar_manifesto(caminho_manifesto, manifesto)
+        return abas
+
+    abas = {aba: _preparar_para_snapshot(df) for aba, df in construir(caminho).items()}
+    os.makedirs(pasta, exist_ok=True)
+    for aba, df in abas.items():
+        _gravar_atomico(
+            os.path.join(pasta, f"{aba}.feather"),
+            lambda destino, df=df: feather.write_feather(df, destino, compression="uncompressed")
+        )
+    _gravar_manifesto(caminho_manifesto, {
+        "versao": VERSAO_SNAPSHOT,
+        "arquivo": os.path.basename(caminho),
+        "sha256": sha256 or hash_arquivo(caminho),
+        "mtime_ns": info.st_mtime_ns,
+        "tamanho": info.st_size,
+        "abas": list(abas)
+    })
+    return abas
+
+
+def competencia_do_arquivo(caminho):
+    """Descobre a competência (AAAA-MM) pelo nome do arquivo: efetivo_2025-04.xlsx ou efetivo_abril_2025.xlsx"""
+    nome = os.path.basename(caminho)
+    if nome in COMPETENCIAS_ARQUIVOS:
+        return COMPETENCIAS_ARQUIVOS[nome]
+
+    base = unicodedata.normalize('NFKD', os.path.splitext(nome)[0].lower()).encode('ascii', 'ignore').decode()
+    achado = re.search(r'(\d{4})-(\d{2})', base)
+    if achado:
+        return f"{achado.group(1)}-{achado.group(2)}"
+    achado = re.search(r'([a-z]+)_(\d{4})', base)
+    if achado and achado.group(1) in MESES_POR_NOME:
+        return f"{achado.group(2)}-{MESES_POR_NOME[achado.group(1)]:02d}"
+    return None
+
+
+def arquivos_por_competencia(pasta):
+    """Planilhas efetivo_*.xlsx da pasta, uma por competência, e as deixadas de lado com o motivo.
+
+    Devolve ({competência: caminho} em ordem de nome, {nome: motivo}). Se dois
+    arquivos dão o mesmo mês (efetivo_abril.xlsx e efetivo_2025-04.xlsx, p.ex.),
+    fica o último em ordem de nome; ingerir os dois faria um desfazer o outro.
+    """
+    escolhidos, ignorados = {}, {}
+    for caminho in sorted(glob.glob(os.path.join(pasta, "efetivo_*.xlsx"))):
+        competencia = competencia_do_arquivo(caminho)
+        if competencia is None:
+            ignorados[os.path.basename(caminho)] = "competência não reconhecida no nome"
+            continue
+        if competencia in escolhidos:
+            ignorados[os.path.basename(escolhidos[competencia])] = f"substituído por {os.path.basename(caminho)}"
+        escolhidos[competencia] = caminho
+    return dict(sorted(escolhidos.items(), key=lambda item: item[1])), ignorados
+
+
+def formatar_competencia(competencia):
+    """'2025-04' -> 'Abr/25'"""
+    return mes_ano_pt(pd.Timestamp(f"{competencia}-01"))
+
+
+def _ler_manifesto_historico():
+    caminho = os.path.join(PASTA_HISTORICO, "manifesto.json")
+    if not os.path.exists(caminho):
+        return {"competencias": {}}
+    with open(caminho, encoding="utf-8") as f:
+        manifesto = json.load(f)
+    for registro in manifesto["competencias"].values():
+        # meses ingeridos antes do controle de revisões
+        registro.setdefault("revisao", 1)
+        registro.setdefault("obras", {})
+    return manifesto
+
+
+def _caminho_particao(aba, competencia):
+    return os.path.join(PASTA_HISTORICO, aba, f"competencia={competencia}", "dados.parquet")
+
+
+# Colunas mínimas de uma partição que não existe (ou não tem linhas), para quem agrega o mês
+COLUNAS_PARTICAO_VAZIA = {
+    "EFETIVO": ['Obra', 'Tipo'] + COLUNAS_EXTRA + COLUNAS_FOLHA,
+    "TERCEIROS": ['Obra', 'EMPRESA', 'QUANTIDADE'],
+    "AGREGADOS": ['Obra', 'Efetivo', 'extra', 'folha', 'Terceiros']
+}
+
+
+def _ler_particao(aba, competencia, obras=None, colunas=None):
+    """Partição de um mês (só das obras pedidas); sem arquivo ou sem linhas, um frame vazio.
+
+    Uma planilha que normaliza para zero linhas (aba só com cabeçalho) grava uma
+    partição vazia, em que a coluna 'Obra' não tem tipo e não aceita o filtro.
+    """
+    caminho = _caminho_particao(aba, competencia)
+    if not os.path.exists(caminho) or pq.read_metadata(caminho).num_rows == 0:
+        return pd.DataFrame(columns=colunas or COLUNAS_PARTICAO_VAZIA[aba])
+    filtro = [('Obra', 'in', sorted(obras))] if obras is not None else None
+    return pd.read_parquet(caminho, columns=colunas, filters=filtro)
+
+
+def _indexar_por_chave(df, chave):
+    """Indexa por (chave..., ocorrência) para que linhas repetidas da mesma pessoa/obra também casem"""
+    colunas = [df[c].astype(str) for c in chave]
+    ocorrencia = df.groupby(colunas, dropna=False).cumcount()
+    return df.set_index(pd.MultiIndex.from_arrays(colunas + [ocorrencia], names=chave + ['Ocorrência']))
+
+
+def comparar_versoes(antigo, novo, chave):
+    """Separa as linhas inseridas, atualizadas e removidas entre duas exportações da mesma competência"""
+    antigo = _indexar_por_chave(antigo, chave)
+    novo = _indexar_por_chave(novo, chave)
+    colunas = novo.columns.union(antigo.columns, sort=False)
+
+    comuns = novo.index.intersection(antigo.index)
+    valores_antigos = antigo.reindex(index=comuns, columns=colunas).astype(object)
+    valores_novos = novo.reindex(index=comuns, columns=colunas).astype(object)
+    iguais = (valores_antigos == valores_novos) | (valores_antigos.isna() & valores_novos.isna())
+
+    inseridas = novo.loc[novo.index.difference(antigo.index)]
+    atualizadas = novo.loc[comuns[~iguais.all(axis=1).to_numpy()]]
+    removidas = antigo.loc[antigo.index.difference(novo.index)]
+    return inseridas, atualizadas, removidas
+
+
+def agregar_por_obra(efetivo, terceiros):
+    """Totais por obra guardados no histórico: efetivo, hora extra, folha e terceiros"""
+    dir_ind = efetivo[efetivo['Tipo'].isin(['DIRETO', 'INDIRETO'])]
+    agregado = pd.DataFrame({
+        'Obra': dir_ind['Obra'].astype(str),
+        'Efetivo': 1,
+        'extra': dir_ind.reindex(columns=COLUNAS_EXTRA).fillna(0).sum(axis=1),
+        'folha': dir_ind.reindex(columns=COLUNAS_FOLHA).fillna(0).sum(axis=1)
+    }).groupby('Obra').sum()
+    agregado = agregado.join(
+        terceiros.groupby(terceiros['Obra'].astype(str))['QUANTIDADE'].sum().rename('Terceiros'),
+        how='outer'
+    )
+    return agregado.fillna(0).astype({'Efetivo': int, 'Terceiros': int})
+
+
+def _atualizar_agregados(competencia, obras):
+    """Recalcula os agregados só das obras afetadas; as demais obras do mês ficam como estavam"""
+    obras = sorted(obras)
+    novos = agregar_por_obra(
+        _ler_particao("EFETIVO", competencia, obras), _ler_particao("TERCEIROS", competencia, obras)
+    )
+    destino = _caminho_particao("AGREGADOS", competencia)
+    if os.path.exists(destino):
+        antigos = _ler_particao("AGREGADOS", competencia).set_index('Obra')
+        novos = pd.concat([antigos.drop(index=obras, errors='ignore'), novos]).sort_index()
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    _gravar_atomico(destino, lambda tmp: novos.reset_index().to_parquet(tmp, index=False))
+
+
+@contextmanager
+def _gravacao_historico(estado):
+    """Marca o histórico como em gravação; ler_historico espera e relê se cruzar com ela"""
+    with estado['condicao']:
+        estado['gravando'] = True
+    try:
+        yield
+    finally:
+        with estado['condicao']:
+            estado['gravando'] = False
+            estado['geracao'] += 1
+            estado['condicao'].notify_all()
+
+
+@medicao.medido
+def ingerir_competencia(abas, origem, competencia, manifesto, estado):
+    """Aplica na partição da competência só o que mudou desde a última exportação ingerida.
+
+    abas traz EFETIVO e TERCEIROS já normalizados; origem identifica de onde
+    vieram (arquivo e hash, ou planilha e data de modificação) e vai para o manifesto.
+
+    Se a nova exportação não altera nenhuma linha, a revisão do mês não muda e os
+    caches que dependem dela continuam válidos. Os agregados por obra só são
+    recalculados para as obras com linhas inseridas, atualizadas ou removidas.
+    A leitura da planilha e a comparação ficam fora da gravação; só a troca dos
+    arquivos bloqueia (brevemente) as leituras do histórico. Na primeira
+    ingestão do mês todas as partições são gravadas, mesmo as sem linhas.
+    """
+    # mesma limpeza de tipos do snapshot, venham as abas de arquivo ou do Google Sheets
+    abas = {aba: _preparar_para_snapshot(abas[aba]) for aba in ABAS_HISTORICO}
+    registro = manifesto["competencias"].get(competencia, {"revisao": 0, "obras": {}})
+
+    afetadas_por_aba = {}
+    novas = set()
+    for aba in ABAS_HISTORICO:
+        destino = _caminho_particao(aba, competencia)
+        if os.path.exists(destino):
+            mudancas = comparar_versoes(pd.read_parquet(destino), abas[aba], CHAVES_HISTORICO[aba])
+            afetadas_por_aba[aba] = set().union(*(m.index.get_level_values('Obra') for m in mudancas))
+        else:
+            novas.add(aba)
+            afetadas_por_aba[aba] = set(abas[aba]['Obra'].astype(str))
+    obras_afetadas = set().union(*afetadas_por_aba.values())
+    if not os.path.exists(_caminho_particao("AGREGADOS", competencia)):
+        novas.add("AGREGADOS")
+
+    if obras_afetadas or novas:
+        with _gravacao_historico(estado):
+            for aba, afetadas in afetadas_por_aba.items():
+                if afetadas or aba in novas:
+                    destino = _caminho_particao(aba, competencia)
+                    os.makedirs(os.path.dirname(destino), exist_ok=True)
+                    _gravar_atomico(destino, lambda tmp, df=abas[aba]: df.to_parquet(tmp, index=False))
+            _atualizar_agregados(competencia, obras_afetadas)
+        if obras_afetadas or novas - {"AGREGADOS"}:
+            registro["revisao"] += 1
+        for obra in obras_afetadas:
+            registro["obras"][obra] = registro["revisao"]
+
+    # a identificação da origem anterior (arquivo ou planilha) não vale mais
+    for campo in ("sha256", "mtime_ns", "tamanho", "modificado_em"):
+        registro.pop(campo, None)
+    registro.update(origem)
+    registro.update({
+        "ingerido_em": datetime.now().isoformat(timespec="seconds"),
+        "obras_afetadas": sorted(obras_afetadas)
+    })
+    manifesto["competencias"][competencia] = registro
+    os.makedirs(PASTA_HISTORICO, exist_ok=True)
+    _gravar_manifesto(os.path.join(PASTA_HISTORICO, "manifesto.json"), manifesto)
+    return manifesto
+
+
+def origem_pendente(manifesto, competencia, caminho):
+    """Origem (arquivo, hash, mtime e tamanho) a registrar se o arquivo ainda não foi ingerido; None se já foi"""
+    registro = manifesto["competencias"].get(competencia)
+    info = os.stat(caminho)
+    if registro and registro["arquivo"] == os.path.basename(caminho):
+        if (registro["mtime_ns"], registro["tamanho"]) == (info.st_mtime_ns, info.st_size):
+            return None
+        if registro["sha256"] == hash_arquivo(caminho):
+            return None
+    return {
+        "arquivo": os.path.basename(caminho),
+        "sha256": hash_arquivo(caminho),
+        "mtime_ns": info.st_mtime_ns,
+        "tamanho": info.st_size
+    }
+
+
+def _sincronizar_arquivos(manifesto, estado):
+    """Ingere as planilhas efetivo_*.xlsx novas ou alteradas; meses já ingeridos e iguais não são relidos"""
+    for competencia, caminho in arquivos_por_competencia(PASTA_DADOS)[0].items():
+        origem = origem_pendente(manifesto, competencia, caminho)
+        if origem is None:
+            continue
+        abas = carregar_snapshot(caminho, construir_efetivo)
+        manifesto = ingerir_competencia(abas, origem, competencia, manifesto, estado)
+    return manifesto
+
+
+def _sincronizar_sheets(manifesto, estado):
+    """Ingere as planilhas do Google Sheets alteradas desde a última ingestão.
+
+    Só a data de modificação do Drive é consultada a cada passada; as abas só
+    são baixadas (todas numa requisição) quando ela muda.
+    """
+    cliente = cliente_sheets()
+    for item in PLANILHAS_EFETIVO:
+        competencia, _, chave = item.rpartition("=")
+        planilha = planilhas_google.abrir_planilha(cliente, chave)
+        competencia = competencia or competencia_do_arquivo(planilha.title)
+        if competencia is None:
+            continue
+        modificado_em = planilhas_google.revisao(planilha)
+        origem = {"arquivo": f"sheets:{chave}", "modificado_em": modificado_em}
+        registro = manifesto["competencias"].get(competencia)
+        if registro and (registro["arquivo"], registro.get("modificado_em")) == (origem["arquivo"], modificado_em):
+            continue
+        abas = normalizar_abas_efetivo(ler_abas_sheets(planilha, ["EFETIVO", "TERCEIROS"]))
+        manifesto = ingerir_competencia(abas, origem, competencia, manifesto, estado)
+    return manifesto
+
+
+def sincronizar_historico(estado):
+    """Traz para o histórico o que mudou na origem dos dados (Google Sheets, se configurado, ou arquivos)"""
+    manifesto = _ler_manifesto_historico()
+    if PLANILHAS_EFETIVO:
+        manifesto = _sincronizar_sheets(manifesto, estado)
+    else:
+        manifesto = _sincronizar_arquivos(manifesto, estado)
+
+    for competencia in manifesto["competencias"]:
+        if not os.path.exists(_caminho_particao("AGREGADOS", competencia)):
+            obras = set()
+            for aba in ABAS_HISTORICO:
+                obras |= set(_ler_particao(aba, competencia, colunas=['Obra'])['Obra'].astype(str))
+            with _gravacao_historico(estado):
+                _atualizar_agregados(competencia, obras)
+    return manifesto
+
+
+# ======================================
+# ATUALIZAÇÃO EM SEGUNDO PLANO
+# ======================================
+
+INTERVALO_ATUALIZACAO = 30  # segundos entre duas verificações da pasta de dados
+
+
+@st.cache_resource
+def _estado_dados():
+    """Versão publicada dos dados, compartilhada por todas as sessões.
+
+    Só o atualizador troca 'manifesto' e 'produtividade', e sempre por objetos
+    completos: quem pegou a versão anterior continua com ela inteira.
+    """
+    return {
+        'manifesto': _ler_manifesto_historico(),
+        'produtividade': None,
+        'erro': None,
+        'atualizado_em': None,
+        'gravando': False,
+        'geracao': 0,
+        'condicao': threading.Condition(),
+        'primeira_carga': threading.Event()
+    }
+
+
+def _atualizar_dados(estado):
+    """Uma passada do atualizador: ingere o que mudou e só então publica a nova versão"""
+    manifesto = sincronizar_historico(estado)
+    with estado['condicao']:
+        estado['manifesto'] = manifesto
+
+    versao = versao_produtividade()
+    if estado['produtividade'] is None or estado['produtividade']['versao'] != versao:
+        soma, contagem = agregar_produtividade(carregar_produtividade())
+        with estado['condicao']:
+            estado['produtividade'] = MappingProxyType({'versao': versao, 'soma': soma, 'contagem': contagem})
+
+    estado['atualizado_em'] = datetime.now()
+
+
+def _laco_atualizador(estado):
+    while True:
+        try:
+            _atualizar_dados(estado)
+            estado['erro'] = None
+        except Exception as e:
+            # a versão publicada continua valendo; tenta de novo na próxima passada
+            estado['erro'] = f"{type(e).__name__}: {e}"
+        estado['primeira_carga'].set()
+        time.sleep(INTERVALO_ATUALIZACAO)
+
+
+@st.cache_resource
+def iniciar_atualizador():
+    """Sobe (uma vez por servidor) a thread que re-ingere as planilhas fora das requisições"""
+    atualizador = threading.Thread(
+        target=_laco_atualizador, args=(_estado_dados(),), name="atualizador-dados", daemon=True
+    )
+    atualizador.start()
+    return atualizador
+
+
+def _aquecer(estado):
+    estado['primeira_carga'].wait()
+    try:
+        aquecer_efetivo()
+    except Exception as e:
+        # aquecimento é só otimização: a primeira sessão calcula o que faltar
+        estado['erro'] = estado['erro'] or f"Aquecimento: {type(e).__name__}: {e}"
+
+
+@st.cache_resource
+def iniciar_aquecimento():
+    """Ao primeiro acesso do servidor (ainda na tela de login), prepara em segundo plano o 📊 padrão.
+
+    A thread herda o contexto da execução atual só para poder usar os caches do
+    Streamlit; ela não desenha nada na página.
+    """
+    aquecimento = threading.Thread(target=_aquecer, args=(_estado_dados(),), name="aquecimento", daemon=True)
+    add_script_run_ctx(aquecimento, get_script_run_ctx())
+    aquecimento.start()
+    return aquecimento
+
+
+def aguardar_primeira_carga():
+    """Servidor recém-iniciado e nada publicado ainda: avisa e tenta de novo, sem esperar a ingestão"""
+    estado = _estado_dados()
+    if estado['primeira_carga'].is_set():
+        if estado['erro']:
+            st.error(f"Erro ao atualizar os dados: {estado['erro']}")
+        else:
+            st.warning("Nenhuma planilha de dados encontrada.")
+        st.stop()
+    st.info("⏳ Preparando os dados pela primeira vez. A página atualiza sozinha.")
+    estado['primeira_carga'].wait(timeout=2)
+    st.rerun()
+
+
+def listar_competencias():
+    return sorted(_estado_dados()['manifesto']["competencias"])
+
+
+def _tipo_comum(tipos):
+    """Tipo que acomoda os de todos os meses; tipos que não se juntam (data num mês, texto noutro) viram texto"""
+    try:
+        esquemas = [pa.schema([("coluna", tipo)]) for tipo in tipos]
+        return pa.unify_schemas(esquemas, promote_options="permissive").field("coluna").type
+    except (pa.ArrowTypeError, pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return pa.large_string()
+
+
+def _ler_particoes(aba, competencias, colunas=None):
+    """Lê as partições pedidas da aba e junta numa tabela só, com a coluna 'competencia'.
+
+    Cada mês é gravado com os tipos da própria planilha: uma coluna vazia no mês
+    fica double, e a mesma coluna pode ser data noutro mês. Só as colunas lidas
+    dos meses lidos entram no esquema comum, e uma coluna toda vazia no mês não
+    conta, apenas recebe o tipo dos outros meses.
+    """
+    tabelas = []
+    for competencia in sorted(competencias):
+        caminho = _caminho_particao(aba, competencia)
+        if not os.path.exists(caminho):
+            continue
+        nomes = pq.read_schema(caminho).names
+        lidas = None if colunas is None else [c for c in colunas if c in nomes]
+        tabela = pq.read_table(caminho, columns=lidas).replace_schema_metadata(None)
+        tabelas.append(tabela.append_column("competencia", pa.array([competencia] * tabela.num_rows, pa.string())))
+    if not tabelas:
+        return pa.table({"competencia": pa.array([], pa.string())})
+
+    # ordem das colunas: a pedida, ou a de primeira aparição entre os meses
+    nomes = list(dict.fromkeys(n for tabela in tabelas for n in tabela.column_names))
+    if colunas is not None:
+        nomes = [c for c in colunas if c in nomes] + ["competencia"]
+    tipos = {}
+    for nome in nomes:
+        presentes = [t.column(nome) for t in tabelas if nome in t.column_names]
+        cheias = [c.type for c in presentes if c.null_count < len(c)]
+        tipos[nome] = _tipo_comum(cheias) if cheias else presentes[0].type
+
+    juntas = []
+    for tabela in tabelas:
+        colunas_mes = []
+        for nome in nomes:
+            if nome not in tabela.column_names or tabela.column(nome).null_count == tabela.num_rows:
+                colunas_mes.append(pa.nulls(tabela.num_rows, tipos[nome]))
+            else:
+                colunas_mes.append(tabela.column(nome).cast(tipos[nome]))
+        juntas.append(pa.table(colunas_mes, names=nomes))
+    return pa.concat_tables(juntas)
+
+
+@medicao.medido
+def ler_historico(aba, competencias, colunas=None):
+    """Lê do histórico só as competências (e colunas) pedidas.
+
+    Se o atualizador gravar durante a leitura, lê de novo: nunca devolve meia
+    ingestão (parte dos arquivos antes e parte depois da troca).
+    """
+    estado = _estado_dados()
+    while True:
+        with estado['condicao']:
+            estado['condicao'].wait_for(lambda: not estado['gravando'])
+            geracao = estado['geracao']
+        tabela = _ler_particoes(aba, competencias, colunas)
+        with estado['condicao']:
+            if not estado['gravando'] and estado['geracao'] == geracao:
+                break
+    return tabela.to_pandas().rename(columns={"competencia": "Competência"})
+
+
+def versao_historico(competencias):
+    """Identifica o conteúdo das competências (muda só quando alguma linha do mês muda)"""
+    registros = _estado_dados()['manifesto']["competencias"]
+    return "|".join(f"{c}:{registros[c]['revisao']}" for c in competencias)
+
+
+def colunas_efetivo_painel():
+    ganhos, descontos = definir_colunas_ganhos_descontos()
+    nomes = [nome for canonico, regra in ESQUEMA_EFETIVO.items() for nome in (canonico,) + regra.apelidos]
+    return list(dict.fromkeys(nomes + ganhos + descontos))
+
+
+def aplicar_esquema(df, esquema):
+    """Deixa o frame com os nomes canônicos, tipos e valores do esquema.
+
+    Cada coluna canônica junta a coluna de mesmo nome e os apelidos (em cada
+    linha vale o primeiro não vazio; meses diferentes podem vir com nomes
+    diferentes). Sem nenhuma delas, a coluna só é criada se tiver padrão.
+    """
+    for nome, regra in esquema.items():
+        fontes = [c for c in (nome,) + regra.apelidos if c in df.columns]
+        if fontes:
+            serie = df[fontes[0]]
+            for outra in fontes[1:]:
+                serie = serie.fillna(df[outra])
+            df = df.drop(columns=fontes[1:]).rename(columns={fontes[0]: nome})
+        elif regra.padrao is not None:
+            serie = pd.Series(regra.padrao, index=df.index)
+        else:
+            continue
+
+        if regra.valores:
+            serie = serie.str.upper().str.strip().replace(regra.valores)
+        if regra.tipo == 'float64':
+            serie = pd.to_numeric(serie, errors='coerce')
+        if regra.padrao is not None:
+            serie = serie.fillna(regra.padrao)
+        df[nome] = serie.astype(regra.tipo) if regra.tipo else serie
+    return df
+
+
+def compactar_frame(df):
+    """Reduz o frame em memória: float32 onde o valor volta idêntico.
+
+    Quem agrega converte de volta para float64, então o float32 só vale para
+    colunas cujos valores ele representa sem arredondar (inteiros, zeros).
+    """
+    for col in df.select_dtypes('float64').columns:
+        reduzida = df[col].astype('float32')
+        if np.array_equal(reduzida.to_numpy(dtype='float64'), df[col].to_numpy(), equal_nan=True):
+            df[col] = reduzida
+    return df
+
+
+@st.cache_resource(max_entries=8)
+@medicao.medido
+def _carregar_conjunto_efetivo(competencias, versao):
+    """Monta uma única vez, para todas as sessões, os dados de uma faixa de competências.
+
+    O cache_resource entrega o mesmo objeto a todas as sessões, sem pickle nem
+    cópia por chamada. Por isso nada do que sai daqui é alterado no lugar: os
+    painéis só filtram, o esquema (nomes, tipos, valores) é aplicado aqui e as
+    colunas derivadas (Total Extra) nascem aqui. Os índices por obra permitem
+    filtrar sem varrer o frame inteiro.
+    """
+    efetivo = aplicar_esquema(ler_historico("EFETIVO", competencias, colunas=colunas_efetivo_painel()), ESQUEMA_EFETIVO)
+    efetivo = compactar_frame(efetivo)
+    efetivo['Total Extra'] = efetivo['Hora Extra 70% - Semana'] + efetivo['Hora Extra 70% - Sabado'] + efetivo['Hora Extra 100%']
+    terceiros = compactar_frame(aplicar_esquema(ler_historico("TERCEIROS", competencias), ESQUEMA_TERCEIROS))
+
+    matriz = montar_matriz_financeira(efetivo)
+    matriz['valores'].setflags(write=False)
+
+    return MappingProxyType({
+        'efetivo': efetivo,
+        'terceiros': terceiros,
+        'matriz': MappingProxyType(matriz),
+        'cubo': montar_cubo(efetivo),
+        'indice_efetivo': indexar_por_obra(efetivo),
+        'indice_terceiros': indexar_por_obra(terceiros)
+    })
+
+
+def indexar_por_obra(df):
+    """Posições das linhas de cada obra e de cada (obra, tipo), em ordem crescente.
+
+    Montado uma vez por conjunto; selecionar_linhas usa só as posições das
+    obras escolhidas, em vez de uma máscara sobre todas as linhas.
+    """
+    indice = {'obra': df.groupby('Obra', observed=True, sort=False).indices}
+    if 'Tipo' in df.columns:
+        indice['obra_tipo'] = df.groupby(['Obra', 'Tipo'], observed=True, sort=False).indices
+    return MappingProxyType(indice)
+
+
+def selecionar_linhas(df, indice, obras, tipos=None):
+    """Linhas das obras (e tipos) escolhidas, na mesma ordem de df[df['Obra'].isin(obras)]"""
+    if tipos is None:
+        partes = [indice['obra'][obra] for obra in obras if obra in indice['obra']]
+    else:
+        partes = [
+            indice['obra_tipo'][(obra, tipo)] for obra in obras for tipo in tipos
+            if (obra, tipo) in indice['obra_tipo']
+        ]
+    if not partes:
+        return df.iloc[0:0]
+    # as posições de cada obra já estão em ordem; juntas, voltam à ordem do frame
+    return df.iloc[np.sort(np.concatenate(partes))]
+
+
+def carregar_conjunto_efetivo(competencias):
+    """Dados compartilhados (somente leitura) das competências escolhidas"""
+    competencias = tuple(competencias)
+    return _carregar_conjunto_efetivo(competencias, versao_historico(competencias))
+
+
+@medicao.medido
+def resumir_historico_por_obra(competencias):
+    """Efetivo, terceiros e peso de hora extra por obra e competência.
+
+    Lê só os agregados por obra mantidos na ingestão, então 24 meses custam
+    algumas centenas de linhas, e não 24 planilhas.
+    """
+    resumo = ler_historico("AGREGADOS", competencias)
+    resumo['Peso sobre Hora Extra'] = (resumo['extra'] / resumo['folha']).where(resumo['folha'] > 0, 0)
+    return resumo[['Competência', 'Obra', 'Efetivo', 'Terceiros', 'Peso sobre Hora Extra']]
+
+
+def selecionar_competencias(key):
+    """Seletor do intervalo de competências na barra lateral (padrão: só o mês mais recente)"""
+    competencias = listar_competencias()
+    if not competencias:
+        aguardar_primeira_carga()
+    if len(competencias) <= 1:
+        return tuple(competencias)
+    inicio, fim = st.select_slider(
+        "Competência:",
+        options=competencias,
+        value=(competencias[-1], competencias[-1]),
+        format_func=formatar_competencia,
+        key=key
+    )
+    return tuple(c for c in competencias if inicio <= c <= fim)
+
+def definir_colunas_ganhos_descontos():
+    """Define as colunas de ganhos e descontos"""
+    ganhos = ['SALÁRIO',
+    'Periculosidade',
+    'Dias De Atestado',
+    'Gratificação',
+    'Adicional noturno 20%',
+    'Ajuda De Saude',
+    'Auxilio Creche',
+    'Auxilio Educacao',
+    'EQUIP. TRAB/FERRAMENTA',
+    'Auxilio Moradia',
+    'Auxilio Transporte',
+    'Adicional Noturno 20%',
+    'Dev.desc.indevido',
+    'Salário Substituiçã',
+    'Reflexo S/ He Produção',
+    'Reembolso V. Transporte',
+    'Prêmio',
+    'Premio-gestao Desempenho','Passagem Interior','Passagem Interior Adiantamento','Hora Extra 70% - Sabado','Hora Extra 70% - Semana','Salário Maternidade','Adicional H.e S/ Producao 70%','PRODUÇÃO','AJUDA DE CUSTO','Ajuda de Custo Combustivel', 'REFLEXO S PRODUÇÃO','Hora Extra 100%','Repouso Remunerado','Salário Família',
+    'Insuficiência de Saldo', 'Auxilio Transporte Retroativo'
+    ]
+
+    descontos = ['Atrasos', 'Faltas em Dias', 'Assistencia Medica',
+    'Coparticipacao Dependente',
+    'Coparticipacao Titular',
+    'Desconto Empréstimo',
+    'Diferenca Plano De Saude',
+    'Desconto Ótica',
+    'Plano Odontologico',
+    'Plano Odontologico Dependente',
+    'Pensão Alimentícia  Salário Mínimo',
+    'Assitência Médica Dependente','Dsr sobre falta', 'INSS Folha', 'IRRF Folha', 'Pensão Alimentícia','DESCONTO DE ALIMENTAÇÃO',
+    'MENSALIDADE SINDICAL','Vale Transporte','Correção adiantamento', 'Desconto Pagt A Maior']
+    
+    return ganhos, descontos
+
+
+def montar_matriz_financeira(df):
+    """Converte uma única vez as colunas de ganhos e descontos numa matriz float64 contígua (linhas x colunas)"""
+    ganhos, descontos = definir_colunas_ganhos_descontos()
+    # dict.fromkeys remove nomes repetidos mantendo a ordem
+    ganhos = [col for col in dict.fromkeys(ganhos) if col in df.columns]
+    descontos = [col for col in dict.fromkeys(descontos) if col in df.columns and col not in ganhos]
+    colunas = ganhos + descontos
+
+    valores = df[colunas].apply(pd.to_numeric, errors='coerce').fillna(0).to_numpy(dtype='float64')
+    return {
+        'indice': df.index,
+        'colunas': colunas,
+        'ganhos': ganhos,
+        'descontos': descontos,
+        'valores': np.ascontiguousarray(valores)
+    }
+
+
+def carregar_matriz_financeira(competencias):
+    return carregar_conjunto_efetivo(competencias)['matriz']
+
+
+@medicao.medido
+def totalizar_colunas(matriz, df_filtrado):
+    """Soma cada coluna da matriz financeira nas linhas de df_filtrado (uma soma mascarada, sem laço por coluna)"""
+    mascara = np.zeros(len(matriz['valores']))
+    mascara[matriz['indice'].get_indexer(df_filtrado.index)] = 1.0
+    return pd.Series(mascara @ matriz['valores'], index=matriz['colunas'])
+
+
+@medicao.medido
+def criar_grafico_cascata(totais, ganhos, descontos):
+    """Cria o gráfico de cascata"""
+    # Calcula totais (descontos vêm negativos da folha)
+    total_ganhos = totais[ganhos].sum()
+    total_descontos = -totais[descontos].sum()
+
+    # Remuneração líquida
+    remuneracao_liquida = total_ganhos - total_descontos
+
+    # Dados para o gráfico de cascata
+    categorias = ['Ganhos', 'Descontos', 'Remuneração Líquida']
+    valores = [total_ganhos, total_descontos, remuneracao_liquida]
+    cores = ['green', 'red', 'blue']
+
+    fig_cascata = go.Figure()
+
+    # Adiciona as barras
+    fig_cascata.add_trace(go.Waterfall(
+        name="Fluxo Financeiro",
+        orientation="v",
+        measure=["relative", "relative", "total"],
+        x=categorias,
+        textposition="outside",
+        text=formatar_moeda_serie(valores),
+        y=[total_ganhos, -total_descontos, 0],
+        connector={"line": {"color": "rgb(63, 63, 63)"}},
+        increasing={"marker": {"color": "green"}},
+        decreasing={"marker": {"color": "red"}},
+        totals={"marker": {"color": "blue"}}
+    ))
+
+    fig_cascata.update_layout(
+        title="Análise Financeira - Ganhos vs Descontos",
+        showlegend=False,
+        yaxis_title="Valor (R$)",
+        xaxis_title="Categoria"
+    )
+
+    return fig_cascata, total_ganhos, total_descontos, remuneracao_liquida
+
+@medicao.medido
+def criar_grafico_detalhado(totais, colunas, titulo, cor):
+    """Cria gráfico de colunas detalhado para ganhos ou descontos"""
+    import plotly.express as px
+
+    valores = totais[colunas]
+    valores = valores[valores != 0]  # Só inclui se houver valor
+
+    if valores.empty:
+        return None
+
+    df_detalhado = pd.DataFrame({'Categoria': valores.index, 'Valor': valores.to_numpy()})
+    df_detalhado = df_detalhado.sort_values('Valor', ascending=False)
+
+    fig_detalhado = px.bar(
+        df_detalhado,
+        x='Categoria',
+        y='Valor',
+        title=titulo,
+        color_discrete_sequence=[cor],
+        text=formatar_moeda_serie(df_detalhado['Valor'])
+    )
+
+    fig_detalhado.update_traces(textposition='outside')
+    fig_detalhado.update_layout(xaxis_tickangle=-45)
+
+    return fig_detalhado
+
+@medicao.medido
+def calcular_peso_financeiro(df, coluna_grupo):
+    """Calcula o peso sobre produção e o peso sobre hora extra de todos os grupos num único groupby.
+
+    Produção: (PRODUÇÃO + REFLEXO S PRODUÇÃO) / (Remuneração Líquida Folha + Adiantamento) do efetivo DIRETO.
+    Hora extra: (Total Extra + Repouso Remunerado) / (Remuneração Líquida Folha + Adiantamento) de DIRETO + INDIRETO.
+    """
+    eh_direto = df['Tipo'] == 'DIRETO'
+    eh_dir_ind = df['Tipo'].isin(['DIRETO', 'INDIRETO'])
+    base_folha = df['Remuneração Líquida Folha'].fillna(0) + df['Adiantamento'].fillna(0)
+
+    parcelas = pd.DataFrame({
+        'prod_num': (df['PRODUÇÃO'].fillna(0) + df['REFLEXO S PRODUÇÃO'].fillna(0)).where(eh_direto, 0),
+        'prod_den': base_folha.where(eh_direto, 0),
+        'extra_num': (df['Total Extra'].fillna(0) + df['Repouso Remunerado'].fillna(0)).where(eh_dir_ind, 0),
+        'extra_den': base_folha.where(eh_dir_ind, 0)
+    }).astype('float64')
+    somas = parcelas.groupby(df[coluna_grupo].astype(str)).sum()
+
+    pesos = pd.DataFrame({
+        'Peso sobre Produção': (somas['prod_num'] / somas['prod_den']).where(somas['prod_den'] > 0, 0),
+        'Peso sobre Hora Extra': (somas['extra_num'] / somas['extra_den']).where(somas['extra_den'] > 0, 0)
+    })
+    pesos.index.name = coluna_grupo
+    return pesos
+
+
+@medicao.medido
+def criar_grafico_peso(pesos, tipo_peso, selecionados):
+    """Cria o gráfico de barras do Peso Financeiro, destacando os grupos selecionados"""
+    import plotly.express as px
+
+    coluna_grupo = pesos.index.name
+    df_peso = pesos[tipo_peso].rename('Peso Financeiro').reset_index()
+    df_peso = df_peso.sort_values(by='Peso Financeiro', ascending=False)
+    colors = df_peso[coluna_grupo].isin(selecionados).map({True: 'darkblue', False: 'lightblue'})
+
+    fig_peso = px.bar(
+        df_peso,
+        x=coluna_grupo,
+        y='Peso Financeiro',
+        title=f'Peso Financeiro por {coluna_grupo} ({tipo_peso})',
+        labels={'Peso Financeiro': 'Índice', coluna_grupo: coluna_grupo},
+        text=formatar_percentual_serie(df_peso['Peso Financeiro']),
+    )
+
+    fig_peso.update_traces(
+        marker_color=colors,
+        textposition='outside',
+        marker_line_color='black',
+        marker_line_width=0.5
+    )
+
+    fig_peso.update_layout(
+        yaxis_tickformat='.0%',
+        showlegend=False,
+        xaxis={'categoryorder': 'array', 'categoryarray': df_peso[coluna_grupo]}
+    )
+
+    return fig_peso
+
+@medicao.medido
+def criar_grafico_pizza(contagem, coluna, titulo, cores, **estilo_texto):
+    """Cria o gráfico de pizza (rosca) de uma contagem com colunas [coluna, 'count']"""
+    import plotly.express as px
+
+    fig_pizza = px.pie(
+        contagem,
+        names=coluna,
+        values='count',
+        title=titulo,
+        hole=0.3,
+        color=coluna,
+        color_discrete_map=cores
+    )
+    fig_pizza.update_traces(textposition='inside', textinfo='percent+label', **estilo_texto)
+    return fig_pizza
+
+@medicao.medido
+def criar_grafico_funcao(contagem, nome_col_funcao, meses=1):
+    """Cria o gráfico de barras da quantidade de funcionários por função"""
+    import plotly.express as px
+
+    graf_funcao = media_mensal(contagem, meses).reset_index()
+    graf_funcao.columns = [nome_col_funcao, 'Qtd']
+    return px.bar(
+        graf_funcao,
+        x=nome_col_funcao,
+        y='Qtd',
+        color='Qtd',
+        color_continuous_scale='Blues',
+        title=rotulo_contagem('Quantidade por Função', meses),
+        labels={'Qtd': 'Quantidade', nome_col_funcao: 'Função'}
+    )
+
+COLUNAS_CUBO = [
+    'Remuneração Líquida Folha', 'Adiantamento', 'PRODUÇÃO', 'REFLEXO S PRODUÇÃO',
+    'Hora Extra 70% - Semana', 'Hora Extra 70% - Sabado', 'Hora Extra 100%',
+    'Repouso Remunerado', 'Total Extra'
+]
+
+def montar_cubo(df):
+    """Pré-agrega quantidade e totais por (Obra, Tipo, Função, Gênero).
+
+    As células ficam na ordem em que aparecem na planilha (sort=False), então
+    as contagens tiradas do cubo mantêm o desempate do value_counts original.
+    """
+    chaves = pd.DataFrame({
+        'Obra': df['Obra'].astype(str),
+        'Tipo': df['Tipo'],
+        'Função': df['Função'] if 'Função' in df.columns else None,
+        'Gênero': df['Gênero'] if 'Gênero' in df.columns else None
+    }, index=df.index)
+    valores = df.reindex(columns=COLUNAS_CUBO).apply(pd.to_numeric, errors='coerce').fillna(0).astype('float64')
+    valores['Total Extra'] = valores['Hora Extra 70% - Semana'] + valores['Hora Extra 70% - Sabado'] + valores['Hora Extra 100%']
+    valores['Quantidade'] = 1
+
+    return valores.groupby([chaves[c] for c in chaves.columns], observed=True, sort=False, dropna=False).sum()
+
+
+def fatiar_cubo(cubo, obras=None, tipos=None):
+    """Seleciona as células do cubo pelas obras e tipos escolhidos"""
+    mascara = np.ones(len(cubo), dtype=bool)
+    if obras is not None:
+        mascara &= cubo.index.get_level_values('Obra').isin(obras)
+    if tipos is not None:
+        mascara &= cubo.index.get_level_values('Tipo').isin(tipos)
+    return cubo[mascara]
+
+
+def contar_valores(serie):
+    """Como o value_counts, mas sem as categorias ausentes do recorte e com empates na ordem em que aparecem"""
+    contagem = serie.groupby(serie, observed=True, sort=False).size().rename('count')
+    return contagem.sort_values(ascending=False, kind='stable')
+
+
+def contar_por(cubo, nivel):
+    """Quantidade por nível do cubo, em ordem decrescente como o value_counts"""
+    contagem = cubo.groupby(level=nivel, sort=False)['Quantidade'].sum()
+    return contagem[contagem > 0].sort_values(ascending=False, kind='stable')
+
+
+def media_mensal(contagem, meses):
+    """Contagem somada em várias competências como média por mês (uma casa decimal).
+
+    Cada linha do efetivo é um funcionário num mês: somar os meses contaria a
+    mesma pessoa uma vez por mês em que aparece.
+    """
+    return contagem if meses <= 1 else round(contagem / meses, 1)
+
+
+def rotulo_contagem(rotulo, meses):
+    """Título de cartão ou gráfico de contagem; com mais de um mês avisa que é a média mensal"""
+    return rotulo if meses <= 1 else f"{rotulo} (média mensal)"
+
+
+def texto_contagem(valor):
+    """Valor de cartão: inteiro como está e média com uma casa, em vírgula decimal"""
+    if float(valor).is_integer():
+        return int(valor)
+    return f"{valor:.1f}".replace('.', ',')
+
+@medicao.medido
+def selecionar_top(df, coluna, qtd_linhas):
+    """Linhas com os maiores valores de coluna, em ordem decrescente.
+
+    Para 5/10/20 usa nlargest (seleção parcial), sem ordenar o frame inteiro.
+    """
+    if qtd_linhas == 'Todos':
+        return df.sort_values(by=coluna, ascending=False, kind='stable')
+    return df.nlargest(int(qtd_linhas), coluna)
+
+
+def config_colunas_moeda(colunas):
+    """Formata colunas em R$ na exibição, mantendo os números numéricos (e ordenáveis) na tabela"""
+    return {
+        col: st.column_config.NumberColumn(f"{col} (R$)", format="localized", step=0.01)
+        for col in colunas
+    }
+
+def abrir_secoes(nomes, key, chaves_widgets):
+    """Abas preguiçosas: só a aba aberta é calculada e desenhada.
+
+    Com on_change="rerun" a troca de aba roda o script de novo e o .open de cada
+    aba diz qual está aberta. Os widgets das abas fechadas não são desenhados e
+    o Streamlit descartaria o valor deles, por isso ele é regravado aqui.
+    """
+    for chave in chaves_widgets:
+        if chave in st.session_state:
+            st.session_state[chave] = st.session_state[chave]
+    return dict(zip(nomes, st.tabs(nomes, key=key, on_change="rerun")))
+
+
+# Teto do cache de resultados: JSON das figuras + memória dos frames guardados
+LIMITE_CACHE_RESULTADOS = 256 * 1024 * 1024
+
+# Tabelas maiores que isso são paginadas no servidor
+LINHAS_POR_PAGINA = 50
+
+
+@st.cache_resource
+def _contador_envios():
+    return {'envios': {}, 'trava': threading.Lock()}
+
+
+def registrar_envio(id_elemento, tamanho):
+    """Soma os bytes de um gráfico/tabela enviado ao navegador (todas as sessões)"""
+    contador = _contador_envios()
+    with contador['trava']:
+        vezes, total = contador['envios'].get(id_elemento, (0, 0))
+        contador['envios'][id_elemento] = (vezes + 1, total + tamanho)
+
+
+def resumo_envios():
+    contador = _contador_envios()
+    with contador['trava']:
+        envios = dict(contador['envios'])
+    resumo = pd.DataFrame(
+        [(id_elemento, vezes, total) for id_elemento, (vezes, total) in envios.items()],
+        columns=['Elemento', 'Envios', 'Bytes']
+    )
+    resumo['Média (KB)'] = (resumo['Bytes'] / resumo['Envios'] / 1024).round(1)
+    return resumo.sort_values('Bytes', ascending=False, ignore_index=True)
+
+
+def compactar_figura(figura):
+    """Reduz o JSON da figura sem mudar o desenho.
+
+    Do template só ficam o layout e os padrões dos tipos de trace usados (o
+    resto do tema do Streamlit nunca é aplicado), e listas numéricas viram
+    arrays do numpy, que o Plotly serializa em binário (base64) e não em texto.
+    """
+    tipos = {trace.type for trace in figura.data}
+    template = figura.layout.template
+    if template is not None:
+        figura.layout.template = go.layout.Template(
+            layout=template.layout,
+            data={tipo: template.data[tipo] for tipo in tipos if template.data[tipo]}
+        )
+    for trace in figura.data:
+        for atributo in ('x', 'y', 'values'):
+            valores = getattr(trace, atributo, None)
+            if isinstance(valores, tuple) and valores and all(
+                isinstance(v, (int, float)) and not isinstance(v, bool) for v in valores
+            ):
+                setattr(trace, atributo, np.asarray(valores))
+    return figura
+
+
+class Filtros(NamedTuple):
+    """Estado canônico dos filtros de um painel, usado como chave dos resultados em cache.
+
+    Conjuntos (obras, departamentos, meses) ficam como tuplas ordenadas, então
+    a mesma seleção feita em qualquer ordem, por qualquer sessão, dá a mesma
+    chave. Campos que não se aplicam ficam None. Criar com filtros_painel.
+    """
+    painel: str
+    versao: object = None
+    obras: tuple = None
+    departamentos: tuple = None
+    tipo: str = None
+    funcao: str = None
+    funcionario: str = None
+    analise: str = None
+    qtd: str = None
+    peso: str = None
+    tipo_obra: str = None
+    servico: str = None
+    meses: tuple = None
+
+    def restrito(self, *campos):
+        """Só painel, versão e os campos dados: para resultados que não dependem dos outros filtros"""
+        return Filtros(self.painel, self.versao, **{campo: getattr(self, campo) for campo in campos})
+
+
+def filtros_painel(painel, versao, **valores):
+    """Filtros canônicos: listas e conjuntos viram tuplas ordenadas e sem repetição"""
+    return Filtros(painel, versao, **{
+        campo: tuple(sorted(set(valor))) if isinstance(valor, (list, tuple, set, frozenset)) else valor
+        for campo, valor in valores.items()
+    })
+
+
+@st.cache_resource
+def _cache_resultados():
+    return {'itens': OrderedDict(), 'bytes': 0, 'em_andamento': {}, 'trava': threading.Lock()}
+
+
+def _tamanho_categorias(serie):
+    return int(serie.cat.categories.memory_usage(deep=True)) if isinstance(serie.dtype, pd.CategoricalDtype) else 0
+
+
+def _tamanho_resultado(valor):
+    """Memória aproximada que um resultado guardado ocupa sozinho (frames, séries e tuplas deles).
+
+    Sem deep=True: as cópias filtradas apontam para os mesmos textos do
+    conjunto, então só os arrays das colunas (e as categorias) contam.
+    """
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(deep=False).sum()) + sum(_tamanho_categorias(s) for _, s in valor.items())
+    if isinstance(valor, pd.Series):
+        return int(valor.memory_usage(deep=False)) + _tamanho_categorias(valor)
+    if isinstance(valor, (tuple, list)):
+        return sum(_tamanho_resultado(v) for v in valor)
+    if isinstance(valor, (dict, MappingProxyType)):
+        return sum(_tamanho_resultado(v) for v in valor.values())
+    return 64
+
+
+def _em_cache(id_resultado, filtros, construir, medir):
+    """Busca ou calcula (valor, tamanho); chamadas simultâneas da mesma chave calculam uma vez só.
+
+    Quem chega enquanto outra sessão calcula a mesma chave espera por ela em vez
+    de repetir a conta. Acima de LIMITE_CACHE_RESULTADOS os itens menos usados saem.
+    """
+    cache = _cache_resultados()
+    chave = (id_resultado, filtros)
+    while True:
+        with cache['trava']:
+            encontrado = cache['itens'].get(chave)
+            if encontrado is not None:
+                cache['itens'].move_to_end(chave)
+                return encontrado
+            calculando = cache['em_andamento'].get(chave)
+            if calculando is None:
+                calculando = cache['em_andamento'][chave] = threading.Event()
+                break
+        # outra sessão está calculando: espera e procura de novo (se ela falhar, calcula aqui)
+        calculando.wait()
+
+    try:
+        valor = construir()
+        tamanho = medir(valor)
+        with cache['trava']:
+            cache['itens'][chave] = (valor, tamanho)
+            cache['bytes'] += tamanho
+            while cache['bytes'] > LIMITE_CACHE_RESULTADOS and len(cache['itens']) > 1:
+                _, (_, tamanho_antigo) = cache['itens'].popitem(last=False)
+                cache['bytes'] -= tamanho_antigo
+        return valor, tamanho
+    finally:
+        with cache['trava']:
+            del cache['em_andamento'][chave]
+        calculando.set()
+
+
+def resultado_em_cache(id_resultado, filtros, construir, medir=_tamanho_resultado):
+    """Resultado derivado (frame filtrado, ranking, contagens) compartilhado entre sessões.
+
+    O valor é o mesmo objeto para todas as sessões: quem recebe só lê. medir
+    dá o tamanho cobrado do limite; quem guarda referências a frames de outro
+    cache passa um medir que conta só o que o resultado criou.
+    """
+    return _em_cache(id_resultado, filtros, construir, medir)[0]
+
+
+@medicao.medido(nome="serializar_figura")
+def _preparar_figura(figura):
+    """Compacta a figura e devolve o tamanho do JSON que vai ao navegador"""
+    # o construtor pode devolver a figura junto com outros valores (cascata) ou None
+    if isinstance(figura, tuple):
+        figura = figura[0]
+    if figura is None:
+        return 0
+    return len(compactar_figura(figura).to_json())
+
+
+def figura_em_cache(id_grafico, filtros, construir, contar_envio=True):
+    """Figura Plotly memorizada por (gráfico, filtros), compartilhada entre sessões.
+
+    Voltar a um filtro já visto, nesta ou em outra sessão, não recalcula nada.
+    Guarda o objeto Figure pronto: o st.plotly_chart aceita a Figure sem
+    revalidar, o que não acontece com dict/JSON. As figuras são compartilhadas:
+    não alterar. contar_envio=False é para quem só prepara a figura sem
+    enviá-la (aquecimento).
+    """
+    figura, tamanho = _em_cache(id_grafico, filtros, construir, _preparar_figura)
+    if contar_envio:
+        registrar_envio(id_grafico, tamanho)
+    return figura
+
+
+def exibir_tabela(df, id_tabela, **kwargs):
+    """st.dataframe paginado no servidor: só a página aberta vai ao navegador.
+
+    id_tabela também é a base da chave do seletor de página ("<id>_pagina").
+    """
+    chave_pagina = f"{id_tabela}_pagina"
+    pagina = df
+    if len(df) > LINHAS_POR_PAGINA:
+        total_paginas = -(-len(df) // LINHAS_POR_PAGINA)
+        # filtros novos podem encolher a tabela para menos páginas que a aberta
+        if st.session_state.get(chave_pagina, 1) > total_paginas:
+            st.session_state[chave_pagina] = total_paginas
+        col_pagina, col_info = st.columns([1, 4])
+        numero = col_pagina.number_input("Página:", min_value=1, max_value=total_paginas, step=1, key=chave_pagina)
+        inicio = (numero - 1) * LINHAS_POR_PAGINA
+        pagina = df.iloc[inicio:inicio + LINHAS_POR_PAGINA]
+        col_info.caption(f"Linhas {inicio + 1}–{inicio + len(pagina)} de {len(df)}")
+    with medicao.etapa(f"exibir_tabela:{id_tabela}", linhas=len(pagina)):
+        registrar_envio(id_tabela, pa.Table.from_pandas(pagina).nbytes)
+        st.dataframe(pagina, use_container_width=True, **kwargs)
+
+
+def exibir_grafico(figura, id_grafico):
+    """st.plotly_chart medido: é aqui que a figura é serializada para o navegador a cada execução"""
+    with medicao.etapa(f"exibir_grafico:{id_grafico}"):
+        st.plotly_chart(figura, use_container_width=True)
+
+
+@st.fragment
+@medicao.medido
+def secao_peso(df, coluna_grupo, selecionados, key, filtros):
+    """Peso Financeiro por grupo; trocar o tipo de peso só roda esta seção"""
+    tipo_peso = st.radio("Tipo de Peso:", ['Peso sobre Produção', 'Peso sobre Hora Extra'], horizontal=True, key=key)
+    fig_peso = figura_em_cache(
+        key, filtros._replace(peso=tipo_peso),
+        lambda: criar_grafico_peso(calcular_peso_financeiro(df, coluna_grupo), tipo_peso, selecionados)
+    )
+    exibir_grafico(fig_peso, key)
+
+# ======================================
+# DASHBOARD DE EFETIVO
+# ======================================
+
+CHAVES_WIDGETS_EFETIVO = [
+    "efetivo_financeira", "efetivo_funcao", "efetivo_analise", "efetivo_qtd", "efetivo_peso",
+    "efetivo_ranking_pagina", "efetivo_terceiros_pagina"
+]
+
+
+def grafico_pizza_tipo_efetivo(por_tipo, total_terceiros, meses=1):
+    pizza_diretos_indiretos = por_tipo.reset_index()
+    pizza_diretos_indiretos.columns = ['Tipo', 'count']
+    pizza_terceiros = pd.DataFrame({'Tipo': ['TERCEIRO'], 'count': [total_terceiros]})
+    pizza = pd.concat([pizza_diretos_indiretos, pizza_terceiros], ignore_index=True)
+    pizza['count'] = media_mensal(pizza['count'], meses)
+    return criar_grafico_pizza(
+        pizza, 'Tipo', rotulo_contagem('Distribuição por Tipo de Efetivo', meses),
+        {'DIRETO': 'Blue', 'INDIRETO': 'Green', 'TERCEIRO': 'Orange'}
+    )
+
+
+def grafico_pizza_genero_efetivo(cubo_obras, meses=1):
+    """Pizza por gênero a partir do cubo; None quando não há FEMININO/MASCULINO"""
+    pizza_genero = contar_por(cubo_obras, 'Gênero')
+    pizza_genero = pizza_genero[pizza_genero.index.isin(['FEMININO', 'MASCULINO'])]
+    if pizza_genero.empty:
+        return None
+    pizza_genero = media_mensal(pizza_genero, meses).reset_index()
+    pizza_genero.columns = ['Gênero', 'count']
+    return criar_grafico_pizza(
+        pizza_genero, 'Gênero', rotulo_contagem('Distribuição por Gênero', meses),
+        {'MASCULINO': 'Blue', 'FEMININO': 'Red'}, textfont_size=14
+    )
+
+
+def secao_distribuicao_efetivo(cubo_obras, por_tipo, total_terceiros, tem_genero, filtros, meses):
+    col1, col2 = st.columns(2)
+
+    with col1:
+        fig_pizza = figura_em_cache(
+            "efetivo_pizza_tipo", filtros, lambda: grafico_pizza_tipo_efetivo(por_tipo, total_terceiros, meses)
+        )
+        exibir_grafico(fig_pizza, "efetivo_pizza_tipo")
+
+    with col2:
+        if tem_genero:
+            fig_pizza_genero = figura_em_cache(
+                "efetivo_pizza_genero", filtros, lambda: grafico_pizza_genero_efetivo(cubo_obras, meses)
+            )
+            if fig_pizza_genero is not None:
+                exibir_grafico(fig_pizza_genero, "efetivo_pizza_genero")
+            else:
+                st.warning("Dados de gênero não encontrados (valores devem ser 'Feminino' ou 'Masculino')")
+        else:
+            st.warning("Coluna de gênero não encontrada (procura por 'GENÊRO' ou 'GÊNERO')")
+
+
+@st.fragment
+@medicao.medido
+def secao_financeira_efetivo(matriz, df_filtrado, nome_col_funcao, filtros):
+    """Cascata/detalhamento; os filtros desta seção só rodam a própria seção"""
+    col_filtro1, col_filtro2 = st.columns(2)
+    analise_financeira = col_filtro1.radio("Análise Financeira:", ['Geral', 'Ganhos', 'Descontos'], horizontal=True, key="efetivo_financeira")
+
+    # Análise Financeira (usa df_filtrado_financeiro - com filtro de função se aplicável)
+    df_filtrado_financeiro = df_filtrado
+    funcao_selecionada = "Todas"
+    if nome_col_funcao:
+        funcoes_disponiveis = resultado_em_cache(
+            "efetivo_funcoes", filtros, lambda: sorted(df_filtrado[nome_col_funcao].astype(str).unique())
+        )
+        funcao_selecionada = col_filtro2.selectbox("Filtrar por Função:", ["Todas"] + funcoes_disponiveis, key="efetivo_funcao")
+        filtros = filtros._replace(funcao=funcao_selecionada)
+        if funcao_selecionada != "Todas":
+            df_filtrado_financeiro = resultado_em_cache(
+                "efetivo_financeiro", filtros, lambda: df_filtrado[df_filtrado[nome_col_funcao] == funcao_selecionada]
+            )
+
+    if df_filtrado_financeiro.empty:
+        st.warning("Nenhum funcionário para os filtros selecionados.")
+        return
+
+    # Os totais só são somados quando a figura ainda não está no cache
+    def totais():
+        return totalizar_colunas(matriz, df_filtrado_financeiro)
+
+    if analise_financeira == 'Geral':
+        fig_cascata, total_ganhos, total_descontos, remuneracao_liquida = figura_em_cache(
+            "efetivo_cascata", filtros,
+            lambda: criar_grafico_cascata(totais(), matriz['ganhos'], matriz['descontos'])
+        )
+        exibir_grafico(fig_cascata, "efetivo_cascata")
+
+        # Calcula médias por funcionário
+        num_funcionarios = len(df_filtrado_financeiro)
+        media_ganhos = total_ganhos / num_funcionarios if num_funcionarios > 0 else 0
+        media_descontos = total_descontos / num_funcionarios if num_funcionarios > 0 else 0
+        media_liquida = remuneracao_liquida / num_funcionarios if num_funcionarios > 0 else 0
+
+        col_fin1, col_fin2, col_fin3 = st.columns(3)
+        col_fin1.metric("💚 Total Ganhos", 
+                      formatar_moeda(total_ganhos),
+                      f"Média: {formatar_moeda(media_ganhos)}")
+        col_fin2.metric("💸 Total Descontos", 
+                      formatar_moeda(total_descontos),
+                      f"Média: {formatar_moeda(media_descontos)}")
+        col_fin3.metric("💰 Remuneração Líquida", 
+                      formatar_moeda(remuneracao_liquida),
+                      f"Média: {formatar_moeda(media_liquida)}")
+
+    elif analise_financeira == 'Ganhos':
+        fig_ganhos = figura_em_cache(
+            "efetivo_ganhos", filtros,
+            lambda: criar_grafico_detalhado(totais(), matriz['ganhos'], "Detalhamento dos Ganhos", "green")
+        )
+        if fig_ganhos:
+            exibir_grafico(fig_ganhos, "efetivo_ganhos")
+        else:
+            st.warning("Nenhum dado de ganhos encontrado para os filtros selecionados.")
+
+    elif analise_financeira == 'Descontos':
+        fig_descontos = figura_em_cache(
+            "efetivo_descontos", filtros,
+            lambda: criar_grafico_detalhado(totais(), matriz['descontos'], "Detalhamento dos Descontos", "red")
+        )
+        if fig_descontos:
+            exibir_grafico(fig_descontos, "efetivo_descontos")
+        else:
+            st.warning("Nenhum dado de descontos encontrado para os filtros selecionados.")
+
+
+@medicao.medido
+def montar_ranking_efetivo(obras_conjunto, df_filtrado, obras_selecionadas, tipo_selecionado, tipo_analise):
+    """Linhas com valor na análise escolhida e os totais do cabeçalho do ranking"""
+    coluna_valor = {
+    'Produção': 'PRODUÇÃO',
+    'Hora Extra Semana': 'Hora Extra 70% - Semana',
+    'Hora Extra Sábado': 'Hora Extra 70% - Sabado',
+    'Hora Extra 100%': 'Hora Extra 100%'
+    }[tipo_analise]
+
+
+    if tipo_selecionado == 'Todos':
+        df_ranking = df_filtrado[df_filtrado['Tipo'].isin(['DIRETO', 'INDIRETO'])]
+    else:
+        df_ranking = df_filtrado
+
+    nome_col_funcao = 'Função' if 'Função' in df_ranking.columns else None
+
+    if tipo_analise == 'Produção' and 'REFLEXO S PRODUÇÃO' in df_ranking.columns:
+        cols_rank = ['Nome do Funcionário', nome_col_funcao, 'Obra', 'Tipo', 'PRODUÇÃO', 'REFLEXO S PRODUÇÃO']
+        valor_coluna = 'PRODUÇÃO'
+    else:
+        cols_rank = ['Nome do Funcionário', nome_col_funcao, 'Obra', 'Tipo', coluna_valor]
+        valor_coluna = coluna_valor
+
+    cols_rank = [c for c in cols_rank if c is not None and c in df_ranking.columns]
+    df_ranking_limp = df_ranking.loc[df_ranking[valor_coluna] > 0, cols_rank].rename(columns={'REFLEXO S PRODUÇÃO': 'DSR'})
+
+    valor_total = df_ranking_limp[valor_coluna].sum()
+
+# Conta apenas efetivo direto com remuneração > 0
+    df_diretos = selecionar_linhas(obras_conjunto['efetivo'], obras_conjunto['indice_efetivo'], obras_selecionadas, ['DIRETO'])
+    df_diretos_validos = df_diretos[pd.to_numeric(df_diretos['Remuneração Líquida Folha'], errors='coerce') > 0]
+    total_funcionarios = df_diretos_validos['Nome do Funcionário'].nunique()
+    total_com_valor = df_ranking_limp['Nome do Funcionário'].nunique()
+    return MappingProxyType({
+        'linhas': df_ranking_limp,
+        'valor_coluna': valor_coluna,
+        'valor_total': valor_total,
+        'total_funcionarios': total_funcionarios,
+        'total_com_valor': total_com_valor,
+        'nome_col_funcao': nome_col_funcao
+    })
+
+
+@st.fragment
+@medicao.medido
+def secao_ranking_efetivo(obras_conjunto, df_filtrado, cubo_obras, obras_selecionadas, tipo_selecionado, filtros, meses):
+    """Top funcionários e quantidade por função; os filtros da tabela só rodam esta seção"""
+    col_filtro1, col_filtro2 = st.columns(2)
+    tipo_analise = col_filtro1.radio("Tipo de Análise da Tabela:", ['Produção', 'Hora Extra Semana', 'Hora Extra Sábado', 'Hora Extra 100%'], horizontal=True, key="efetivo_analise")
+    qtd_linhas = col_filtro2.radio("Qtd. de Funcionários na Tabela:", ['5', '10', '20', 'Todos'], horizontal=True, key="efetivo_qtd")
+
+    filtros_ranking = filtros._replace(analise=tipo_analise)
+    dados = resultado_em_cache(
+        "efetivo_ranking", filtros_ranking,
+        lambda: montar_ranking_efetivo(obras_conjunto, df_filtrado, obras_selecionadas, tipo_selecionado, tipo_analise)
+    )
+    valor_coluna = dados['valor_coluna']
+    valor_total = dados['valor_total']
+    total_funcionarios = dados['total_funcionarios']
+    total_com_valor = dados['total_com_valor']
+    nome_col_funcao = dados['nome_col_funcao']
+    porcentagem = (total_com_valor / total_funcionarios) if total_funcionarios > 0 else 0
+
+# Exibição
+    st.markdown(f"### 📋 Top Funcionários por **{tipo_analise}**")
+    st.markdown(
+    f"**Total em {tipo_analise}:** {formatar_moeda(valor_total)}  \n"
+    f"**Funcionários com {tipo_analise} (Efetivo Direto com Remuneração):** "
+    f"{total_com_valor} de {total_funcionarios} (**{porcentagem:.0%}**)"
+)
+
+    ranking = resultado_em_cache(
+        "efetivo_ranking_top", filtros_ranking._replace(qtd=qtd_linhas),
+        lambda: selecionar_top(dados['linhas'], valor_coluna, qtd_linhas)
+    )
+    exibir_tabela(ranking, "efetivo_ranking", column_config=config_colunas_moeda([valor_coluna, 'DSR']))
+    st.divider()
+
+    if nome_col_funcao:
+        tipos_ranking = ['DIRETO', 'INDIRETO'] if tipo_selecionado == 'Todos' else [tipo_selecionado]
+        fig_bar = figura_em_cache(
+            "efetivo_funcao", filtros,
+            lambda: criar_grafico_funcao(
+                contar_por(fatiar_cubo(cubo_obras, tipos=tipos_ranking), 'Função'), nome_col_funcao, meses
+            )
+        )
+        exibir_grafico(fig_bar, "efetivo_funcao")
+
+
+@medicao.medido
+def criar_grafico_evolucao(competencias, obras_selecionadas):
+    import plotly.express as px
+
+    resumo = resumir_historico_por_obra(competencias)
+    resumo = resumo[resumo['Obra'].isin(obras_selecionadas)]
+    resumo['Mês'] = resumo['Competência'].map(formatar_competencia)
+    return px.line(
+        resumo.sort_values('Competência'),
+        x='Mês',
+        y='Efetivo',
+        color='Obra',
+        markers=True,
+        title='📅 Evolução do Efetivo (Direto + Indireto) por Obra'
+    )
+
+
+def secao_evolucao_efetivo(competencias, obras_selecionadas, filtros):
+    fig_evolucao = figura_em_cache("efetivo_evolucao", filtros, lambda: criar_grafico_evolucao(competencias, obras_selecionadas))
+    exibir_grafico(fig_evolucao, "efetivo_evolucao")
+
+
+def carregar_efetivo_obras(competencias):
+    """Conjunto das obras (sem o "ESCRITÓRIO ENGENHARIA"): frames e índices, cubo e lista de obras.
+
+    Os frames são os do conjunto inteiro: as seções selecionam pelo índice só
+    as linhas das obras escolhidas, e o escritório nunca está entre elas.
+    """
+    conjunto = carregar_conjunto_efetivo(competencias)
+
+    def montar():
+        # 🔴 Excluir obra "ESCRITÓRIO ENGENHARIA"
+        cubo = conjunto['cubo']
+        return MappingProxyType({
+            'efetivo': conjunto['efetivo'],
+            'terceiros': conjunto['terceiros'],
+            'indice_efetivo': conjunto['indice_efetivo'],
+            'indice_terceiros': conjunto['indice_terceiros'],
+            'cubo': cubo[cubo.index.get_level_values('Obra') != 'ESCRITÓRIO ENGENHARIA'],
+            'obras': sorted(str(obra) for obra in conjunto['indice_efetivo']['obra'] if obra != 'ESCRITÓRIO ENGENHARIA')
+        })
+    # frames e índices já estão no cache do _carregar_conjunto_efetivo: só o cubo sem o escritório é novo
+    return resultado_em_cache(
+        "efetivo_conjunto", filtros_painel("efetivo", versao_historico(competencias)), montar,
+        medir=lambda obras_conjunto: _tamanho_resultado(obras_conjunto['cubo'])
+    )
+
+
+@medicao.medido
+def aquecer_efetivo():
+    """Deixa pronta a abertura padrão do 📊: mês mais recente, todas as obras, aba Distribuição.
+
+    Carrega o conjunto do mês e monta as mesmas figuras (mesmas chaves de cache)
+    que o dashboard_efetivo montaria sem nenhum filtro alterado.
+    """
+    competencias = tuple(listar_competencias()[-1:])
+    if not competencias:
+        return
+    obras_conjunto = carregar_efetivo_obras(competencias)
+    df = obras_conjunto['efetivo']
+    obras = obras_conjunto['obras']
+    filtros = filtros_painel("efetivo", versao_historico(competencias), obras=obras, tipo='Todos')
+
+    cubo_obras, por_tipo, _, total_terceiros = resultado_em_cache(
+        "efetivo_contagens", filtros.restrito('obras'), lambda: contar_efetivo(obras_conjunto, obras)
+    )
+    figura_em_cache(
+        "efetivo_pizza_tipo", filtros.restrito('obras'),
+        lambda: grafico_pizza_tipo_efetivo(por_tipo, total_terceiros),
+        contar_envio=False
+    )
+    if 'Gênero' in df.columns:
+        figura_em_cache(
+            "efetivo_pizza_genero", filtros.restrito('obras'), lambda: grafico_pizza_genero_efetivo(cubo_obras),
+            contar_envio=False
+        )
+
+
+@medicao.medido
+def filtrar_efetivo(obras_conjunto, obras, tipo):
+    """Funcionários das obras e do tipo escolhidos; TERCEIRO não tem linhas no efetivo"""
+    df = obras_conjunto['efetivo']
+    if tipo == 'TERCEIRO':
+        return df.iloc[0:0]
+    tipos = [tipo] if tipo in ['DIRETO', 'INDIRETO'] else None
+    return selecionar_linhas(df, obras_conjunto['indice_efetivo'], obras, tipos)
+
+
+@medicao.medido
+def contar_efetivo(obras_conjunto, obras):
+    """Cubo das obras, contagem por tipo, terceiros das obras e o total de terceiros"""
+    cubo_obras = fatiar_cubo(obras_conjunto['cubo'], obras=obras)
+    df_terceiros_filtrado = selecionar_linhas(obras_conjunto['terceiros'], obras_conjunto['indice_terceiros'], obras)
+    return cubo_obras, contar_por(cubo_obras, 'Tipo'), df_terceiros_filtrado, df_terceiros_filtrado['QUANTIDADE'].sum()
+
+
+def dashboard_efetivo():
+    st.title("📊 Análise de Efetivo - Obras")
+
+    with st.sidebar:
+        st.header("🔍 Filtros - Efetivo")
+        competencias = selecionar_competencias(key="efetivo_competencias")
+
+    obras_conjunto = carregar_efetivo_obras(competencias)
+    df, cubo = obras_conjunto['efetivo'], obras_conjunto['cubo']
+    matriz = carregar_matriz_financeira(competencias)
+
+    # Só os filtros que valem para todas as seções ficam na barra lateral;
+    # os de cada seção ficam dentro dela
+    versao = versao_historico(competencias)
+    with st.sidebar:
+        lista_obras = obras_conjunto['obras']
+        obras_selecionadas = st.multiselect("Obras:", lista_obras, default=lista_obras)
+        tipo_selecionado = st.radio("Tipo:", ['Todos', 'DIRETO', 'INDIRETO', 'TERCEIRO'], horizontal=True)
+
+    nome_col_funcao = 'Função' if 'Função' in df.columns else None
+
+    # Chave dos caches: versão dos dados + filtros normalizados; a mesma
+    # seleção em qualquer sessão reaproveita o que já foi calculado
+    filtros = filtros_painel("efetivo", versao, obras=obras_selecionadas, tipo=tipo_selecionado)
+    df_filtrado = resultado_em_cache(
+        "efetivo_filtrado", filtros, lambda: filtrar_efetivo(obras_conjunto, obras_selecionadas, tipo_selecionado)
+    )
+    cubo_obras, por_tipo, df_terceiros_filtrado, total_terceiros = resultado_em_cache(
+        "efetivo_contagens", filtros.restrito('obras'), lambda: contar_efetivo(obras_conjunto, obras_selecionadas)
+    )
+    # Com mais de um mês os cartões e gráficos de contagem mostram a média mensal
+    meses = len(competencias)
+    direto_count = int(por_tipo.get('DIRETO', 0))
+    indireto_count = int(por_tipo.get('INDIRETO', 0))
+    total_geral = direto_count + indireto_count + total_terceiros
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric(rotulo_contagem("👷 Direto", meses), texto_contagem(media_mensal(direto_count, meses)))
+    col2.metric(rotulo_contagem("👷‍♂️ Indireto", meses), texto_contagem(media_mensal(indireto_count, meses)))
+    col3.metric(rotulo_contagem("🏗️ Terceiro", meses), texto_contagem(media_mensal(total_terceiros, meses)))
+    col4.metric(rotulo_contagem("👥 Total", meses), texto_contagem(media_mensal(total_geral, meses)))
+
+    if tipo_selecionado == 'TERCEIRO':
+        secoes = ["📊 Distribuição", "🏗️ Terceirizados"]
+    else:
+        secoes = ["📊 Distribuição", "💰 Análise Financeira", "📋 Ranking", "⚖️ Peso Financeiro"]
+    if len(competencias) > 1:
+        secoes.append("📅 Evolução")
+    abas = abrir_secoes(secoes, key="efetivo_secao", chaves_widgets=CHAVES_WIDGETS_EFETIVO)
+
+    with abas["📊 Distribuição"]:
+        if abas["📊 Distribuição"].open:
+            tem_genero = 'Gênero' in df.columns
+            secao_distribuicao_efetivo(cubo_obras, por_tipo, total_terceiros, tem_genero, filtros.restrito('obras'), meses)
+
+    if "🏗️ Terceirizados" in abas:
+        with abas["🏗️ Terceirizados"]:
+            if abas["🏗️ Terceirizados"].open:
+                st.markdown("### 🏗️ Funcionários Terceirizados por Empresa e Obra")
+                tabela_terceiros = resultado_em_cache(
+                    "efetivo_terceiros", filtros.restrito('obras'),
+                    lambda: df_terceiros_filtrado.groupby(['Obra', 'EMPRESA'])['QUANTIDADE'].sum().reset_index()
+                )
+                exibir_tabela(tabela_terceiros, "efetivo_terceiros")
+
+    if "💰 Análise Financeira" in abas:
+        with abas["💰 Análise Financeira"]:
+            if abas["💰 Análise Financeira"].open:
+                secao_financeira_efetivo(matriz, df_filtrado, nome_col_funcao, filtros)
+
+        with abas["📋 Ranking"]:
+            if abas["📋 Ranking"].open:
+                secao_ranking_efetivo(
+                    obras_conjunto, df_filtrado, cubo_obras, obras_selecionadas, tipo_selecionado, filtros, meses
+                )
+
+        with abas["⚖️ Peso Financeiro"]:
+            if abas["⚖️ Peso Financeiro"].open:
+                secao_peso(cubo.reset_index(), 'Obra', obras_selecionadas, key="efetivo_peso", filtros=filtros.restrito('obras'))
+
+    # Evolução mensal (só quando há mais de uma competência no intervalo)
+    if "📅 Evolução" in abas:
+        with abas["📅 Evolução"]:
+            if abas["📅 Evolução"].open:
+                secao_evolucao_efetivo(competencias, obras_selecionadas, filtros.restrito('obras'))
+
+
+# Dicionário para mapear meses em inglês para abreviações em português
+MES_POR_PT = {
+    'Jan': 'Jan',
+    'Feb': 'Fev',
+    'Mar': 'Mar',
+    'Apr': 'Abr',
+    'May': 'Mai',
+    'Jun': 'Jun',
+    'Jul': 'Jul',
+    'Aug': 'Ago',
+    'Sep': 'Set',
+    'Oct': 'Out',
+    'Nov': 'Nov',
+    'Dec': 'Dez'
+}
+
+# Mapeamento mês português para número do mês
+MES_PT_PARA_NUM = {
+    'Jan': 1, 'Fev': 2, 'Mar': 3, 'Abr': 4, 'Mai': 5, 'Jun': 6,
+    'Jul': 7, 'Ago': 8, 'Set': 9, 'Out': 10, 'Nov': 11, 'Dez': 12
+}
+
+def mes_ano_pt(dt):
+    # Retorna string formatada em português tipo 'Abr/24'
+    mes_eng = dt.strftime('%b')  # abreviação em inglês
+    mes_pt = MES_POR_PT.get(mes_eng, mes_eng)
+    ano = dt.strftime('%y')
+    return f"{mes_pt}/{ano}"
+
+def data_pt_para_datetime(mes_ano_pt_str):
+    # Recebe string tipo "Abr/24" e converte para pd.Timestamp(ano, mes, dia=1)
+    mes_pt, ano_str = mes_ano_pt_str.split('/')
+    mes = MES_PT_PARA_NUM[mes_pt]
+    ano = 2000 + int(ano_str)  # exemplo: '24' vira 2024
+    return pd.Timestamp(year=ano, month=mes, day=1)
+
+
+COLUNAS_INDICES = [
+    'ÍNDICE S/ (PP+HH EXT.)',
+    'ÍNDICE + PP',
+    'ÍNDICE + PP + HH EXT',
+    'ÍNDICE ORÇADO',
+    'ÍNDICE + PP + HH EXT ACUMULADO'
+]
+
+
+def _planilha_produtividade():
+    return planilhas_google.abrir_planilha(cliente_sheets(), PLANILHA_PRODUTIVIDADE)
+
+
+def _caminho_produtividade_historico():
+    return os.path.join(PASTA_HISTORICO, ARQUIVO_PRODUTIVIDADE_HISTORICO)
+
+
+def versao_produtividade():
+    """Revisão da origem da produtividade (modificação no Drive ou mtime do arquivo) e do consolidado"""
+    if PLANILHA_PRODUTIVIDADE:
+        origem = planilhas_google.revisao(_planilha_produtividade())
+    else:
+        origem = os.stat(ARQUIVO_PRODUTIVIDADE).st_mtime_ns
+    historico = _caminho_produtividade_historico()
+    return origem, os.stat(historico).st_mtime_ns if os.path.exists(historico) else None
+
+
+@medicao.medido
+def carregar_produtividade():
+    """Produtividade da origem atual somada à consolidada no histórico (a origem atual prevalece)"""
+    if PLANILHA_PRODUTIVIDADE:
+        df = normalizar_produtividade(ler_abas_sheets(_planilha_produtividade(), [0])[0])["PRODUTIVIDADE"]
+    else:
+        df = carregar_snapshot(ARQUIVO_PRODUTIVIDADE, construir_produtividade)["PRODUTIVIDADE"]
+    historico = _caminho_produtividade_historico()
+    if os.path.exists(historico):
+        df = pd.concat([pd.read_parquet(historico), df], ignore_index=True)
+        df = df.drop_duplicates(subset=CHAVE_PRODUTIVIDADE, keep='last', ignore_index=True)
+    df['MÊS'] = df['DATA'].dt.to_period('M')
+    return df
+
+
+@medicao.medido
+def agregar_produtividade(df):
+    """Pré-agrega soma e contagem dos índices por (TIPO_OBRA, SERVIÇO, MÊS).
+
+    Guardar soma e contagem (e não a média) permite juntar tipos de obra e meses
+    depois e ainda obter exatamente a média que o groupby nos dados brutos daria.
+    Roda no atualizador; os painéis usam a versão publicada.
+    """
+    grupos = df.groupby(['TIPO_OBRA', 'SERVIÇO', 'MÊS'], dropna=False)[COLUNAS_INDICES]
+    return grupos.sum(), grupos.count()
+
+
+@medicao.medido
+def calcular_medias_mensais(soma, contagem, tipo_obra, servico, datas_selecionadas):
+    """Média mensal dos índices para os filtros, a partir da tabela pré-agregada"""
+    mascara = pd.Series(True, index=soma.index)
+    if tipo_obra != "Todos":
+        mascara &= soma.index.get_level_values('TIPO_OBRA') == tipo_obra
+    if servico:
+        mascara &= soma.index.get_level_values('SERVIÇO') == servico
+    if datas_selecionadas:
+        periodos = pd.to_datetime([data_pt_para_datetime(d) for d in datas_selecionadas]).to_period('M')
+        mascara &= soma.index.get_level_values('MÊS').isin(periodos)
+
+    soma_mes = soma[mascara.to_numpy()].groupby(level='MÊS').sum()
+    contagem_mes = contagem[mascara.to_numpy()].groupby(level='MÊS').sum()
+    df_mensal = (soma_mes / contagem_mes).reset_index()
+    df_mensal['DATA'] = df_mensal['MÊS'].dt.to_timestamp()
+    df_mensal['DATA_FORMATADA_PT'] = df_mensal['DATA'].apply(mes_ano_pt)
+    return df_mensal
+
+
+@medicao.medido
+def criar_grafico_indices_completos(df_mensal, servico):
+    import plotly.express as px
+
+    # Renomear colunas com prefixo do serviço
+    df_mensal_renomeado = df_mensal.rename(columns={col: f'{servico} - {col}' for col in COLUNAS_INDICES})
+
+    colunas_plot = [col for col in df_mensal_renomeado.columns if col.startswith(servico)]
+
+    fig = px.line(
+        df_mensal_renomeado,
+        x='DATA',
+        y=colunas_plot,
+        labels={'value': 'Índice', 'DATA': 'Mês/Ano'},
+        title=f"📈 Evolução dos Índices - {servico}",
+        markers=True
+    )
+
+    fig.update_xaxes(
+        tickformat="%b/%y",
+        tickmode='array',
+        tickvals=df_mensal_renomeado['DATA'],
+        ticktext=df_mensal_renomeado['DATA_FORMATADA_PT']
+    )
+
+    # Posicionar a legenda abaixo do gráfico
+    fig.update_layout(
+        legend=dict(
+            orientation="h",           # horizontal
+            yanchor="top",             # ancorar no topo da legenda
+            y=-0.3,                    # posição vertical (mais baixo = mais longe do gráfico)
+            xanchor="center",          # centralizar
+            x=0.5                      # posição horizontal central
+        )
+    )
+
+    return fig
+
+
+def opcoes_produtividade(chaves):
+    """Opções dos filtros de tipo de obra, serviço e mês a partir do índice da tabela pré-agregada"""
+    tipo_obra_opcoes = ["Todos"] + chaves.get_level_values('TIPO_OBRA').dropna().unique().tolist()
+    servicos_opcoes = sorted(chaves.get_level_values('SERVIÇO').dropna().unique().tolist())
+    meses_unicos = chaves.get_level_values('MÊS').dropna().unique().sort_values()
+    mes_ano_opcoes = [mes_ano_pt(pd.Timestamp(m.start_time)) for m in meses_unicos]
+    return tipo_obra_opcoes, servicos_opcoes, mes_ano_opcoes
+
+
+def dashboard_produtividade():
+    produtividade = _estado_dados()['produtividade']
+    if produtividade is None:
+        aguardar_primeira_carga()
+    soma, contagem = produtividade['soma'], produtividade['contagem']
+    tipo_obra_opcoes, servicos_opcoes, mes_ano_opcoes = resultado_em_cache(
+        "produtividade_opcoes", filtros_painel("produtividade", produtividade['versao']),
+        lambda: opcoes_produtividade(soma.index)
+    )
+
+    with st.sidebar:
+        st.header("🔍 Filtros - Produtividade")
+        tipo_obra = st.selectbox('Selecione o Tipo de Obra', tipo_obra_opcoes)
+        servico = st.selectbox('Selecione o Serviço (1 por vez)', servicos_opcoes)
+        datas_selecionadas = st.multiselect('Selecione o(s) Mês/Ano', mes_ano_opcoes, default=mes_ano_opcoes)
+
+    # Médias mensais a partir da tabela pré-agregada; o df_mensal é
+    # compartilhado entre sessões pelo cache e não é alterado aqui
+    filtros = filtros_painel(
+        "produtividade", produtividade['versao'], tipo_obra=tipo_obra, servico=servico, meses=datas_selecionadas
+    )
+    df_mensal = resultado_em_cache(
+        "produtividade_mensal", filtros,
+        lambda: calcular_medias_mensais(soma, contagem, tipo_obra, servico, datas_selecionadas)
+    )
+
+    # Criar gráfico de linha com todas as colunas de índice
+    fig_indices = figura_em_cache(
+        "produtividade_indices", filtros,
+        lambda: criar_grafico_indices_completos(df_mensal, servico)
+    )
+    st.title("📈 Dashboard de Produtividade")
+    exibir_grafico(fig_indices, "produtividade_indices")
+
+    # Tabela com colunas específicas + desvio (positiva = economia de HH)
+    def montar_tabela():
+        df_tabela = df_mensal[['DATA_FORMATADA_PT', 'ÍNDICE ORÇADO', 'ÍNDICE + PP + HH EXT']].rename(
+            columns={'DATA_FORMATADA_PT': 'MÊS/ANO'}
+        )
+        df_tabela['DESVIO'] = df_tabela['ÍNDICE ORÇADO'] - df_tabela['ÍNDICE + PP + HH EXT']
+        return df_tabela.round(2)
+    df_tabela = resultado_em_cache("produtividade_tabela", filtros, montar_tabela)
+
+    st.markdown("### 📊 Tabela de Índices e Desvio (Orçado - Real)")
+    exibir_tabela(df_tabela, "produtividade_indices_tabela")
+
+
+# ======================================
+# DASHBOARD ESCRITÓRIO (NOVO)
+# ======================================
+# Adicione esta função ao seu código existente
+
+CHAVES_WIDGETS_ESCRITORIO = [
+    "escritorio_financeira", "escritorio_analise", "escritorio_qtd", "escritorio_peso",
+    "escritorio_ranking_pagina"
+]
+
+
+def grafico_pizza_genero_escritorio(pizza_base, meses=1):
+    """Pizza por gênero do escritório; None quando não há FEMININO/MASCULINO"""
+    genero = pizza_base['Gênero']
+    genero = genero[genero.isin(['FEMININO', 'MASCULINO'])]
+    if genero.empty:
+        return None
+    pizza_genero = media_mensal(contar_valores(genero), meses).reset_index()
+    pizza_genero.columns = ['Gênero', 'count']
+    return criar_grafico_pizza(
+        pizza_genero, 'Gênero', rotulo_contagem('Distribuição por Gênero', meses),
+        {'MASCULINO': 'Blue', 'FEMININO': 'Red'}, textfont_size=14
+    )
+
+
+def secao_distribuicao_escritorio(pizza_base, filtros, meses):
+    st.markdown("### 📊 Distribuição por Tipo e Gênero")
+
+    # Cria colunas lado a lado
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Gráfico de Pizza - Tipo (existente)
+        def grafico_pizza_tipo():
+            pizza_diretos_indiretos = media_mensal(contar_valores(pizza_base['Tipo']), meses).reset_index()
+            pizza_diretos_indiretos.columns = ['Tipo', 'count']
+            return criar_grafico_pizza(
+                pizza_diretos_indiretos, 'Tipo', rotulo_contagem('Distribuição por Tipo de Efetivo', meses),
+                {'DIRETO': 'Blue', 'INDIRETO': 'Green'}, textfont_size=14
+            )
+        fig_pizza_tipo = figura_em_cache("escritorio_pizza_tipo", filtros, grafico_pizza_tipo)
+        exibir_grafico(fig_pizza_tipo, "escritorio_pizza_tipo")
+
+    with col2:
+        # Novo Gráfico de Pizza - Gênero
+        if 'Gênero' in pizza_base.columns:
+            fig_pizza_genero = figura_em_cache(
+                "escritorio_pizza_genero", filtros, lambda: grafico_pizza_genero_escritorio(pizza_base, meses)
+            )
+            if fig_pizza_genero is not None:
+                exibir_grafico(fig_pizza_genero, "escritorio_pizza_genero")
+            else:
+                st.warning("Dados de gênero não encontrados (valores devem ser 'Feminino' ou 'Masculino')")
+        else:
+            st.warning("Coluna de gênero não encontrada (procura por 'GENÊRO' ou 'GÊNERO')")
+
+
+@st.fragment
+@medicao.medido
+def secao_financeira_escritorio(matriz, df_filtrado, filtros):
+    analise_financeira = st.radio(
+        "Análise:", 
+        ['Geral', 'Ganhos', 'Descontos'],
+        horizontal=True,
+        key="escritorio_financeira"
+    )
+
+    if df_filtrado.empty:
+        st.warning("Nenhum funcionário para os filtros selecionados.")
+        return
+
+    def totais():
+        return totalizar_colunas(matriz, df_filtrado)
+
+    if analise_financeira == 'Geral':
+        fig_cascata, total_ganhos, total_descontos, remuneracao_liquida = figura_em_cache(
+            "escritorio_cascata", filtros,
+            lambda: criar_grafico_cascata(totais(), matriz['ganhos'], matriz['descontos'])
+        )
+        exibir_grafico(fig_cascata, "escritorio_cascata")
+        col_fin1, col_fin2, col_fin3 = st.columns(3)
+        col_fin1.metric("💚 Total Ganhos", formatar_moeda(total_ganhos))
+        col_fin2.metric("💸 Total Descontos", formatar_moeda(total_descontos))
+        col_fin3.metric("💰 Remuneração Líquida", formatar_moeda(remuneracao_liquida))
+
+    elif analise_financeira == 'Ganhos':
+        fig_ganhos = figura_em_cache(
+            "escritorio_ganhos", filtros,
+            lambda: criar_grafico_detalhado(totais(), matriz['ganhos'], "Detalhamento dos Ganhos - Escritório", "green")
+        )
+        if fig_ganhos:
+            exibir_grafico(fig_ganhos, "escritorio_ganhos")
+        else:
+            st.warning("Nenhum dado de ganhos encontrado para os filtros selecionados.")
+
+    elif analise_financeira == 'Descontos':
+        fig_descontos = figura_em_cache(
+            "escritorio_descontos", filtros,
+            lambda: criar_grafico_detalhado(totais(), matriz['descontos'], "Detalhamento dos Descontos - Escritório", "red")
+        )
+        if fig_descontos:
+            exibir_grafico(fig_descontos, "escritorio_descontos")
+        else:
+            st.warning("Nenhum dado de descontos encontrado para os filtros selecionados.")
+
+
+def linhas_ranking_escritorio(df_filtrado, tipo_selecionado):
+    if tipo_selecionado == 'Todos':
+        return df_filtrado[df_filtrado['Tipo'].isin(['DIRETO', 'INDIRETO'])]
+    return df_filtrado
+
+
+@medicao.medido
+def montar_ranking_escritorio(df_filtrado, tipo_selecionado, tipo_analise):
+    """Linhas com valor na análise escolhida e o total do cabeçalho do ranking"""
+    coluna_valor = {
+        'Produção': 'PRODUÇÃO',
+        'Hora Extra Semana': 'Hora Extra 70% - Semana',
+        'Hora Extra Sábado': 'Hora Extra 70% - Sabado'
+    }[tipo_analise]
+
+    df_ranking = linhas_ranking_escritorio(df_filtrado, tipo_selecionado)
+
+    nome_col_funcao = 'Função' if 'Função' in df_ranking.columns else None
+
+    if tipo_analise == 'Produção' and 'REFLEXO S PRODUÇÃO' in df_ranking.columns:
+        cols_rank = ['Nome do Funcionário', nome_col_funcao, 'Departamento', 'Tipo', 'PRODUÇÃO', 'REFLEXO S PRODUÇÃO']
+        valor_coluna = 'PRODUÇÃO'
+    else:
+        cols_rank = ['Nome do Funcionário', nome_col_funcao, 'Departamento', 'Tipo', coluna_valor]
+        valor_coluna = coluna_valor
+
+    cols_rank = [c for c in cols_rank if c is not None and c in df_ranking.columns]
+    df_ranking_limp = df_ranking.loc[df_ranking[valor_coluna] > 0, cols_rank].rename(columns={'REFLEXO S PRODUÇÃO': 'DSR'})
+
+    return MappingProxyType({
+        'linhas': df_ranking_limp,
+        'valor_coluna': valor_coluna,
+        'valor_total': df_ranking_limp[valor_coluna].sum(),
+        'nome_col_funcao': nome_col_funcao
+    })
+
+
+@st.fragment
+@medicao.medido
+def secao_ranking_escritorio(df_filtrado, tipo_selecionado, filtros, meses):
+    col_filtro1, col_filtro2 = st.columns(2)
+    tipo_analise = col_filtro1.radio(
+        "Tipo de Análise da Tabela:", 
+        ['Produção', 'Hora Extra Semana', 'Hora Extra Sábado'],
+        horizontal=True,
+        key="escritorio_analise"
+    )
+    qtd_linhas = col_filtro2.radio(
+        "Qtd. de Funcionários na Tabela:", 
+        ['5', '10', '20', 'Todos'], 
+        horizontal=True,
+        key="escritorio_qtd"
+    )
+
+    filtros_ranking = filtros._replace(analise=tipo_analise)
+    dados = resultado_em_cache(
+        "escritorio_ranking", filtros_ranking,
+        lambda: montar_ranking_escritorio(df_filtrado, tipo_selecionado, tipo_analise)
+    )
+    valor_coluna = dados['valor_coluna']
+    nome_col_funcao = dados['nome_col_funcao']
+    st.markdown(f"### 📋 Top Funcionários por **{tipo_analise}**")
+    st.markdown(f"**Total em {tipo_analise}:** {formatar_moeda(dados['valor_total'])}")
+
+    ranking = resultado_em_cache(
+        "escritorio_ranking_top", filtros_ranking._replace(qtd=qtd_linhas),
+        lambda: selecionar_top(dados['linhas'], valor_coluna, qtd_linhas)
+    )
+    exibir_tabela(ranking, "escritorio_ranking", column_config=config_colunas_moeda([valor_coluna, 'DSR']))
+    st.divider()
+
+    if nome_col_funcao:
+        fig_bar = figura_em_cache(
+            "escritorio_funcao", filtros,
+            lambda: criar_grafico_funcao(
+                contar_valores(linhas_ranking_escritorio(df_filtrado, tipo_selecionado)[nome_col_funcao]),
+                nome_col_funcao, meses
+            )
+        )
+        exibir_grafico(fig_bar, "escritorio_funcao")
+
+
+@medicao.medido
+def filtrar_escritorio(df, departamentos, tipo, funcionario):
+    df_filtrado = df[df['Departamento'].isin(departamentos)]
+    if tipo != 'Todos':
+        df_filtrado = df_filtrado[df_filtrado['Tipo'] == tipo]
+    if funcionario != "Todos":
+        df_filtrado = df_filtrado[df_filtrado['Nome do Funcionário'] == funcionario]
+    return df_filtrado
+
+
+def dashboard_escritorio():
+    st.title("🏢 Análise de Efetivo - Escritório")
+
+    with st.sidebar:
+        st.header("🔍 Filtros - Escritório")
+        competencias = selecionar_competencias(key="escritorio_competencias")
+
+    # Carrega dados
+    conjunto = carregar_conjunto_efetivo(competencias)
+    versao = versao_historico(competencias)
+
+    # Filtra apenas escritório engenharia
+    df = resultado_em_cache(
+        "escritorio_base", filtros_painel("escritorio", versao),
+        lambda: selecionar_linhas(conjunto['efetivo'], conjunto['indice_efetivo'], ['ESCRITÓRIO ENGENHARIA'])
+    )
+
+    # Verifica se existe coluna Departamento
+    if 'Departamento' not in df.columns:
+        st.error("Coluna 'Departamento' não encontrada!")
+        return
+
+    lista_departamentos, lista_funcionarios = resultado_em_cache(
+        "escritorio_listas", filtros_painel("escritorio", versao),
+        lambda: (sorted(df['Departamento'].astype(str).unique()), sorted(df['Nome do Funcionário'].unique()))
+    )
+
+    matriz = carregar_matriz_financeira(competencias)
+    
+    with st.sidebar:
+        departamentos_selecionados = st.multiselect(
+            "Departamentos:", 
+            lista_departamentos, 
+            default=lista_departamentos,
+            key="escritorio_deptos"
+        )
+        tipo_selecionado = st.radio(
+            "Tipo:", 
+            ['Todos', 'DIRETO', 'INDIRETO'],
+            horizontal=True,
+            key="escritorio_tipo"
+        )
+
+    # Filtro por funcionário (opcional)
+    funcionario_selecionado = st.selectbox(
+        "🔎 Filtrar por funcionário (opcional):",
+        ["Todos"] + lista_funcionarios,
+        key="filtro_funcionario"
+    )
+
+    # Chave dos caches: versão dos dados + filtros normalizados
+    filtros = filtros_painel(
+        "escritorio", versao,
+        departamentos=departamentos_selecionados, tipo=tipo_selecionado, funcionario=funcionario_selecionado
+    )
+    df_filtrado = resultado_em_cache(
+        "escritorio_filtrado", filtros,
+        lambda: filtrar_escritorio(df, departamentos_selecionados, tipo_selecionado, funcionario_selecionado)
+    )
+
+    # Métricas (sem terceiros)
+    direto_count, indireto_count = resultado_em_cache(
+        "escritorio_contagens", filtros,
+        lambda: (len(df_filtrado[df_filtrado['Tipo'] == 'DIRETO']), len(df_filtrado[df_filtrado['Tipo'] == 'INDIRETO']))
+    )
+    total_geral = direto_count + indireto_count
+
+    # Com mais de um mês os cartões e gráficos de contagem mostram a média mensal
+    meses = len(competencias)
+    col1, col2, col3 = st.columns(3)
+    col1.metric(rotulo_contagem("👷 Direto", meses), texto_contagem(media_mensal(direto_count, meses)))
+    col2.metric(rotulo_contagem("👷‍♂️ Indireto", meses), texto_contagem(media_mensal(indireto_count, meses)))
+    col3.metric(rotulo_contagem("👥 Total", meses), texto_contagem(media_mensal(total_geral, meses)))
+
+    secoes = ["📊 Distribuição", "💰 Análise Financeira", "📋 Ranking", "⚖️ Peso Financeiro"]
+    abas = abrir_secoes(secoes, key="escritorio_secao", chaves_widgets=CHAVES_WIDGETS_ESCRITORIO)
+
+    with abas["📊 Distribuição"]:
+        if abas["📊 Distribuição"].open:
+            pizza_base = resultado_em_cache(
+                "escritorio_pizza_base", filtros.restrito('departamentos'),
+                lambda: df[df['Departamento'].isin(departamentos_selecionados)]
+            )
+            secao_distribuicao_escritorio(pizza_base, filtros.restrito('departamentos'), meses)
+
+    with abas["💰 Análise Financeira"]:
+        if abas["💰 Análise Financeira"].open:
+            secao_financeira_escritorio(matriz, df_filtrado, filtros)
+
+    with abas["📋 Ranking"]:
+        if abas["📋 Ranking"].open:
+            secao_ranking_escritorio(df_filtrado, tipo_selecionado, filtros, meses)
+
+    with abas["⚖️ Peso Financeiro"]:
+        if abas["⚖️ Peso Financeiro"].open:
+            secao_peso(
+                df, 'Departamento', departamentos_selecionados, key="escritorio_peso",
+                filtros=filtros.restrito('departamentos')
+            )
+
+
+
+def exibir_desempenho(execucao):
+    """Painel do admin: etapas desta execução e p50/p95 de cada etapa no log (todas as sessões)"""
+    medir = st.checkbox(
+        "Medir pico de memória",
+        value=medicao.medindo_memoria(),
+        help="Usa o tracemalloc: deixa o servidor mais lento e vale para todas as sessões até ser desligado."
+    )
+    medicao.medir_memoria(medir)
+    st.caption("Esta execução (etapas internas recuadas)")
+    st.dataframe(medicao.tabela_execucao(execucao), hide_index=True)
+    st.caption(f"Histórico em {medicao.ARQUIVO_LOG} (p50/p95 por etapa)")
+    st.dataframe(medicao.resumo_log(), hide_index=True)
+
+
+def main():
+    st.set_page_config(page_title="Dashboards Inteligentes", layout="wide")
+
+    # Re-ingestão das planilhas e aquecimento do 📊 em segundo plano (uma vez por
+    # servidor), já na tela de login: quem entra primeiro encontra tudo pronto
+    iniciar_atualizador()
+    iniciar_aquecimento()
+
+    # 🔐 Verifica login antes de continuar
+    verificar_login()
+
+    # 🧠 Inicializa a aba padrão após login
+    if 'aba_atual' not in st.session_state:
+        st.session_state.aba_atual = "📊"
+
+    # 1. Cabeçalho
+    col1, col2 = st.columns([1, 4])
+    with col1:
+        st.image("logotipo.png", width=400)
+    with col2:
+        st.markdown("<h1 style='margin-top: 30px;'>SISTEMA INTELIGENTE DE GESTÃO</h1>", unsafe_allow_html=True)
+
+    # 2. Sidebar com navegação baseada no tipo de usuário
+    with st.sidebar:
+        st.title("🎛️ Painel de Controle")
+        st.markdown(f"👤 **Usuário:** {st.session_state.usuario}")
+
+        tipo = st.session_state.tipo_usuario
+        if tipo == "admin":
+            opcoes_abas = {
+                "📊": "efetivo",
+                "📈": "produtividade",
+                "🏢": "escritorio"
+            }
+        elif tipo == "engenharia":
+            opcoes_abas = {
+                "📊": "efetivo",
+                "📈": "produtividade"
+            }
+        else:
+            opcoes_abas = {}
+
+        cols = st.columns(len(opcoes_abas))
+        for idx, (nome_aba, aba_key) in enumerate(opcoes_abas.items()):
+            with cols[idx]:
+                if st.button(nome_aba, key=f"btn_{aba_key}"):
+                    st.session_state.aba_atual = nome_aba
+
+    # 3. Renderização do dashboard conforme aba ativa (medida etapa a etapa)
+    with medicao.etapa(f"página {st.session_state.aba_atual}") as execucao:
+        try:
+            if st.session_state.aba_atual == "📊":
+                dashboard_efetivo()
+            elif st.session_state.aba_atual == "🏢":
+                dashboard_escritorio()
+            elif st.session_state.aba_atual == "📈":
+                dashboard_produtividade()
+        except Exception as e:
+            st.error(f"Erro ao carregar o dashboard: {str(e)}")
+            st.session_state.aba_atual = "📊"
+
+    # 4. Bytes de gráficos/tabelas enviados ao navegador (todas as sessões) e tempos por etapa
+    if tipo == "admin":
+        with st.sidebar.expander("📦 Dados enviados"):
+            st.dataframe(resumo_envios(), hide_index=True)
+        with st.sidebar.expander("⏱️ Desempenho"):
+            exibir_desempenho(execucao)
+
+    # 5. Rodapé
+    st.markdown("""---""")
+
+    st.markdown(
+        """
+        <div style='text-align: center; font-size: 14px; color: gray; padding-top: 20px;'>
+            <i>“Inspirados pelo que te faz bem”</i>
+            <br>
+            Desenvolvido por <b>Matheus Vinicio</b> — Engenharia
+            <br>
+            © 2025 <a href='https://wifa.com.br/rioave/dashboard' target='_blank' style='color: gray; text-decoration: none;'><b>RIO AVE</b></a>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+"""Benchmark do app2 com dados sintéticos de folha (EFETIVO/TERCEIROS) e produtividade.
+
+Gera meses de efetivo com as colunas reais (definir_colunas_ganhos_descontos
+e o layout das abas), ingere no histórico de uma pasta temporária e mede os
+carregadores e as contas de cada painel. O resultado sai em JSON para comparar
+execuções (--comparar).
+
+Uso:
+    python benchmark.py --linhas 10000 100000 1000000 --saida benchmark.json
+    python benchmark.py --linhas 10000 --planilhas      # inclui a leitura dos .xlsx
+    python benchmark.py --linhas 10000 --comparar benchmark.json
+
+--linhas é o total de linhas funcionário-mês, divididas igualmente entre os
+--meses. Sem --planilhas os meses gerados vão direto para a normalização, sem
+passar por .xlsx (escrever 1M de linhas com openpyxl leva muitos minutos).
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+import app2
+import medicao
+
+ESCRITORIO = 'ESCRITÓRIO ENGENHARIA'
+COLUNAS_IDENTIFICACAO = [
+    'Empresa', 'Nome da Empresa', 'Funcionário', 'Obra', 'Nome do Funcionário', 'GENÊRO', 'Tipo',
+    'Função', 'Departamento', 'Admissão', 'Demissão'
+]
+FUNCOES = [
+    'Servente de Obras', 'Pedreiro', 'Carpinteiro', 'Armador', 'Eletricista', 'Encanador',
+    'Encarregado de Armacao', 'Mestre de Obras', 'Apontador', 'Almoxarife', 'Técnico de Segurança',
+    'Engenheiro Civil', 'Estagiário', 'Auxiliar Administrativo'
+]
+EMPRESAS_TERCEIRAS = ['TKE', 'COSNTRUSERV', 'LOCAMAQ', 'CONCRETEX', 'ELETROSUL', 'HIDROTEC']
+# Fração das linhas com valor em cada coluna de ganho/desconto (as demais vêm vazias, como na planilha)
+DENSIDADE = {
+    'SALÁRIO': 1.0, 'PRODUÇÃO': 0.4, 'REFLEXO S PRODUÇÃO': 0.4, 'Hora Extra 70% - Semana': 0.5,
+    'Hora Extra 70% - Sabado': 0.3, 'Hora Extra 100%': 0.1, 'Repouso Remunerado': 0.5,
+    'INSS Folha': 1.0, 'IRRF Folha': 0.3, 'Vale Transporte': 0.6, 'DESCONTO DE ALIMENTAÇÃO': 0.8
+}
+DENSIDADE_PADRAO = 0.05
+
+
+def colunas_efetivo():
+    """Cabeçalho da aba EFETIVO: identificação, folha, ganhos e descontos (sem repetir nomes)"""
+    ganhos, descontos = app2.definir_colunas_ganhos_descontos()
+    return list(dict.fromkeys(COLUNAS_IDENTIFICACAO + app2.COLUNAS_FOLHA + ganhos + descontos))
+
+
+def competencias_ate(fim, meses):
+    """Os `meses` meses terminados em fim ('AAAA-MM'), em ordem"""
+    return [str(p) for p in pd.period_range(end=fim, periods=meses, freq='M')]
+
+
+def gerar_efetivo(linhas, obras, departamentos, competencia, semente=0):
+    """Aba EFETIVO de um mês como o ler_abas_excel devolveria (antes da normalização).
+
+    Os funcionários são os mesmos de mês a mês (mesmo nome e obra), então a
+    reingestão compara linhas de verdade; ~5% das linhas são do escritório.
+    """
+    rng = np.random.default_rng([semente, int(competencia.replace('-', ''))])
+    numeros = np.arange(linhas)
+    # semente fixa por funcionário: obra, tipo, função e gênero não mudam entre meses
+    fixo = np.random.default_rng(semente)
+    no_escritorio = fixo.random(linhas) < 0.05
+    obra = np.where(no_escritorio, ESCRITORIO, np.array(obras, dtype=object)[fixo.integers(0, len(obras), linhas)])
+    departamento = np.where(
+        no_escritorio, np.array(departamentos, dtype=object)[fixo.integers(0, len(departamentos), linhas)], 'OBRA'
+    )
+
+    dados = {
+        'Empresa': '00017',
+        'Nome da Empresa': 'EMPRESA SINTÉTICA LTDA',
+        'Funcionário': [f"{n:06d}" for n in numeros],
+        'Obra': obra,
+        'Nome do Funcionário': [f"FUNCIONÁRIO {n:07d}" for n in numeros],
+        'GENÊRO': np.where(fixo.random(linhas) < 0.15, 'Feminino', 'Masculino'),
+        'Tipo': np.where(fixo.random(linhas) < 0.7, 'DIRETO', 'INDIRETO'),
+        'Função': np.array(FUNCOES, dtype=object)[fixo.integers(0, len(FUNCOES), linhas)],
+        'Departamento': departamento,
+        'Admissão': pd.Timestamp('2020-01-01') + pd.to_timedelta(fixo.integers(0, 1800, linhas), unit='D'),
+        'Demissão': np.nan,
+        'Remuneração Líquida Folha': np.round(rng.uniform(1200, 9000, linhas), 2),
+        'Adiantamento': np.round(np.where(rng.random(linhas) < 0.6, rng.uniform(300, 1500, linhas), np.nan), 2)
+    }
+    ganhos, descontos = app2.definir_colunas_ganhos_descontos()
+    for col in colunas_efetivo()[len(COLUNAS_IDENTIFICACAO) + len(app2.COLUNAS_FOLHA):]:
+        valores = np.round(rng.uniform(10, 2500, linhas), 2)
+        if col in descontos:
+            valores = -valores
+        dados[col] = np.where(rng.random(linhas) < DENSIDADE.get(col, DENSIDADE_PADRAO), valores, np.nan)
+    return pd.DataFrame(dados, columns=colunas_efetivo())
+
+
+def gerar_terceiros(obras, competencia, semente=0):
+    """Aba TERCEIROS: algumas empresas por obra, com a quantidade de funcionários"""
+    rng = np.random.default_rng([semente, int(competencia.replace('-', '')), 1])
+    linhas = [
+        (obra, empresa, int(rng.integers(1, 40)))
+        for obra in obras for empresa in EMPRESAS_TERCEIRAS if rng.random() < 0.5
+    ]
+    return pd.DataFrame(linhas, columns=['Obra', 'EMPRESA', 'QUANTIDADE'])
+
+
+def gerar_produtividade(obras, servicos, competencias, semente=0):
+    """Aba de produtividade: um registro por obra, serviço e mês (DATA no dia 1º)"""
+    rng = np.random.default_rng([semente, 2])
+    chaves = pd.MultiIndex.from_product(
+        [obras, servicos, pd.to_datetime([f"{c}-01" for c in competencias])], names=['TIPO_OBRA', 'SERVIÇO', 'DATA']
+    ).to_frame(index=False)
+    base = rng.uniform(0.8, 3.0, len(chaves))
+    indices = {
+        'ÍNDICE S/ (PP+HH EXT.)': base,
+        'ÍNDICE + PP': base * rng.uniform(1.0, 1.6, len(chaves)),
+        'ÍNDICE + PP + HH EXT': base * rng.uniform(1.2, 2.2, len(chaves)),
+        'ÍNDICE ORÇADO': rng.uniform(0.8, 2.0, len(chaves))
+    }
+    df = pd.concat([chaves, pd.DataFrame(indices)], axis=1)
+    df['ÍNDICE + PP + HH EXT ACUMULADO'] = df.groupby(['TIPO_OBRA', 'SERVIÇO'])['ÍNDICE + PP + HH EXT'].cumsum()
+    df.insert(0, 'Unnamed: 0', np.nan)
+    return df
+
+
+def gravar_planilha(caminho, abas):
+    """Grava as abas num .xlsx (openpyxl em modo de escrita sequencial); vazios viram células vazias"""
+    wb = Workbook(write_only=True)
+    for nome, df in abas.items():
+        ws = wb.create_sheet(nome)
+        ws.append([None if str(c).startswith('Unnamed:') else c for c in df.columns])
+        for linha in df.itertuples(index=False, name=None):
+            ws.append([None if isinstance(v, float) and v != v else v for v in linha])
+    wb.save(caminho)
+
+
+# ======================================
+# MEDIÇÃO
+# ======================================
+
+def medir(funcao, repeticoes):
+    """Roda funcao `repeticoes` vezes; devolve os tempos (s) e o último resultado"""
+    tempos = []
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return tempos, resultado
+
+
+class Execucao:
+    """Acumula os resultados de uma escala; um cenário que falha é registrado com o erro e não para os demais"""
+
+    def __init__(self, linhas, repeticoes):
+        self.linhas = linhas
+        self.repeticoes = repeticoes
+        self.resultados = []
+
+    def cenario(self, nome, funcao, repeticoes=None):
+        repeticoes = repeticoes or self.repeticoes
+        registro = {'linhas': self.linhas, 'cenario': nome, 'repeticoes': repeticoes}
+        try:
+            tempos, resultado = medir(funcao, repeticoes)
+        except Exception as e:
+            registro['erro'] = f"{type(e).__name__}: {e}"
+            resultado = None
+            print(f"  {nome:<32} ERRO {registro['erro']}", flush=True)
+        else:
+            registro.update(segundos_min=min(tempos), segundos_mediana=statistics.median(tempos))
+            print(f"  {nome:<32} {min(tempos) * 1000:>10.1f} ms", flush=True)
+        self.resultados.append(registro)
+        return resultado
+
+
+def limpar_caches():
+    """Esvazia os caches do app compartilhados entre sessões, para uma escala não reaproveitar a anterior"""
+    # as escalas repetem os meses e a revisão 1, então as chaves dos caches coincidiriam
+    for cache in (app2._estado_dados, app2._carregar_conjunto_efetivo, app2._cache_resultados, app2._contador_envios):
+        cache.clear()
+
+
+def _estado_benchmark():
+    """Estado do histórico no formato do _estado_dados, sem o cache do Streamlit"""
+    estado = app2._estado_dados()
+    estado.update(manifesto={"competencias": {}}, gravando=False, geracao=0)
+    return estado
+
+
+def executar_escala(linhas, args, pasta):
+    """Gera, ingere e mede uma escala dentro de pasta (histórico e planilhas temporários)"""
+    execucao = Execucao(linhas, args.repeticoes)
+    obras = [f"OBRA {i:02d}" for i in range(args.obras)]
+    departamentos = [f"DEPARTAMENTO {i:02d}" for i in range(args.departamentos)]
+    servicos = [f"SERVIÇO {i:02d}" for i in range(args.servicos)]
+    competencias = competencias_ate(args.fim, args.meses)
+    linhas_mes = max(1, linhas // args.meses)
+
+    app2.PASTA_DADOS = pasta
+    app2.PASTA_HISTORICO = os.path.join(pasta, "historico")
+    app2.PASTA_SNAPSHOTS = os.path.join(pasta, ".snapshots")
+    limpar_caches()
+    estado = _estado_benchmark()
+    print(f"\n== {linhas} linhas ({args.meses} meses x {linhas_mes}, {args.obras} obras) ==", flush=True)
+
+    # 1. Carregadores: planilha -> abas normalizadas -> partições do histórico
+    if args.planilhas:
+        for competencia in competencias:
+            gravar_planilha(os.path.join(pasta, f"efetivo_{competencia}.xlsx"), {
+                "EFETIVO": gerar_efetivo(linhas_mes, obras, departamentos, competencia, args.semente),
+                "TERCEIROS": gerar_terceiros(obras, competencia, args.semente)
+            })
+        gravar_planilha(
+            os.path.join(pasta, "produtividade.xlsx"),
+            {"PRODUTIVIDADE": gerar_produtividade(obras, servicos, competencias, args.semente)}
+        )
+        app2.ARQUIVO_PRODUTIVIDADE = os.path.join(pasta, "produtividade.xlsx")
+        exemplo = os.path.join(pasta, f"efetivo_{competencias[-1]}.xlsx")
+        execucao.cenario("leitura_xlsx_mes", lambda: app2.ler_abas_excel(exemplo, ["EFETIVO", "TERCEIROS"]))
+        manifesto = execucao.cenario("sincronizar_historico", lambda: app2.sincronizar_historico(estado), 1)
+        execucao.cenario("sincronizar_sem_mudanca", lambda: app2.sincronizar_historico(estado), 1)
+        df_produtividade = execucao.cenario("carregar_produtividade", app2.carregar_produtividade, 1)
+    else:
+        manifesto = {"competencias": {}}
+        normalizar, ingerir = [], []
+        for competencia in competencias:
+            brutas = {
+                "EFETIVO": gerar_efetivo(linhas_mes, obras, departamentos, competencia, args.semente),
+                "TERCEIROS": gerar_terceiros(obras, competencia, args.semente)
+            }
+            tempos, abas = medir(lambda: app2.normalizar_abas_efetivo({k: v.copy() for k, v in brutas.items()}), 1)
+            normalizar += tempos
+            origem = {"arquivo": f"sintetico_{competencia}"}
+            tempos, manifesto = medir(lambda: app2.ingerir_competencia(abas, origem, competencia, manifesto, estado), 1)
+            ingerir += tempos
+        for nome, tempos in (("normalizar_mes", normalizar), ("ingerir_mes", ingerir)):
+            execucao.resultados.append({
+                'linhas': linhas, 'cenario': nome, 'repeticoes': len(tempos),
+                'segundos_min': min(tempos), 'segundos_mediana': statistics.median(tempos)
+            })
+            print(f"  {nome:<32} {min(tempos) * 1000:>10.1f} ms", flush=True)
+        abas = app2.normalizar_abas_efetivo({
+            "EFETIVO": gerar_efetivo(linhas_mes, obras, departamentos, competencias[-1], args.semente),
+            "TERCEIROS": gerar_terceiros(obras, competencias[-1], args.semente)
+        })
+        execucao.cenario(
+            "reingerir_mes_sem_mudanca",
+            lambda: app2.ingerir_competencia(abas, {"arquivo": "sintetico"}, competencias[-1], manifesto, estado), 1
+        )
+        df_produtividade = app2.normalizar_produtividade(
+            gerar_produtividade(obras, servicos, competencias, args.semente)
+        )["PRODUTIVIDADE"]
+        df_produtividade['MÊS'] = df_produtividade['DATA'].dt.to_period('M')
+
+    if manifesto is None:
+        return execucao.resultados
+    estado['manifesto'] = manifesto
+    competencias = tuple(competencias)
+    versao = app2.versao_historico(competencias)
+
+    # 2. Conjunto compartilhado (todas as competências de uma vez)
+    conjunto = execucao.cenario(
+        "carregar_conjunto", lambda: app2._carregar_conjunto_efetivo.__wrapped__(competencias, versao), 1
+    )
+    if conjunto is None:
+        return execucao.resultados
+    execucao.cenario("resumir_historico_por_obra", lambda: app2.resumir_historico_por_obra(competencias))
+
+    # 3. Contas dos painéis: todas as obras e só duas
+    obras_conjunto = app2.carregar_efetivo_obras(competencias)
+    matriz = conjunto['matriz']
+    ganhos, descontos = matriz['ganhos'], matriz['descontos']
+    for rotulo, selecao in (("todas", obras_conjunto['obras']), ("2_obras", obras_conjunto['obras'][:2])):
+        df_filtrado = execucao.cenario(
+            f"filtrar[{rotulo}]", lambda: app2.filtrar_efetivo(obras_conjunto, selecao, 'Todos')
+        )
+        execucao.cenario(f"contagens[{rotulo}]", lambda: app2.contar_efetivo(obras_conjunto, selecao))
+        ranking = execucao.cenario(
+            f"ranking[{rotulo}]",
+            lambda: app2.montar_ranking_efetivo(obras_conjunto, df_filtrado, selecao, 'Todos', 'Produção')
+        )
+        execucao.cenario(
+            f"ranking_top10[{rotulo}]", lambda: app2.selecionar_top(ranking['linhas'], ranking['valor_coluna'], '10')
+        )
+        totais = execucao.cenario(f"totalizar[{rotulo}]", lambda: app2.totalizar_colunas(matriz, df_filtrado))
+        execucao.cenario(f"cascata[{rotulo}]", lambda: app2.criar_grafico_cascata(totais, ganhos, descontos))
+        execucao.cenario(
+            f"detalhado[{rotulo}]", lambda: app2.criar_grafico_detalhado(totais, ganhos, "Ganhos", "green")
+        )
+
+    pesos = execucao.cenario(
+        "peso_financeiro[obras]", lambda: app2.calcular_peso_financeiro(obras_conjunto['cubo'].reset_index(), 'Obra')
+    )
+    execucao.cenario(
+        "grafico_peso[obras]",
+        lambda: app2.criar_grafico_peso(pesos, 'Peso sobre Produção', obras_conjunto['obras'][:2])
+    )
+    escritorio = app2.selecionar_linhas(conjunto['efetivo'], conjunto['indice_efetivo'], [ESCRITORIO])
+    execucao.cenario(
+        "peso_financeiro[departamentos]", lambda: app2.calcular_peso_financeiro(escritorio, 'Departamento')
+    )
+
+    # 4. Produtividade: pré-agregação (atualizador) e médias mensais (painel)
+    soma, contagem = execucao.cenario(
+        "agregar_produtividade", lambda: app2.agregar_produtividade(df_produtividade)
+    ) or (None, None)
+    if soma is not None:
+        meses = [app2.mes_ano_pt(pd.Timestamp(f"{c}-01")) for c in competencias]
+        execucao.cenario(
+            "medias_mensais", lambda: app2.calcular_medias_mensais(soma, contagem, "Todos", servicos[0], meses)
+        )
+    return execucao.resultados
+
+
+def comparar(anterior, atual):
+    """Tabela com a razão atual/anterior do tempo mínimo de cada (linhas, cenário) presente nas duas execuções"""
+    def indexar(execucao):
+        return {(r['linhas'], r['cenario']): r for r in execucao['resultados'] if 'segundos_min' in r}
+
+    antes, depois = indexar(anterior), indexar(atual)
+    print(f"\n{'linhas':>9}  {'cenário':<32} {'antes (ms)':>11} {'agora (ms)':>11} {'razão':>7}")
+    for chave in sorted(antes.keys() & depois.keys()):
+        a, b = antes[chave]['segundos_min'], depois[chave]['segundos_min']
+        print(f"{chave[0]:>9}  {chave[1]:<32} {a * 1000:>11.1f} {b * 1000:>11.1f} {b / a if a else float('inf'):>7.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10_000, 100_000],
+                        help="total de linhas funcionário-mês de cada escala")
+    parser.add_argument("--meses", type=int, default=12)
+    parser.add_argument("--fim", default="2025-04", help="última competência gerada (AAAA-MM)")
+    parser.add_argument("--obras", type=int, default=60)
+    parser.add_argument("--departamentos", type=int, default=8)
+    parser.add_argument("--servicos", type=int, default=20)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--planilhas", action="store_true", help="grava e lê .xlsx de verdade")
+    parser.add_argument("--saida", help="arquivo JSON com os resultados")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior para comparar")
+    args = parser.parse_args(argv)
+
+    medicao.modo_script()
+
+    resultados = []
+    for linhas in args.linhas:
+        with tempfile.TemporaryDirectory(prefix="benchmark_app2_") as pasta:
+            resultados += executar_escala(linhas, args, pasta)
+
+    execucao = {
+        'gerado_em': datetime.now().isoformat(timespec="seconds"),
+        'ambiente': {
+            'python': platform.python_version(), 'pandas': pd.__version__, 'numpy': np.__version__,
+            'plataforma': platform.platform(), 'cpus': os.cpu_count()
+        },
+        'parametros': {k: v for k, v in vars(args).items() if k not in ('saida', 'comparar')},
+        'resultados': resultados
+    }
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(execucao, f, ensure_ascii=False, indent=2)
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            comparar(json.load(f), execucao)
+    return execucao
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,105 @@
+"""Formatação de valores no padrão brasileiro (R$ 1.234,56 e 12,34%).
+
+As versões "_serie" formatam um array inteiro de uma vez com os kernels de
+texto do pyarrow, sem laço em Python por linha. As versões escalares têm
+cache e servem cartões, textos soltos e arrays curtos (rótulos de gráfico),
+onde montar os arrays do pyarrow custa mais que formatar valor a valor.
+"""
+from functools import lru_cache
+import math
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Abaixo disso as versões "_serie" usam as escalares com cache
+LIMITE_ESCALAR = 256
+# A partir daqui (em unidades da última casa, p.ex. centavos) o float de
+# valor * 10**casas já erra a última casa, e perto de 2**63 estoura o int64:
+# esses valores e os infinitos vão para as versões escalares
+LIMITE_VETORIZADO = 10 ** 12
+
+_PADRAO_BR = str.maketrans(",.", ".,")
+
+
+@lru_cache(maxsize=4096)
+def formatar_moeda(valor, casas=2):
+    """R$ 1.234,56; negativos como -R$ 1.234,56 e NaN como ''"""
+    if math.isnan(valor):
+        return ''
+    texto = f"{abs(valor):,.{casas}f}".translate(_PADRAO_BR)
+    # o sinal segue o valor arredondado, para não exibir "-R$ 0,00"
+    sinal = '-' if valor < 0 and texto.strip('0.,') else ''
+    return f"{sinal}R$ {texto}"
+
+
+@lru_cache(maxsize=4096)
+def formatar_percentual(valor, casas=2):
+    """Fração 0.1234 como 12,34%; NaN como ''"""
+    if math.isnan(valor):
+        return ''
+    texto = f"{abs(valor):,.{casas}%}".translate(_PADRAO_BR)
+    sinal = '-' if valor < 0 and texto.strip('0.,%') else ''
+    return f"{sinal}{texto}"
+
+
+def _texto_decimal(valores, casas):
+    """Módulo dos valores com milhar em ponto e decimais em vírgula, mais a máscara de negativos"""
+    # rint sobre o float: igual ao format do Python para valores em centavos; só
+    # empates de meio centavo com mais casas que o pedido podem sair diferentes
+    unidades = np.rint(np.abs(np.nan_to_num(valores)) * 10 ** casas).astype('int64')
+
+    # todos os números são completados com zeros até a largura do maior,
+    # fatiados em grupos de três e depois perdem os zeros/pontos à esquerda
+    maior = int(unidades.max()) if len(unidades) else 0
+    grupos = max(1, -(-(len(str(maior)) - casas) // 3))
+    largura = 3 * grupos + casas
+    cheio = pc.utf8_lpad(pc.cast(pa.array(unidades), pa.string()), largura, '0')
+
+    partes = [pc.utf8_slice_codeunits(cheio, 3 * i, 3 * i + 3) for i in range(grupos)]
+    inteiro = pc.utf8_ltrim(pc.binary_join_element_wise(*partes, '.'), '0.')
+    inteiro = pc.if_else(pc.equal(pc.utf8_length(inteiro), 0), '0', inteiro)
+
+    texto = inteiro
+    if casas:
+        texto = pc.binary_join_element_wise(inteiro, pc.utf8_slice_codeunits(cheio, 3 * grupos, largura), ',')
+    negativo = (valores < 0) & (unidades > 0)
+    return texto, negativo
+
+
+def _fora_do_vetorizado(valores, casas):
+    """Máscara dos valores que _texto_decimal não representa: infinitos e grandes demais"""
+    with np.errstate(over='ignore', invalid='ignore'):
+        return np.abs(valores) * 10.0 ** casas >= LIMITE_VETORIZADO
+
+
+def _para_array(texto, valores, fora, formatar, casas):
+    """Textos do pyarrow como array do numpy: NaN vira '' e os valores fora do vetorizado usam formatar"""
+    saida = texto.to_numpy(zero_copy_only=False).copy()
+    saida[np.isnan(valores)] = ''
+    if fora.any():
+        saida[fora] = [formatar(v, casas) for v in valores[fora].tolist()]
+    return saida
+
+
+def formatar_moeda_serie(valores, casas=2):
+    """formatar_moeda para um array/Series inteiro; devolve um array de textos"""
+    valores = np.asarray(valores, dtype='float64')
+    if len(valores) < LIMITE_ESCALAR:
+        return np.array([formatar_moeda(v, casas) for v in valores.tolist()], dtype=object)
+    fora = _fora_do_vetorizado(valores, casas)
+    texto, negativo = _texto_decimal(np.where(fora, 0.0, valores), casas)
+    prefixo = pc.if_else(pa.array(negativo), '-R$ ', 'R$ ')
+    return _para_array(pc.binary_join_element_wise(prefixo, texto, ''), valores, fora, formatar_moeda, casas)
+
+
+def formatar_percentual_serie(valores, casas=2):
+    """formatar_percentual para um array/Series inteiro; devolve um array de textos"""
+    valores = np.asarray(valores, dtype='float64')
+    if len(valores) < LIMITE_ESCALAR:
+        return np.array([formatar_percentual(v, casas) for v in valores.tolist()], dtype=object)
+    # como no format '%' do Python: multiplica por 100 e formata com as casas pedidas
+    fora = _fora_do_vetorizado(valores * 100, casas)
+    texto, negativo = _texto_decimal(np.where(fora, 0.0, valores * 100), casas)
+    sinal = pc.if_else(pa.array(negativo), '-', '')
+    return _para_array(pc.binary_join_element_wise(sinal, texto, '%', ''), valores, fora, formatar_percentual, casas)
@@ -0,0 +1,197 @@
+"""Ingestão em lote de uma pasta de planilhas mensais (carga do histórico retroativo).
+
+Encontra na pasta os efetivo_*.xlsx (competência pelo nome do arquivo, como no
+atualizador do app) e os produtividade*.xlsx. Cada arquivo é lido e normalizado
+num processo do pool, com as mesmas funções do app (construir_efetivo e
+construir_produtividade, via snapshot); a leitura com openpyxl gasta CPU e,
+em threads, ficaria presa ao GIL. A consolidação fica no processo principal: os
+meses de efetivo entram no histórico pelo ingerir_competencia, um por vez, e as
+planilhas de produtividade viram um único Parquet no histórico, que o app junta à
+produtividade atual (carregar_produtividade).
+
+Um arquivo que falha é relatado e não impede os outros; o código de saída é 1
+se algum falhou. Meses já ingeridos com o mesmo arquivo não são relidos, então
+basta rodar de novo depois de corrigir o que falhou.
+
+Uso:
+    python ingestao.py exportacoes
+    python ingestao.py exportacoes --processos 4 --historico historico
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import NamedTuple
+import argparse
+import glob
+import os
+import sys
+import threading
+import time
+
+import pandas as pd
+
+import app2
+import medicao
+
+class Tarefa(NamedTuple):
+    caminho: str
+    tipo: str  # "efetivo" ou "produtividade"
+    competencia: str = None
+    origem: dict = None
+
+
+def listar_tarefas(pasta, manifesto):
+    """Arquivos a ler, em ordem de nome, e os ignorados com o motivo ({nome: motivo})"""
+    tarefas = []
+    # a mesma escolha do atualizador: um arquivo por competência
+    por_competencia, ignorados = app2.arquivos_por_competencia(pasta)
+    for competencia, caminho in por_competencia.items():
+        origem = app2.origem_pendente(manifesto, competencia, caminho)
+        if origem is None:
+            ignorados[os.path.basename(caminho)] = "já ingerido"
+        else:
+            tarefas.append(Tarefa(caminho, "efetivo", competencia, origem))
+
+    for caminho in sorted(glob.glob(os.path.join(pasta, "produtividade*.xlsx"))):
+        tarefas.append(Tarefa(caminho, "produtividade"))
+    return tarefas, ignorados
+
+
+def _iniciar_processo(pasta_snapshots):
+    """Prepara um processo do pool (com spawn/forkserver o módulo app2 é importado do zero)"""
+    medicao.modo_script()
+    app2.PASTA_SNAPSHOTS = pasta_snapshots
+
+
+def ler_arquivo(caminho, tipo):
+    """Lê e normaliza um arquivo (roda no processo do pool); devolve as abas e os segundos gastos"""
+    inicio = time.perf_counter()
+    construir = app2.construir_efetivo if tipo == "efetivo" else app2.construir_produtividade
+    abas = app2.carregar_snapshot(caminho, construir)
+    return abas, time.perf_counter() - inicio
+
+
+def _ler_em_processos(tarefas, processos):
+    """Gera (tarefa, abas, segundos, erro) à medida que os arquivos ficam prontos"""
+    if processos <= 1:
+        # um processo só: lê aqui mesmo e evita serializar os DataFrames de volta
+        for tarefa in tarefas:
+            try:
+                abas, segundos = ler_arquivo(tarefa.caminho, tarefa.tipo)
+            except Exception as e:
+                yield tarefa, None, None, e
+            else:
+                yield tarefa, abas, segundos, None
+        return
+
+    iniciar = {'initializer': _iniciar_processo, 'initargs': (app2.PASTA_SNAPSHOTS,)}
+    interrompidas = []
+    with ProcessPoolExecutor(min(processos, len(tarefas)) or 1, **iniciar) as pool:
+        futuros = {pool.submit(ler_arquivo, t.caminho, t.tipo): t for t in tarefas}
+        for futuro in as_completed(futuros):
+            try:
+                abas, segundos = futuro.result()
+            except BrokenProcessPool:
+                interrompidas.append(futuros[futuro])
+            except Exception as e:
+                yield futuros[futuro], None, None, e
+            else:
+                yield futuros[futuro], abas, segundos, None
+
+    # Um processo que morre (falta de memória, p.ex.) derruba o pool inteiro e não
+    # se sabe qual arquivo foi: cada pendente é refeito num processo só dele
+    for tarefa in sorted(interrompidas):
+        with ProcessPoolExecutor(1, **iniciar) as pool:
+            try:
+                abas, segundos = pool.submit(ler_arquivo, tarefa.caminho, tarefa.tipo).result()
+            except Exception as e:
+                yield tarefa, None, None, e
+            else:
+                yield tarefa, abas, segundos, None
+
+
+def consolidar_produtividade(frames, destino):
+    """Junta as planilhas de produtividade (em ordem de nome) ao Parquet consolidado; devolve o número de linhas.
+
+    Uma linha repetida (mesma CHAVE_PRODUTIVIDADE) fica com o valor do arquivo de
+    nome maior, e as planilhas desta carga prevalecem sobre o que já estava no Parquet.
+    """
+    if os.path.exists(destino):
+        frames = [pd.read_parquet(destino)] + list(frames)
+    df = pd.concat(frames, ignore_index=True)
+    df = df.drop_duplicates(subset=app2.CHAVE_PRODUTIVIDADE, keep='last')
+    df = app2._preparar_para_snapshot(df)
+    os.makedirs(os.path.dirname(destino) or ".", exist_ok=True)
+    app2._gravar_atomico(destino, lambda tmp: df.to_parquet(tmp, index=False))
+    return len(df)
+
+
+def ingerir_pasta(pasta, processos=None, destino_produtividade=None):
+    """Lê a pasta num pool de processos e consolida; devolve o resumo (ingeridos, ignorados e falhas)"""
+    processos = processos or os.cpu_count() or 1
+    destino_produtividade = destino_produtividade or os.path.join(app2.PASTA_HISTORICO, "produtividade.parquet")
+    manifesto = app2._ler_manifesto_historico()
+    # ninguém lê o histórico durante a carga, mas ingerir_competencia sinaliza a gravação
+    estado = {'gravando': False, 'geracao': 0, 'condicao': threading.Condition()}
+
+    tarefas, ignorados = listar_tarefas(pasta, manifesto)
+    for nome, motivo in ignorados.items():
+        print(f"-  {nome}: {motivo}", flush=True)
+    print(f"{len(tarefas)} arquivo(s) para ler com {min(processos, len(tarefas)) or 1} processo(s)", flush=True)
+
+    resumo = {'ingeridos': [], 'ignorados': ignorados, 'falhas': {}}
+    produtividade = {}
+    inicio = time.perf_counter()
+    leituras = _ler_em_processos(tarefas, processos)
+    for i, (tarefa, abas, segundos, erro) in enumerate(leituras, 1):
+        nome = os.path.basename(tarefa.caminho)
+        if erro is None and tarefa.tipo == "efetivo":
+            try:
+                manifesto = app2.ingerir_competencia(abas, tarefa.origem, tarefa.competencia, manifesto, estado)
+            except Exception as e:
+                erro = e
+        elif erro is None:
+            produtividade[tarefa.caminho] = abas["PRODUTIVIDADE"]
+
+        if erro is None:
+            resumo['ingeridos'].append(nome)
+            linhas = sum(len(df) for df in abas.values())
+            print(f"[{i}/{len(tarefas)}] {nome}: {linhas} linhas em {segundos:.1f} s", flush=True)
+        else:
+            resumo['falhas'][nome] = f"{type(erro).__name__}: {erro}"
+            print(f"[{i}/{len(tarefas)}] {nome}: FALHOU ({resumo['falhas'][nome]})", flush=True)
+
+    if produtividade:
+        try:
+            linhas = consolidar_produtividade([produtividade[c] for c in sorted(produtividade)], destino_produtividade)
+            print(f"Produtividade consolidada: {linhas} linhas em {destino_produtividade}", flush=True)
+        except Exception as e:
+            resumo['falhas'][os.path.basename(destino_produtividade)] = f"{type(e).__name__}: {e}"
+            print(f"Produtividade: FALHOU ({type(e).__name__}: {e})", flush=True)
+
+    print(
+        f"{len(resumo['ingeridos'])} ingerido(s), {len(ignorados)} ignorado(s), {len(resumo['falhas'])} falha(s) "
+        f"em {time.perf_counter() - inicio:.1f} s",
+        flush=True
+    )
+    return resumo
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pasta", help="pasta com os efetivo_*.xlsx e produtividade*.xlsx")
+    parser.add_argument("--processos", type=int, help="processos de leitura (padrão: número de CPUs)")
+    parser.add_argument("--historico", default=app2.PASTA_HISTORICO, help="pasta do histórico Parquet")
+    parser.add_argument("--snapshots", default=app2.PASTA_SNAPSHOTS, help="pasta dos snapshots Feather")
+    parser.add_argument("--produtividade", help="Parquet consolidado (padrão: produtividade.parquet no histórico)")
+    args = parser.parse_args(argv)
+
+    medicao.modo_script()
+    app2.PASTA_HISTORICO = args.historico
+    app2.PASTA_SNAPSHOTS = args.snapshots
+
+    resumo = ingerir_pasta(args.pasta, args.processos, args.produtividade)
+    return 1 if resumo['falhas'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,244 @@
+"""Medição por etapa de cada execução do app: tempo, linhas e pico de memória.
+
+Uma etapa aberta sem outra em andamento na mesma thread é a raiz: as etapas
+abertas dentro dela (carregadores, filtros, montagem de gráficos) ficam
+registradas na raiz, e ao fim da raiz a execução inteira vira uma linha do log
+JSONL. O log é rotativo: passando do limite, o arquivo atual vira ".1" (o ".1"
+anterior é descartado), e o resumo (p50/p95 por etapa) lê os dois. O resumo
+guarda o que já leu e, a cada chamada, só lê as linhas acrescentadas depois.
+
+O pico de memória usa o tracemalloc, que deixa as alocações bem mais lentas e
+vale para o processo inteiro (todas as sessões); por isso só é medido depois
+de medir_memoria(True). Sem ele, pico_bytes fica None.
+"""
+from contextlib import contextmanager
+from functools import wraps
+from datetime import datetime
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+
+ARQUIVO_LOG = "medicoes.jsonl"
+LIMITE_LOG = 5 * 1024 * 1024  # bytes do arquivo atual antes de rodar para ".1"
+
+_local = threading.local()
+_trava_log = threading.Lock()
+
+
+def configurar(arquivo=None, limite_bytes=None):
+    """Troca o arquivo e/ou o limite do log (p.ex. para testes e para o benchmark)"""
+    global ARQUIVO_LOG, LIMITE_LOG
+    if arquivo is not None:
+        ARQUIVO_LOG = arquivo
+    if limite_bytes is not None:
+        LIMITE_LOG = limite_bytes
+
+
+def modo_script():
+    """Prepara o uso do app2 fora do `streamlit run` (benchmark, ingestão em lote e seus processos)"""
+    # sem o runtime do Streamlit os caches avisam a cada chamada que ele não existe
+    logging.disable(logging.WARNING)
+    # as etapas que o app mede não entram no log de uso real (medicoes.jsonl)
+    configurar(arquivo=os.devnull)
+
+
+def medir_memoria(ativo):
+    """Liga/desliga o tracemalloc do processo (medição do pico de memória por etapa)"""
+    if ativo and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not ativo and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def medindo_memoria():
+    return tracemalloc.is_tracing()
+
+
+def _pilha():
+    if not hasattr(_local, "pilha"):
+        _local.pilha = []
+    return _local.pilha
+
+
+@contextmanager
+def etapa(nome, linhas=None):
+    """Mede o bloco; devolve o registro, onde quem mede pode preencher 'linhas' depois.
+
+    Na raiz, o registro também traz 'etapas': ela e todas as etapas internas, em
+    ordem de início, com o 'nivel' de aninhamento.
+    """
+    pilha = _pilha()
+    registro = {'etapa': nome, 'nivel': len(pilha), 'segundos': None, 'linhas': linhas, 'pico_bytes': None}
+    raiz = pilha[0] if pilha else registro
+    if not pilha:
+        registro['etapas'] = []
+    raiz['etapas'].append(registro)
+
+    memoria = tracemalloc.is_tracing()
+    if memoria:
+        atual, pico = tracemalloc.get_traced_memory()
+        # o pico até aqui pertence à etapa de fora; a de dentro começa do zero
+        if pilha:
+            pilha[-1]['_pico'] = max(pilha[-1].get('_pico', 0), pico)
+        tracemalloc.reset_peak()
+        registro['_base'] = atual
+
+    pilha.append(registro)
+    inicio = time.perf_counter()
+    try:
+        yield registro
+    finally:
+        registro['segundos'] = time.perf_counter() - inicio
+        pilha.pop()
+        if memoria and tracemalloc.is_tracing():
+            pico = max(registro.pop('_pico', 0), tracemalloc.get_traced_memory()[1])
+            registro['pico_bytes'] = max(0, pico - registro.pop('_base'))
+            if pilha:
+                pilha[-1]['_pico'] = max(pilha[-1].get('_pico', 0), pico)
+        registro.pop('_pico', None)
+        registro.pop('_base', None)
+        if not pilha:
+            _gravar(registro)
+
+
+def _contar_linhas(valores):
+    """Linhas do primeiro DataFrame/Series encontrado (argumentos ou resultado)"""
+    for valor in valores:
+        if isinstance(valor, (pd.DataFrame, pd.Series)):
+            return len(valor)
+        if isinstance(valor, tuple) and valor and isinstance(valor[0], (pd.DataFrame, pd.Series)):
+            return len(valor[0])
+    return None
+
+
+def medido(funcao=None, *, nome=None):
+    """Decorador: cada chamada da função é uma etapa (nome da função, linhas da entrada ou do resultado)"""
+    def decorar(funcao):
+        rotulo = nome or funcao.__name__
+
+        @wraps(funcao)
+        def medida(*args, **kwargs):
+            with etapa(rotulo) as registro:
+                resultado = funcao(*args, **kwargs)
+                registro['linhas'] = _contar_linhas(list(args) + list(kwargs.values()) + [resultado])
+            return resultado
+        return medida
+    return decorar(funcao) if funcao is not None else decorar
+
+
+def _gravar(raiz):
+    """Acrescenta a execução ao log; passando do limite, o arquivo atual vira o ".1" """
+    linha = json.dumps({
+        'em': datetime.now().isoformat(timespec="seconds"),
+        'raiz': raiz['etapa'],
+        'etapas': [{k: v for k, v in r.items() if k != 'etapas'} for r in raiz['etapas']]
+    }, ensure_ascii=False)
+    try:
+        with _trava_log:
+            if os.path.exists(ARQUIVO_LOG) and os.path.getsize(ARQUIVO_LOG) > LIMITE_LOG:
+                os.replace(ARQUIVO_LOG, f"{ARQUIVO_LOG}.1")
+            with open(ARQUIVO_LOG, "a", encoding="utf-8") as f:
+                f.write(linha + "\n")
+    except OSError:
+        # o log é só diagnóstico: falhar ao gravar não pode derrubar a página
+        pass
+
+
+# Leitura incremental do log para o resumo: por arquivo (identificado pelo inode,
+# que o ".1" herda na rotação), os bytes já lidos e as etapas deles
+_leituras = {}
+_trava_resumo = threading.Lock()
+_resumo = {'chave': None, 'tabela': None}
+COLUNAS_RESUMO = ['Etapa', 'Execuções', 'p50 (ms)', 'p95 (ms)', 'Linhas (p50)', 'Pico MB (p95)']
+CAMPOS_ETAPA = ['etapa', 'segundos', 'linhas', 'pico_bytes']
+
+
+def _ler_novas_etapas(arquivo, leitura):
+    """Acrescenta à leitura as etapas das linhas completas gravadas desde a última vez"""
+    with open(arquivo, "rb") as f:
+        f.seek(leitura['posicao'])
+        dados = f.read()
+    # uma linha sem o "\n" final ainda está sendo gravada: fica para a próxima leitura
+    fim = dados.rfind(b"\n") + 1
+    registros = []
+    for linha in dados[:fim].splitlines():
+        try:
+            registros.extend(json.loads(linha)['etapas'])
+        except (ValueError, KeyError):
+            continue  # linha cortada (gravação interrompida)
+    if registros:
+        novas = pd.DataFrame([[r.get(c) for c in CAMPOS_ETAPA] for r in registros], columns=CAMPOS_ETAPA)
+        for col in ('segundos', 'linhas', 'pico_bytes'):
+            novas[col] = pd.to_numeric(novas[col], errors='coerce')
+        anteriores = leitura['etapas']
+        leitura['etapas'] = novas if anteriores is None else pd.concat([anteriores, novas], ignore_index=True)
+    leitura['posicao'] += fim
+
+
+def _inicio(arquivo):
+    with open(arquivo, "rb") as f:
+        return f.read(256)
+
+
+def _atualizar_leituras():
+    """Lê só o que foi acrescentado ao log; um arquivo novo ou trocado é lido do começo"""
+    atuais = {}
+    for arquivo in (f"{ARQUIVO_LOG}.1", ARQUIVO_LOG):
+        try:
+            info = os.stat(arquivo)
+        except FileNotFoundError:
+            continue
+        identidade = (info.st_dev, info.st_ino)
+        leitura = _leituras.get(identidade)
+        # o inode de um arquivo descartado pode ser reaproveitado: o começo do arquivo confirma
+        inicio = _inicio(arquivo)
+        if leitura is None or info.st_size < leitura['posicao'] or inicio != leitura['inicio']:
+            leitura = {'posicao': 0, 'inicio': inicio, 'etapas': None}
+        if info.st_size > leitura['posicao']:
+            _ler_novas_etapas(arquivo, leitura)
+        atuais[identidade] = leitura
+    _leituras.clear()
+    _leituras.update(atuais)
+    return atuais
+
+
+def _resumir(etapas):
+    if etapas is None:
+        return pd.DataFrame(columns=COLUNAS_RESUMO)
+    grupos = etapas.groupby('etapa', sort=False)
+    resumo = pd.DataFrame({
+        'Execuções': grupos.size(),
+        'p50 (ms)': grupos['segundos'].quantile(0.5) * 1000,
+        'p95 (ms)': grupos['segundos'].quantile(0.95) * 1000,
+        'Linhas (p50)': grupos['linhas'].median(),
+        'Pico MB (p95)': grupos['pico_bytes'].quantile(0.95) / 2**20
+    }).round(1)
+    resumo = resumo.rename_axis('Etapa').reset_index()
+    return resumo.sort_values('p95 (ms)', ascending=False, ignore_index=True)[COLUNAS_RESUMO]
+
+
+def resumo_log():
+    """p50/p95 de tempo, linhas e pico de memória por etapa, em todo o log (atual + ".1")"""
+    with _trava_resumo:
+        leituras = _atualizar_leituras()
+        chave = tuple((identidade, leitura['posicao']) for identidade, leitura in leituras.items())
+        if chave != _resumo['chave']:
+            etapas = [leitura['etapas'] for leitura in leituras.values() if leitura['etapas'] is not None]
+            _resumo['tabela'] = _resumir(pd.concat(etapas, ignore_index=True) if etapas else None)
+            _resumo['chave'] = chave
+        return _resumo['tabela']
+
+
+def tabela_execucao(raiz):
+    """Etapas de uma execução (registro raiz) como tabela, com a etapa recuada pelo nível"""
+    return pd.DataFrame({
+        'Etapa': ['\u2003' * r['nivel'] + r['etapa'] for r in raiz['etapas']],
+        'ms': [round(r['segundos'] * 1000, 1) if r['segundos'] is not None else None for r in raiz['etapas']],
+        'Linhas': [r['linhas'] for r in raiz['etapas']],
+        'Pico MB': [round(r['pico_bytes'] / 2**20, 2) if r['pico_bytes'] is not None else None for r in raiz['etapas']]
+    })
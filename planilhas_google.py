@@ -0,0 +1,136 @@
+"""Leitura de planilhas do Google Sheets (gspread), com um substituto local para testes.
+
+Há um cliente autorizado por processo. Cada leitura baixa todas as abas pedidas
+numa única chamada values_batch_get. A data de modificação no Drive
+(lastUpdateTime) diz se a planilha mudou; planilha igual não é baixada de novo.
+O ClienteLocal imita a parte da API usada aqui lendo arquivos .xlsx de uma
+pasta, para rodar o painel e os testes sem rede nem credenciais.
+"""
+from datetime import datetime, timezone
+from functools import lru_cache
+import os
+
+from openpyxl import load_workbook
+
+# Números como números e datas como o texto exibido na planilha (dd/mm/aaaa em pt-BR)
+PARAMETROS_LEITURA = {
+    'valueRenderOption': 'UNFORMATTED_VALUE',
+    'dateTimeRenderOption': 'FORMATTED_STRING'
+}
+
+
+@lru_cache(maxsize=None)
+def cliente(credenciais=None, pasta_local=None):
+    """Cliente único do processo: o local, se pasta_local for dada, ou o do Google (conta de serviço)"""
+    if pasta_local:
+        return ClienteLocal(pasta_local)
+    # gspread só é importado por quem de fato lê do Google Sheets
+    import gspread
+    return gspread.service_account(filename=credenciais)
+
+
+@lru_cache(maxsize=None)
+def abrir_planilha(cliente, chave):
+    """Abre a planilha uma vez por processo (o open_by_key já busca os metadados)"""
+    return cliente.open_by_key(chave)
+
+
+def revisao(planilha):
+    """Momento da última alteração da planilha segundo o Drive; muda a cada edição"""
+    return planilha.get_lastUpdateTime()
+
+
+def _intervalo(titulo):
+    """Aba inteira em notação A1 ('Nome da aba', com aspas simples escapadas)"""
+    return "'" + titulo.replace("'", "''") + "'"
+
+
+def ler_abas(planilha, abas):
+    """Baixa as abas (nome ou índice) numa única requisição; devolve {aba: linhas} como vêm da API"""
+    titulos = [planilha.get_worksheet(aba).title if isinstance(aba, int) else aba for aba in abas]
+    resposta = planilha.values_batch_get([_intervalo(t) for t in titulos], params=PARAMETROS_LEITURA)
+    return {aba: faixa.get('values', []) for aba, faixa in zip(abas, resposta['valueRanges'])}
+
+
+# ======================================
+# SUBSTITUTO LOCAL
+# ======================================
+
+def _valor_api(valor):
+    """Converte uma célula do openpyxl no que a API devolveria com PARAMETROS_LEITURA"""
+    if valor is None:
+        return ""
+    if isinstance(valor, datetime):
+        if (valor.hour, valor.minute, valor.second) == (0, 0, 0):
+            return valor.strftime('%d/%m/%Y')
+        return valor.strftime('%d/%m/%Y %H:%M:%S')
+    return valor
+
+
+def _linhas_api(ws):
+    """Linhas como a API devolve: sem células vazias no fim de cada linha nem linhas vazias no fim"""
+    linhas = []
+    for linha in ws.iter_rows(values_only=True):
+        valores = [_valor_api(v) for v in linha]
+        while valores and valores[-1] == "":
+            valores.pop()
+        linhas.append(valores)
+    while linhas and not linhas[-1]:
+        linhas.pop()
+    return linhas
+
+
+class ClienteLocal:
+    """Substituto do gspread.Client: a chave da planilha é o nome de um .xlsx da pasta, sem extensão"""
+
+    def __init__(self, pasta):
+        self.pasta = pasta
+
+    def open_by_key(self, chave):
+        caminho = os.path.join(self.pasta, f"{chave}.xlsx")
+        if not os.path.exists(caminho):
+            raise FileNotFoundError(f"Planilha '{chave}' não encontrada em {self.pasta}")
+        return PlanilhaLocal(chave, caminho)
+
+
+class PlanilhaLocal:
+    """Substituto do gspread.Spreadsheet; conta as leituras para conferir que são em lote"""
+
+    def __init__(self, chave, caminho):
+        self.id = chave
+        self.title = chave
+        self.caminho = caminho
+        self.leituras = 0
+
+    def get_lastUpdateTime(self):
+        # mesmo formato do modifiedTime do Drive: 2025-04-30T12:00:00.000Z
+        modificado = datetime.fromtimestamp(os.stat(self.caminho).st_mtime, tz=timezone.utc)
+        return modificado.isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+    def get_worksheet(self, indice):
+        wb = load_workbook(self.caminho, read_only=True)
+        try:
+            return _AbaLocal(wb.worksheets[indice].title)
+        finally:
+            wb.close()
+
+    def values_batch_get(self, ranges, params=None):
+        self.leituras += 1
+        wb = load_workbook(self.caminho, read_only=True, data_only=True)
+        try:
+            faixas = []
+            for intervalo in ranges:
+                titulo = intervalo[1:-1].replace("''", "'") if intervalo.startswith("'") else intervalo
+                faixas.append({
+                    'range': intervalo,
+                    'majorDimension': 'ROWS',
+                    'values': _linhas_api(wb[titulo])
+                })
+            return {'spreadsheetId': self.id, 'valueRanges': faixas}
+        finally:
+            wb.close()
+
+
+class _AbaLocal:
+    def __init__(self, title):
+        self.title = title
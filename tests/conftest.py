@@ -0,0 +1,29 @@
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app2  # noqa: E402
+import medicao  # noqa: E402
+
+medicao.modo_script()
+
+
+@pytest.fixture
+def historico(tmp_path, monkeypatch):
+    """Histórico, snapshots e planilhas numa pasta temporária"""
+    monkeypatch.setattr(app2, "PASTA_HISTORICO", str(tmp_path / "historico"))
+    monkeypatch.setattr(app2, "PASTA_SNAPSHOTS", str(tmp_path / ".snapshots"))
+    monkeypatch.setattr(app2, "PASTA_DADOS", str(tmp_path))
+    app2._estado_dados.clear()
+    yield tmp_path
+    app2._estado_dados.clear()
+
+
+@pytest.fixture
+def estado():
+    """Sinalização de gravação do histórico, como a do _estado_dados"""
+    return {'gravando': False, 'geracao': 0, 'condicao': threading.Condition()}
@@ -0,0 +1,68 @@
+import os
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+import app2
+
+PLANILHA_EXEMPLO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "efetivo_abril.xlsx")
+
+CABECALHO = (
+    'Obra ', 'Nome do Funcionário', 'Tipo', 'Remuneração Líquida Folha', 'Adiantamento',
+    'Hora Extra 100%', 'Demissão', 'Código', None
+)
+
+
+def linhas_efetivo():
+    """Aba EFETIVO com o que a planilha real tem: linhas vazias e sem obra, colunas mistas e datas raras"""
+    linhas = [CABECALHO]
+    for i in range(40):
+        obra = None if i % 9 == 4 else f"OBRA {i % 3}"
+        demissao = datetime(2025, 4, i % 28 + 1) if i in (31, 35) else None
+        codigo = None if i in (5, 25) else f"{i:06d}" if i < 20 else i
+        folha = '1500' if i == 7 else 1000.0 + i
+        linhas.append((obra, f"FUNC {i}", "DIRETO" if i % 2 else "INDIRETO", folha, None, i % 4 or None, demissao, codigo, None))
+        if i % 13 == 0:
+            linhas.append((None,) * len(CABECALHO))
+    linhas.append((None, None, None, None, None, None, None, None, None, 'sobra'))
+    return linhas
+
+
+@pytest.mark.parametrize('linhas_por_bloco', [1, 7, 1000])
+def test_blocos_igual_a_aba_inteira(linhas_por_bloco):
+    esperado = app2.normalizar_efetivo(app2._frame_de_linhas(linhas_efetivo()))
+
+    obtido = app2.normalizar_efetivo_em_blocos(linhas_efetivo(), linhas_por_bloco=linhas_por_bloco)
+
+    pd.testing.assert_frame_equal(obtido, esperado)
+
+
+def test_blocos_com_colunas_escolhidas():
+    colunas = ['Obra', 'Nome do Funcionário', 'Remuneração Líquida Folha', 'Adiantamento', 'Demissão']
+    posicoes = [i for i, nome in enumerate(CABECALHO) if nome and nome.strip() in colunas]
+    esperado = app2.normalizar_efetivo(app2._frame_de_linhas([[linha[i] for i in posicoes] for linha in linhas_efetivo()]))
+
+    obtido = app2.normalizar_efetivo_em_blocos(linhas_efetivo(), colunas=colunas, linhas_por_bloco=7)
+
+    pd.testing.assert_frame_equal(obtido, esperado)
+
+
+def test_blocos_so_com_cabecalho():
+    esperado = app2.normalizar_efetivo(app2._frame_de_linhas([CABECALHO]))
+
+    obtido = app2.normalizar_efetivo_em_blocos([CABECALHO], linhas_por_bloco=7)
+
+    pd.testing.assert_frame_equal(obtido, esperado)
+
+
+def test_planilha_exemplo_em_blocos():
+    wb = load_workbook(PLANILHA_EXEMPLO, read_only=True, data_only=True)
+    try:
+        esperado = app2.normalizar_efetivo(app2._frame_de_linhas(wb["EFETIVO"].iter_rows(values_only=True)))
+        obtido = app2.normalizar_efetivo_em_blocos(wb["EFETIVO"].iter_rows(values_only=True), linhas_por_bloco=100)
+    finally:
+        wb.close()
+
+    pd.testing.assert_frame_equal(obtido, esperado)
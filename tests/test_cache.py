@@ -0,0 +1,33 @@
+import benchmark
+
+import app2
+
+
+def test_conjunto_e_filtro_de_todas_as_obras_cabem_juntos_no_cache(historico):
+    obras = [f"OBRA {i:02d}" for i in range(60)]
+    departamentos = [f"DEPARTAMENTO {i:02d}" for i in range(8)]
+    competencias = tuple(benchmark.competencias_ate("2025-04", 12))
+    estado = app2._estado_dados()
+    manifesto = {"competencias": {}}
+    for competencia in competencias:
+        abas = app2.normalizar_abas_efetivo({
+            "EFETIVO": benchmark.gerar_efetivo(30000, obras, departamentos, competencia),
+            "TERCEIROS": benchmark.gerar_terceiros(obras, competencia)
+        })
+        manifesto = app2.ingerir_competencia(abas, {"arquivo": competencia}, competencia, manifesto, estado)
+    estado['manifesto'] = manifesto
+    app2._cache_resultados.clear()
+    app2._carregar_conjunto_efetivo.clear()
+
+    obras_conjunto = app2.carregar_efetivo_obras(competencias)
+    filtros = app2.filtros_painel("efetivo", app2.versao_historico(competencias), obras=obras_conjunto['obras'], tipo='Todos')
+    filtrado = app2.resultado_em_cache(
+        "efetivo_filtrado", filtros, lambda: app2.filtrar_efetivo(obras_conjunto, obras_conjunto['obras'], 'Todos')
+    )
+
+    assert len(filtrado) > 300000
+    itens = app2._cache_resultados()['itens']
+    assert {chave[0] for chave in itens} == {"efetivo_conjunto", "efetivo_filtrado"}
+    assert sum(tamanho for _, tamanho in itens.values()) <= app2.LIMITE_CACHE_RESULTADOS
+    app2._cache_resultados.clear()
+    app2._carregar_conjunto_efetivo.clear()
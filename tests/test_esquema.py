@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+import app2
+
+
+def efetivo_dois_meses():
+    """Dois meses já juntos, cada um com os nomes de coluna da própria planilha"""
+    marco = pd.DataFrame({
+        'Nome do Funcionário': ['ANA', 'BIA'], 'Obra': ['OBRA A', 'OBRA B'], 'Tipo': ['DIRETO', 'INDIRETO'],
+        'Funçao': ['PEDREIRO', 'ENGENHEIRA'], 'GENÊRO': [' f', 'Femino'], 'PRODUÇÃO': ['n/d', 300],
+        'Remuneração Líquida Folha': [1000.0, None], 'Competência': ['2025-03', '2025-03']
+    })
+    abril = pd.DataFrame({
+        'Nome do Funcionário': ['ANA', 'CAU'], 'Obra': ['OBRA A', 'OBRA A'], 'Tipo': ['DIRETO', 'DIRETO'],
+        'Função': ['PEDREIRO', None], 'GÊNERO': ['F', 'masc '], 'PRODUÇÃO': [150.0, None],
+        'Remuneração Líquida Folha': [1100.0, 900.0], 'Competência': ['2025-04', '2025-04'], 'Matrícula': [1, 2]
+    })
+    return pd.concat([marco, abril], ignore_index=True)
+
+
+def test_apelidos_viram_a_coluna_canonica():
+    df = app2.aplicar_esquema(efetivo_dois_meses(), app2.ESQUEMA_EFETIVO)
+
+    assert 'Funçao' not in df.columns and 'GENÊRO' not in df.columns and 'GÊNERO' not in df.columns
+    assert df['Função'].tolist()[:3] == ['PEDREIRO', 'ENGENHEIRA', 'PEDREIRO']
+    assert pd.isna(df['Função'].iloc[3])
+    assert df['Gênero'].tolist() == ['FEMININO', 'FEMININO', 'FEMININO', 'MASCULINO']
+
+
+def test_tipos_e_padroes():
+    df = app2.aplicar_esquema(efetivo_dois_meses(), app2.ESQUEMA_EFETIVO)
+
+    for col in ('Obra', 'Tipo', 'Função', 'Gênero', 'Competência'):
+        assert isinstance(df[col].dtype, pd.CategoricalDtype), col
+    # texto que não é número vira NaN; sem padrão, o vazio continua vazio
+    assert df['PRODUÇÃO'].dtype == 'float64'
+    np.testing.assert_array_equal(df['PRODUÇÃO'].to_numpy(), [np.nan, 300, 150, np.nan])
+    # com padrão, o vazio e a coluna ausente viram 0
+    assert df['Remuneração Líquida Folha'].tolist() == [1000, 0, 1100, 900]
+    assert (df[app2.COLUNAS_EXTRA] == 0).all().all()
+    assert (df[app2.COLUNAS_EXTRA].dtypes == 'float64').all()
+
+
+def test_colunas_fora_do_esquema_ficam_como_estao():
+    df = app2.aplicar_esquema(efetivo_dois_meses(), app2.ESQUEMA_EFETIVO)
+
+    # ausente e sem padrão: não é criada
+    assert 'Departamento' not in df.columns
+    assert 'REFLEXO S PRODUÇÃO' not in df.columns
+    assert df['Matrícula'].tolist()[2:] == [1, 2]
+    assert df['Nome do Funcionário'].tolist() == ['ANA', 'BIA', 'ANA', 'CAU']
+
+
+def test_esquema_terceiros():
+    terceiros = pd.DataFrame({
+        'Obra': ['OBRA A', 'OBRA B'], 'EMPRESA': ['X', 'Y'], 'QUANTIDADE': [3, None], 'Competência': ['2025-04'] * 2
+    })
+
+    df = app2.aplicar_esquema(terceiros, app2.ESQUEMA_TERCEIROS)
+
+    assert df['QUANTIDADE'].dtype == 'int64'
+    assert df['QUANTIDADE'].tolist() == [3, 0]
+    assert isinstance(df['EMPRESA'].dtype, pd.CategoricalDtype)
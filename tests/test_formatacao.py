@@ -0,0 +1,50 @@
+import math
+
+import numpy as np
+import pytest
+
+from formatacao import (
+    LIMITE_ESCALAR, formatar_moeda, formatar_moeda_serie, formatar_percentual, formatar_percentual_serie
+)
+
+
+def test_formatar_moeda():
+    assert formatar_moeda(1234.5) == 'R$ 1.234,50'
+    assert formatar_moeda(-1234567.891) == '-R$ 1.234.567,89'
+    assert formatar_moeda(0.5, casas=0) == 'R$ 0'
+    assert formatar_moeda(-0.004) == 'R$ 0,00'
+    assert formatar_moeda(math.nan) == ''
+
+
+def test_formatar_percentual():
+    assert formatar_percentual(0.1234) == '12,34%'
+    assert formatar_percentual(-12.5, casas=1) == '-1.250,0%'
+    assert formatar_percentual(-0.00001) == '0,00%'
+    assert formatar_percentual(math.nan) == ''
+
+
+@pytest.mark.parametrize('casas', [0, 2, 4])
+@pytest.mark.parametrize('escalar, serie', [
+    (formatar_moeda, formatar_moeda_serie),
+    (formatar_percentual, formatar_percentual_serie)
+])
+def test_serie_igual_a_escalar(escalar, serie, casas):
+    rng = np.random.default_rng(0)
+    valores = np.concatenate([
+        rng.normal(0, 1e6, 2000),
+        10 ** rng.uniform(-3, 20, 2000) * rng.choice([-1, 1], 2000),
+        [0.0, -0.0, -0.004, 0.006, math.nan, math.inf, -math.inf, 9.3e16, 1e300]
+    ])
+
+    assert serie(valores, casas).tolist() == [escalar(v, casas) for v in valores.tolist()]
+
+
+def test_serie_com_infinito_e_valor_grande():
+    assert formatar_moeda_serie([math.inf] * LIMITE_ESCALAR)[0] == 'R$ inf'
+    assert formatar_moeda_serie([-1e17] * LIMITE_ESCALAR)[0] == '-R$ 100.000.000.000.000.000,00'
+    assert formatar_percentual_serie([-math.inf] * LIMITE_ESCALAR)[0] == '-inf%'
+
+
+def test_serie_curta_e_vazia():
+    assert formatar_moeda_serie([1.5, math.nan]).tolist() == ['R$ 1,50', '']
+    assert formatar_percentual_serie([]).tolist() == []
@@ -0,0 +1,180 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+import app2
+
+PLANILHA_EXEMPLO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "efetivo_abril.xlsx")
+
+
+def efetivo(*linhas):
+    """EFETIVO normalizado com linhas (nome, obra, tipo, folha)"""
+    nomes, obras, tipos, folha = zip(*linhas) if linhas else ((), (), (), ())
+    df = pd.DataFrame({
+        'Nome do Funcionário': list(nomes), 'Obra': list(obras), 'Tipo': list(tipos),
+        'Remuneração Líquida Folha': list(folha)
+    })
+    df['Remuneração Líquida Folha'] = df['Remuneração Líquida Folha'].astype(float)
+    for col in ['Adiantamento'] + app2.COLUNAS_EXTRA:
+        df[col] = 0.0
+    return df
+
+
+def terceiros(*linhas):
+    """TERCEIROS normalizado com linhas (obra, empresa, quantidade)"""
+    obras, empresas, quantidades = zip(*linhas) if linhas else ((), (), ())
+    return pd.DataFrame({
+        'Obra': list(obras), 'EMPRESA': list(empresas), 'QUANTIDADE': pd.array(quantidades, dtype='int64')
+    })
+
+
+def agregados(competencia):
+    return app2._ler_particao("AGREGADOS", competencia).set_index('Obra')
+
+
+def test_comparar_versoes_separa_inseridas_atualizadas_e_removidas():
+    antigo = efetivo(("ANA", "OBRA A", "DIRETO", 100), ("BIA", "OBRA A", "DIRETO", 200), ("CAU", "OBRA B", "INDIRETO", 300))
+    novo = efetivo(("ANA", "OBRA A", "DIRETO", 100), ("BIA", "OBRA A", "DIRETO", 250), ("DEO", "OBRA B", "DIRETO", 400))
+
+    inseridas, atualizadas, removidas = app2.comparar_versoes(antigo, novo, app2.CHAVES_HISTORICO["EFETIVO"])
+
+    assert list(inseridas.index) == [("DEO", "OBRA B", 0)]
+    assert list(atualizadas.index) == [("BIA", "OBRA A", 0)]
+    assert atualizadas['Remuneração Líquida Folha'].tolist() == [250]
+    assert list(removidas.index) == [("CAU", "OBRA B", 0)]
+
+
+def test_comparar_versoes_casa_linhas_repetidas_pela_ocorrencia():
+    antigo = efetivo(("ANA", "OBRA A", "DIRETO", 100), ("ANA", "OBRA A", "DIRETO", 50))
+    novo = efetivo(("ANA", "OBRA A", "DIRETO", 100), ("ANA", "OBRA A", "DIRETO", 60), ("ANA", "OBRA A", "DIRETO", 10))
+
+    inseridas, atualizadas, removidas = app2.comparar_versoes(antigo, novo, app2.CHAVES_HISTORICO["EFETIVO"])
+
+    assert list(inseridas.index) == [("ANA", "OBRA A", 2)]
+    assert list(atualizadas.index) == [("ANA", "OBRA A", 1)]
+    assert removidas.empty
+
+
+def test_comparar_versoes_trata_vazio_igual_a_vazio():
+    antigo = efetivo(("ANA", "OBRA A", "DIRETO", 100))
+    antigo['Demissão'] = np.nan
+    novo = antigo.copy()
+    novo['Demissão'] = None
+
+    mudancas = app2.comparar_versoes(antigo, novo, app2.CHAVES_HISTORICO["EFETIVO"])
+
+    assert all(m.empty for m in mudancas)
+
+
+def test_ingerir_competencia_grava_particoes_e_agregados(historico, estado):
+    manifesto = {"competencias": {}}
+    for competencia, folha in (("2025-03", 100), ("2025-04", 150)):
+        abas = {
+            "EFETIVO": efetivo(("ANA", "OBRA A", "DIRETO", folha), ("BIA", "OBRA B", "INDIRETO", 200)),
+            "TERCEIROS": terceiros(("OBRA A", "EMPRESA X", 3))
+        }
+        manifesto = app2.ingerir_competencia(abas, {"arquivo": f"efetivo_{competencia}.xlsx"}, competencia, manifesto, estado)
+
+    assert sorted(manifesto["competencias"]) == ["2025-03", "2025-04"]
+    assert manifesto["competencias"]["2025-04"]["revisao"] == 1
+    df = app2.ler_historico("EFETIVO", ("2025-03", "2025-04"))
+    assert df.groupby('Competência')['Remuneração Líquida Folha'].sum().to_dict() == {"2025-03": 300, "2025-04": 350}
+    agregado = agregados("2025-04")
+    assert agregado.loc["OBRA A", ["Efetivo", "folha", "Terceiros"]].tolist() == [1, 150, 3]
+    assert agregado.loc["OBRA B", ["Efetivo", "folha", "Terceiros"]].tolist() == [1, 200, 0]
+
+
+def test_reingerir_sem_mudanca_mantem_a_revisao(historico, estado):
+    abas = {"EFETIVO": efetivo(("ANA", "OBRA A", "DIRETO", 100)), "TERCEIROS": terceiros(("OBRA A", "EMPRESA X", 3))}
+    manifesto = app2.ingerir_competencia(abas, {"arquivo": "a.xlsx"}, "2025-04", {"competencias": {}}, estado)
+    caminho = app2._caminho_particao("EFETIVO", "2025-04")
+    gravado_em = os.stat(caminho).st_mtime_ns
+
+    manifesto = app2.ingerir_competencia(abas, {"arquivo": "b.xlsx"}, "2025-04", manifesto, estado)
+
+    registro = manifesto["competencias"]["2025-04"]
+    assert (registro["revisao"], registro["obras_afetadas"], registro["arquivo"]) == (1, [], "b.xlsx")
+    assert os.stat(caminho).st_mtime_ns == gravado_em
+
+
+def test_reingerir_com_mudanca_recalcula_so_a_obra_afetada(historico, estado):
+    abas = {
+        "EFETIVO": efetivo(("ANA", "OBRA A", "DIRETO", 100), ("BIA", "OBRA B", "DIRETO", 200)),
+        "TERCEIROS": terceiros(("OBRA A", "EMPRESA X", 3))
+    }
+    manifesto = app2.ingerir_competencia(abas, {"arquivo": "a.xlsx"}, "2025-04", {"competencias": {}}, estado)
+    abas["EFETIVO"] = efetivo(("ANA", "OBRA A", "DIRETO", 100), ("BIA", "OBRA B", "DIRETO", 260))
+
+    manifesto = app2.ingerir_competencia(abas, {"arquivo": "b.xlsx"}, "2025-04", manifesto, estado)
+
+    registro = manifesto["competencias"]["2025-04"]
+    assert (registro["revisao"], registro["obras_afetadas"]) == (2, ["OBRA B"])
+    assert registro["obras"] == {"OBRA A": 1, "OBRA B": 2}
+    assert agregados("2025-04")['folha'].to_dict() == {"OBRA A": 100, "OBRA B": 260}
+
+
+def test_aba_vazia_grava_particao_e_aceita_linhas_depois(historico, estado):
+    abas = {"EFETIVO": efetivo(("ANA", "OBRA A", "DIRETO", 100)), "TERCEIROS": terceiros()}
+    manifesto = app2.ingerir_competencia(abas, {"arquivo": "a.xlsx"}, "2025-04", {"competencias": {}}, estado)
+
+    assert os.path.exists(app2._caminho_particao("TERCEIROS", "2025-04"))
+    assert agregados("2025-04").loc["OBRA A", "Terceiros"] == 0
+    # sem partição faltando, a passada do atualizador não tem o que refazer
+    assert app2.sincronizar_historico(estado) == manifesto
+
+    abas["TERCEIROS"] = terceiros(("OBRA A", "EMPRESA X", 4))
+    manifesto = app2.ingerir_competencia(abas, {"arquivo": "b.xlsx"}, "2025-04", manifesto, estado)
+
+    assert manifesto["competencias"]["2025-04"]["revisao"] == 2
+    assert agregados("2025-04").loc["OBRA A", "Terceiros"] == 4
+
+
+def test_ler_historico_junta_meses_com_tipos_diferentes(historico, estado):
+    manifesto = {"competencias": {}}
+    demissao = {"2025-03": [np.nan], "2025-04": [pd.Timestamp("2025-04-15")]}
+    for competencia, valores in demissao.items():
+        abas = {"EFETIVO": efetivo(("ANA", "OBRA A", "DIRETO", 100)), "TERCEIROS": terceiros()}
+        abas["EFETIVO"]['Demissão'] = valores
+        manifesto = app2.ingerir_competencia(abas, {"arquivo": f"{competencia}.xlsx"}, competencia, manifesto, estado)
+
+    df = app2.ler_historico("EFETIVO", ("2025-03", "2025-04"))
+
+    assert pd.api.types.is_datetime64_any_dtype(df['Demissão'])
+    assert df['Demissão'].isna().tolist() == [True, False]
+
+
+def test_ingerir_coluna_com_texto_e_numero(historico, estado):
+    abas = {"EFETIVO": efetivo(("ANA", "OBRA A", "DIRETO", 100), ("BIA", "OBRA A", "DIRETO", 200)), "TERCEIROS": terceiros()}
+    abas["EFETIVO"]['Funcionário'] = pd.Series(['002908', 2908], dtype=object)
+
+    app2.ingerir_competencia(abas, {"arquivo": "sheets:chave"}, "2025-04", {"competencias": {}}, estado)
+
+    assert app2.ler_historico("EFETIVO", ("2025-04",))['Funcionário'].tolist() == ['002908', '2908']
+
+
+def test_datas_do_sheets_voltam_a_ser_datetime():
+    assert app2._valor_sheets("05/04/2025") == pd.Timestamp("2025-04-05")
+    assert app2._valor_sheets("05/04/2025 08:30:00") == pd.Timestamp("2025-04-05 08:30")
+    assert app2._valor_sheets("") is None
+    assert app2._valor_sheets("OBRA 05/04") == "OBRA 05/04"
+
+
+def test_dois_arquivos_do_mesmo_mes_nao_se_alternam(historico, estado):
+    # efetivo_abril.xlsx vale 2025-04 pelo COMPETENCIAS_ARQUIVOS, como o efetivo_2025-04.xlsx
+    shutil.copy(PLANILHA_EXEMPLO, historico / "efetivo_abril.xlsx")
+    wb = load_workbook(PLANILHA_EXEMPLO, data_only=True)
+    aba = wb["EFETIVO"]
+    coluna = next(c.column for c in aba[1] if c.value == 'Remuneração Líquida Folha')
+    aba.cell(row=2, column=coluna).value = 12345.67
+    wb.save(historico / "efetivo_2025-04.xlsx")
+
+    manifesto = app2.sincronizar_historico(estado)
+    registro = dict(manifesto["competencias"]["2025-04"])
+    manifesto = app2.sincronizar_historico(estado)
+
+    assert registro["arquivo"] == "efetivo_abril.xlsx"
+    assert manifesto["competencias"]["2025-04"]["revisao"] == registro["revisao"] == 1
+    assert manifesto["competencias"]["2025-04"]["ingerido_em"] == registro["ingerido_em"]